@@ -1,40 +1,11 @@
+import time
+
+STARTUP_T0 = time.perf_counter()  # 스크립트 실행 시작 (첫 실행이면 앱 시작 시간 측정용)
+
 import streamlit as st
-import pandas as pd
+import html
 import io
-import os
-import subprocess
-import sys
-import glob
-from contextlib import redirect_stdout
-
-BROWSER_PATH = "/tmp/playwright-browsers"
-
-@st.cache_resource(show_spinner="브라우저 준비 중입니다...")
-def install_and_get_browser():
-    os.environ["PLAYWRIGHT_BROWSERS_PATH"] = BROWSER_PATH
-    executable_path_glob = os.path.join(BROWSER_PATH, "chromium-*", "chrome-linux", "chrome")
-    found_paths = glob.glob(executable_path_glob)
-    if found_paths:
-        return found_paths[0]
-    try:
-        subprocess.run(
-            [sys.executable, "-m", "playwright", "install", "chromium"],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        found_paths = glob.glob(executable_path_glob)
-        if found_paths:
-            return found_paths[0]
-        else:
-            st.error("브라우저 설치는 완료되었으나 실행 파일이 없습니다.")
-            return None
-    except subprocess.CalledProcessError:
-        st.error("브라우저 설치에 실패했습니다.")
-        return None
-    except Exception as e:
-        st.error(f"알 수 없는 오류 발생: {e}")
-        return None
+import datetime
 
 # ---------- Streamlit Custom CSS (고급 스타일) ----------
 st.set_page_config(
@@ -63,13 +34,32 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# ---------- 브라우저 준비 ----------
-browser_executable_path = install_and_get_browser()
-if not browser_executable_path:
-    st.error("브라우저를 준비할 수 없어 앱을 실행할 수 없습니다.\n페이지를 새로고침해 주세요.")
-    st.stop()
+# ---------- 브라우저 준비 (백그라운드) ----------
+# 화면을 먼저 그리고, 사용자가 입력하는 동안 실행 파일 탐색·설치와 브라우저 풀 기동을 끝내 둔다
+from g2b_warmup import default_warmup
 
-from g2b_crawler import run_g2b_crawler
+warmup = default_warmup().start()
+WARMUP_LABELS = {"idle": "대기", "resolving": "찾는 중", "installing": "설치 중", "warming": "미리 띄우는 중",
+                 "ready": "준비됨", "cold": "검색할 때 기동", "error": "준비 실패"}
+
+from g2b_export import MIME_TYPES, export_pages
+from g2b_filters import SearchFilters
+from g2b_index import default_index
+from g2b_memory import LOW_MEMORY
+from g2b_models import rows_to_notices, to_columns
+from g2b_store import default_store
+
+
+def job_queue():
+    """검색 작업 큐 (Playwright를 불러오므로 검색하거나 작업을 볼 때 처음 만든다)"""
+    with st.spinner("브라우저 준비 중입니다..."):
+        browser_executable_path = warmup.wait_executable()
+    if not browser_executable_path:
+        st.error(f"브라우저를 준비할 수 없어 검색할 수 없습니다.\n{warmup.error}\n페이지를 새로고침해 주세요.")
+        st.stop()
+    from g2b_jobs import default_queue, install_log_routing
+    install_log_routing()  # 작업 로그를 "오류 상세 보기"에 보여 주기 위해
+    return default_queue(browser_executable_path)
 
 # ---------- 헤더 영역 ----------
 st.markdown('<div class="main-title">🏛️ 나라장터 제안공고 크롤러</div>', unsafe_allow_html=True)
@@ -82,55 +72,208 @@ st.markdown("---")
 # ---------- 검색 카드 ----------
 st.markdown('<div class="search-card">', unsafe_allow_html=True)
 with st.form(key="search_form", clear_on_submit=False):
-    search_query = st.text_input("🔎 검색어", value="컴퓨터", help="공고명, 품목명 등 주요 키워드 입력")
+    search_query = st.text_input("🔎 검색어", value="컴퓨터", help="공고명, 품목명 등 주요 키워드 입력 (쉼표로 여러 개 입력 가능)")
+    concurrency = st.slider("동시 검색 수", min_value=1, max_value=5, value=3, help="여러 검색어를 입력했을 때 동시에 검색할 개수")
+    fast_mode = st.checkbox("⚡ 빠른 검색 (백엔드 요청 재생, 실패 시 브라우저로 자동 전환)", value=False)
+    use_cache = st.checkbox("♻️ 최근 검색 결과 재사용 (같은 검색어는 즉시 표시, 오래된 결과는 백그라운드에서 갱신)", value=True)
+    use_index = st.checkbox("🗂️ 수집한 공고 색인 먼저 보기 (최근 검색한 검색어는 사이트에 가지 않고 바로 표시)", value=True)
+    use_stored = st.checkbox("📦 저장된 공고에서 찾기 (검색하지 않음 · 공백=AND, |=OR, -제외, 기관:조달청)", value=False)
+    fuzzy = st.checkbox("🔤 유사 검색 (저장된 공고에서 찾을 때 오타·띄어쓰기 차이 허용)", value=False)
+    incremental = st.checkbox("🆕 새 공고만 (지난 검색 이후 신규·변경된 공고만, 이미 본 페이지에서 멈춤)", value=False)
+    enrich = st.checkbox("📎 상세 정보 추가 (예산·품목·담당자·첨부파일, 상세 화면을 여러 개 동시에 열어 가져옴)", value=False)
+    with st.expander("🎯 상세 조건 (사이트 검색 폼에 바로 적용)"):
+        use_dates = st.checkbox("게시일자 범위 지정 (끄면 최근 3개월)", value=False)
+        today = datetime.date.today()
+        date_range = st.date_input("게시일자", value=(today - datetime.timedelta(days=30), today))
+        agency = st.text_input("수요기관", value="", help="수요기관명 일부 (예: 조달청)")
+        status = st.text_input("공고상태", value="", help="예: 공고중")
     submitted = st.form_submit_button("크롤링 시작")
 st.markdown('</div>', unsafe_allow_html=True)
 
 # ---------- 결과 출력 ----------
-if submitted:
-    status_area = st.empty()
-    log_capture = io.StringIO()
-    try:
-        status_area.markdown(
-            f"<span style='color:#377efb;font-weight:600;'>⏳ <b>{search_query}</b> 검색 중입니다... 잠시만 기다려주세요.</span>",
-            unsafe_allow_html=True
-        )
-        with redirect_stdout(log_capture):
-            result = run_g2b_crawler(search_query, browser_executable_path)
+def export_file(rows, headers, fmt, query=None):
+    """다운로드용 파일 내용 (Streamlit이 다운로드 데이터를 메모리에 올리므로 bytes로 반환)"""
+    target = io.BytesIO()
+    export_pages([rows], headers, target, fmt=fmt, query=query)
+    return target.getvalue()
 
-        if result and result[1]:
-            header, table_data = result
-            df = pd.DataFrame(table_data, columns=header)
 
-            st.markdown('<div class="result-card">', unsafe_allow_html=True)
-            st.markdown(
-                f'<div class="result-title">📑 <b>{len(df)}</b>건의 제안공고가 검색되었습니다.</div>',
-                unsafe_allow_html=True
-            )
-            st.dataframe(
-                df,
-                use_container_width=True,
-                height=650 if len(df) > 13 else 380
-            )
+def results_frame(rows, header):
+    """날짜 열은 datetime, No는 정수인 표 (문자열 그대로면 정렬이 글자 순이 된다)"""
+    import pandas as pd
+
+    if LOW_MEMORY:
+        # 공고 레코드·열 목록을 거치지 않고 행에서 바로 만든 뒤 열 단위로 변환한다
+        df = pd.DataFrame(rows, columns=header)
+        for name in ("공고게시일자", "공고마감일시"):
+            if name in df:
+                df[name] = pd.to_datetime(df[name], errors="coerce")
+        if "No" in df:
+            df["No"] = pd.to_numeric(df["No"], errors="coerce").astype("Int64")
+        return df
+    columns = to_columns(rows_to_notices(rows, header), header)
+    if "No" in columns:
+        columns["No"] = pd.array(columns["No"], dtype="Int64")
+    for i, name in enumerate(header):
+        if name not in columns:  # 상세 정보 열 등 공고 레코드에 없는 열은 문자열 그대로
+            columns[name] = [row[i] if i < len(row) else "" for row in rows]
+    return pd.DataFrame({name: columns[name] for name in header})
+
+
+def show_results(result, queries, reports=(), log_text="", empty_message=None):
+    if result and result[1]:
+        header, table_data = result
+        df = results_frame(table_data, header)
+
+        st.markdown('<div class="result-card">', unsafe_allow_html=True)
+        st.markdown(
+            f'<div class="result-title">📑 <b>{len(df)}</b>건의 제안공고가 검색되었습니다.</div>',
+            unsafe_allow_html=True
+        )
+        st.dataframe(
+            df,
+            use_container_width=True,
+            height=650 if len(df) > 13 else 380
+        )
+        query = queries[0] if len(queries) == 1 else None
+        if LOW_MEMORY:
+            # 파일 내용이 통째로 메모리에 올라가므로 고른 형식 하나만 만든다
+            fmt = st.selectbox("다운로드 형식", ["csv", "xlsx"], format_func=lambda f: {"csv": "CSV", "xlsx": "Excel"}[f])
             st.download_button(
-                label="📥 결과 CSV 다운로드",
-                data=df.to_csv(index=False).encode("utf-8-sig"),
-                file_name=f"g2b_{search_query}.csv",
-                mime="text/csv",
-                help="엑셀에서 바로 열 수 있는 UTF-8 CSV입니다."
+                label="📥 결과 다운로드",
+                data=export_file(table_data, header, fmt, query),
+                file_name=f"g2b_{'_'.join(queries)}.{fmt}",
+                mime=MIME_TYPES[fmt],
             )
-            st.markdown('</div>', unsafe_allow_html=True)
-            st.markdown('<div class="success-card">✅ 검색이 성공적으로 완료되었습니다.</div>', unsafe_allow_html=True)
-
         else:
-            st.markdown('<div class="alert-card">❌ 검색 결과가 없거나 크롤링에 실패했습니다.<br>검색어를 바꿔 시도해보세요.</div>', unsafe_allow_html=True)
+            col_xlsx, col_csv = st.columns(2)
+            with col_xlsx:
+                st.download_button(
+                    label="📥 결과 Excel 다운로드",
+                    data=export_file(table_data, header, "xlsx", query),
+                    file_name=f"g2b_{'_'.join(queries)}.xlsx",
+                    mime=MIME_TYPES["xlsx"],
+                    help="검색어 열, 열 너비·정렬 서식이 적용된 엑셀 파일입니다."
+                )
+            with col_csv:
+                st.download_button(
+                    label="📥 결과 CSV 다운로드",
+                    data=export_file(table_data, header, "csv", query),
+                    file_name=f"g2b_{'_'.join(queries)}.csv",
+                    mime=MIME_TYPES["csv"],
+                    help="엑셀에서 바로 열 수 있는 UTF-8 CSV입니다."
+                )
+        st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown('<div class="success-card">✅ 검색이 성공적으로 완료되었습니다.</div>', unsafe_allow_html=True)
+    else:
+        # 차단·재시도 소진으로 실패했다면 "결과 없음" 대신 그 사유를 보여준다
+        errors = [f"{report.query}: {report.error}" for report in reports if report.status == "error" and report.error]
+        if errors:
+            empty_message = ('<div class="alert-card">❌ 크롤링에 실패했습니다.<br>'
+                             + "<br>".join(html.escape(e) for e in errors) + '</div>')
+        st.markdown(empty_message or '<div class="alert-card">❌ 검색 결과가 없거나 크롤링에 실패했습니다.<br>검색어를 바꿔 시도해보세요.</div>',
+                    unsafe_allow_html=True)
+
+    if reports or log_text:
+        with st.expander("⏱️ 실행 리포트 (단계별 소요 시간)"):
+            for report in reports:
+                peak = report.info.get("peak_rss_mb")
+                st.markdown(f"**{report.query}** · {report.status} · 총 {report.total_ms}ms · {report.rows}건"
+                            + (f" · 최대 RSS {peak}MB" if peak else ""))
+                st.table([
+                    {"단계": name, "소요(ms)": entry["ms"], "횟수": entry["count"], "성공": entry["ok"]}
+                    for name, entry in report.phase_totals().items()
+                ])
+                st.json({"methods": report.methods, "info": report.info, "counters": report.counters})
+            st.code(log_text[-20000:] or "(로그 없음)")
+
 
-    except Exception as e:
-        st.markdown(f'<div class="alert-card">❌ 오류 발생: {str(e)}</div>', unsafe_allow_html=True)
+if submitted:
+    queries = [q.strip() for q in search_query.replace("\n", ",").split(",") if q.strip()]
+    dates = tuple(date_range) if use_dates and isinstance(date_range, (list, tuple)) else ()
+    filters = SearchFilters.coerce({
+        "date_from": dates[0] if dates else None,
+        "date_to": dates[-1] if dates else None,
+        "agency": agency,
+        "status": status,
+    })
+    st.session_state.pop("job_id", None)
+    if not queries:
+        st.markdown('<div class="alert-card">❌ 검색어를 입력하세요.</div>', unsafe_allow_html=True)
+    elif use_stored:
+        from g2b_crawler import merge_keyword_results
+        import pandas as pd
+
+        index = default_index()
+        started = time.perf_counter()
+        index.sync(default_store())
+        results = [(query, index.search(query, filters, fuzzy=fuzzy)) for query in queries]
+        st.caption(f"🗂️ 저장된 공고 {index.count()}건에서 찾음 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        show_results(
+            merge_keyword_results(results) if len(queries) > 1 else results[0][1], queries,
+            empty_message='<div class="alert-card">❌ 저장된 공고 중 맞는 것이 없습니다. 백그라운드 수집기(g2b_daemon.py)에 검색어를 추가하거나 '
+                          '"저장된 공고에서 찾기"를 끄고 검색하세요.</div>',
+        )
+        for query in queries:
+            last = default_store().last_run(query)
+            if last:
+                finished = pd.to_datetime(last["finished_at"] or last["started_at"], unit="s", utc=True)
+                st.caption(f"'{query}' 마지막 수집: {finished.tz_convert('Asia/Seoul'):%Y-%m-%d %H:%M} "
+                           f"({last['status']}, 신규 {last['new']}건)")
+    else:
+        try:
+            job = job_queue().submit(queries, mode="incremental" if incremental else "search",
+                               engine="backend" if fast_mode else "browser", use_cache=use_cache,
+                               concurrency=concurrency, filters=filters, enrich=enrich, use_index=use_index)
+            st.session_state["job_id"] = job.id
+            st.session_state["job_queries"] = queries
+            st.session_state["job_incremental"] = incremental
+        except Exception as e:
+            st.markdown(f'<div class="alert-card">❌ 오류 발생: {str(e)}</div>', unsafe_allow_html=True)
+
+job_id = st.session_state.get("job_id")
+if job_id:
+    job = job_queue().get(job_id)
+    queries = st.session_state.get("job_queries", [])
+    if job is None:
+        st.session_state.pop("job_id", None)
+        st.markdown('<div class="alert-card">❌ 검색 작업 정보가 만료되었습니다. 다시 검색해 주세요.</div>', unsafe_allow_html=True)
+    elif not job.done:
+        progress = job.progress()
+        st.markdown(
+            f"<span style='color:#377efb;font-weight:600;'>⏳ <b>{', '.join(queries)}</b> 검색 중입니다... "
+            f"({progress['elapsed']:.0f}초, {progress['rows']}건 수집)</span>",
+            unsafe_allow_html=True
+        )
+        if progress["queries"]:
+            st.table([
+                {"검색어": q["query"], "현재 단계": q["phase"], "페이지": q["pages"]} for q in progress["queries"]
+            ])
+        if st.button("⏹️ 검색 취소"):
+            job.cancel()
+        time.sleep(1)
+        st.rerun()
+    elif job.status == "cancelled":
+        st.markdown('<div class="alert-card">⏹️ 검색을 취소했습니다.</div>', unsafe_allow_html=True)
+    elif job.status == "error":
+        st.markdown(f'<div class="alert-card">❌ 오류 발생: {job.error}</div>', unsafe_allow_html=True)
         with st.expander("오류 상세 보기"):
-            st.code(str(e))
+            st.code(job.log.getvalue()[-20000:] or str(job.error))
+    else:
+        if job.cache in ("index", "index-stale"):
+            elapsed = sum(report.total_ms for report in job.reports)
+            refresh = " 백그라운드에서 새로 검색해 색인을 갱신하고 있습니다." if job.cache == "index-stale" else ""
+            st.caption(f"🗂️ 최근 검색한 검색어라 수집한 공고 색인에서 바로 찾았습니다 ({elapsed:.0f}ms).{refresh}")
+        elif job.cache == "hit":
+            st.caption("♻️ 최근 검색 결과를 재사용했습니다.")
+        elif job.cache == "stale":
+            st.caption("♻️ 이전 검색 결과를 표시 중이며 백그라운드에서 새로 검색하고 있습니다.")
+        empty_message = None
+        if st.session_state.get("job_incremental"):
+            empty_message = '<div class="success-card">✅ 지난 검색 이후 새로 나오거나 바뀐 공고가 없습니다.</div>'
+        show_results(job.result, queries, job.reports, job.log.getvalue(), empty_message)
 
-else:
+elif not submitted:
     st.markdown(
         '<div class="alert-card">1. 검색어 입력 후 <b>크롤링 시작</b>을 클릭하세요.<br>'
         '2. 약 1분 내외로 결과가 표로 출력됩니다.<br>'
@@ -138,5 +281,12 @@ else:
         unsafe_allow_html=True
     )
 
+if "startup_ms" not in st.session_state:
+    st.session_state["startup_ms"] = round((time.perf_counter() - STARTUP_T0) * 1000)
+    print(f"🚀 화면 준비 {st.session_state['startup_ms']}ms (브라우저: {WARMUP_LABELS[warmup.status]})")
+warmup_timings = ", ".join(f"{name} {ms:.0f}ms" for name, ms in warmup.timings.items())
+st.caption(f"🚀 화면 준비 {st.session_state['startup_ms']}ms · 브라우저 {WARMUP_LABELS[warmup.status]}"
+           + (f" ({warmup_timings})" if warmup_timings else ""))
+
 st.markdown("---")
 st.markdown('<div class="footer">© 2025 <b>위더스컴퓨터</b> · Powered by Playwright · 나라장터 제안공고 자동수집</div>', unsafe_allow_html=True)
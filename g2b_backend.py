@@ -0,0 +1,391 @@
+import asyncio
+import datetime
+import json
+import os
+import re
+import tempfile
+import time
+from urllib.parse import parse_qsl, urlencode
+
+from g2b_waits import request_mentions
+
+TEMPLATE_PATH = os.environ.get(
+    "G2B_BACKEND_PATH", os.path.join(tempfile.gettempdir(), "g2b_backend.json")
+)
+
+# 재생 요청에 그대로 실어 보낼 헤더 (나머지는 httpx가 채움)
+_REPLAY_HEADERS = (
+    "accept", "accept-language", "content-type", "origin", "referer",
+    "user-agent", "x-requested-with", "submissionid",
+)
+_DATE_RE = re.compile(r"^(\d{4})([-./]?)(\d{2})\2(\d{2})$")
+_PAGE_NO_RE = re.compile(r"(curr|cur|now|start)?_?page_?(no|num|index|idx)?$|^pageindex$|^pgno$", re.I)
+_PAGE_SIZE_RE = re.compile(r"recordcount|pagesize|pageunit|rowcnt|rowcount|perpage", re.I)
+_AGENCY_RE = re.compile(r"dminstt|dmndinstt", re.I)  # 수요기관명 파라미터 (예: dminsttNm)
+
+
+class BackendReplayError(Exception):
+    """저장된 요청을 재생할 수 없음 (세션 만료, 응답 형식 변경 등)"""
+
+
+def _walk(obj, path=()):
+    """(경로, 값) 쌍을 깊이 우선으로 나열"""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from _walk(value, path + (key,))
+    elif isinstance(obj, list):
+        for index, value in enumerate(obj):
+            yield from _walk(value, path + (index,))
+    else:
+        yield path, obj
+
+
+def _get(obj, path):
+    for key in path:
+        obj = obj[key]
+    return obj
+
+
+def _set(obj, path, value):
+    for key in path[:-1]:
+        obj = obj[key]
+    obj[path[-1]] = value
+
+
+def _digits(text):
+    return re.sub(r"[^0-9A-Za-z가-힣]", "", str(text))
+
+
+def _make_mask(shown, raw):
+    """그리드 표시값과 원본값이 구분자만 다르면 '####/##/##' 형태의 마스크를 만든다"""
+    raw = str(raw)
+    if not raw.isalnum() or _digits(shown) != raw:
+        return None
+    return "".join("#" if ch.isalnum() else ch for ch in shown)
+
+
+def _apply_mask(mask, raw):
+    chars = iter(str(raw))
+    try:
+        return "".join(next(chars) if ch == "#" else ch for ch in mask)
+    except StopIteration:
+        return str(raw)
+
+
+def _find_record_lists(data, path=()):
+    """응답 JSON 안의 '딕셔너리 목록'들을 (경로, 목록)으로 나열"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _find_record_lists(value, path + (key,))
+    elif isinstance(data, list):
+        if data and all(isinstance(item, dict) for item in data):
+            yield path, data
+
+
+def _decode_body(post_data, content_type):
+    if not post_data:
+        return "none", {}
+    if "json" in (content_type or "") or post_data.lstrip().startswith(("{", "[")):
+        try:
+            return "json", json.loads(post_data)
+        except ValueError:
+            pass
+    return "form", dict(parse_qsl(post_data, keep_blank_values=True))
+
+
+class BackendCapture:
+    """브라우저 검색 중 그리드를 채우는 XHR을 가로채 재생용 템플릿을 만든다"""
+
+    def __init__(self, query, headers):
+        self.query = query
+        self.headers = list(headers)
+        self._pending = []
+        self._candidates = []
+        self._page = None
+
+    def attach(self, page):
+        self._page = page
+        page.on("response", self._on_response)
+
+    def detach(self):
+        if self._page is not None:
+            self._page.remove_listener("response", self._on_response)
+            self._page = None
+
+    def _on_response(self, response):
+        request = response.request
+        if request.resource_type not in ("xhr", "fetch"):
+            return
+        if not request_mentions(request, self.query):
+            return
+        self._pending.append(asyncio.ensure_future(self._inspect(response)))
+
+    async def _inspect(self, response):
+        try:
+            body = await response.json()
+        except Exception:
+            return
+        request = response.request
+        self._candidates.append({
+            "url": request.url,
+            "method": request.method,
+            "headers": await request.all_headers(),
+            "post_data": request.post_data,
+            "response": body,
+        })
+
+    async def finalize(self, context, rows):
+        """첫 페이지 그리드 행과 대조해 템플릿을 만든다 (실패 시 None)"""
+        self.detach()
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        best = None
+        for candidate in self._candidates:
+            for list_path, records in _find_record_lists(candidate["response"]):
+                columns, score = _map_columns(self.headers, rows, records)
+                if best is None or score > best[0]:
+                    best = (score, candidate, list_path, columns)
+        if best is None or best[0] < 2:
+            print("   - 백엔드 요청 캡처 실패: 그리드와 일치하는 응답 없음")
+            return None
+        _, candidate, list_path, columns = best
+        template = _build_template(self.query, self.headers, candidate, list_path, columns)
+        template["cookies"] = await context.cookies()
+        print(f"   ✓ 백엔드 요청 캡처: {candidate['method']} {candidate['url']}")
+        return template
+
+
+def _map_columns(headers, rows, records):
+    """그리드 열마다 같은 값을 가진 응답 키를 찾는다 → ({열: {key, mask}}, 일치 열 수)"""
+    sample = list(zip(rows[:5], records[:5]))
+    if not sample:
+        return {}, 0
+    columns = {}
+    for index, name in enumerate(headers):
+        if name == "No":
+            continue
+        for key in records[0]:
+            masks = set()
+            for row, record in sample:
+                shown = row[index] if index < len(row) else ""
+                raw = record.get(key)
+                if raw is None or not shown:
+                    break
+                if str(raw).strip() == shown:
+                    masks.add(None)
+                    continue
+                mask = _make_mask(shown, raw)
+                if mask is None:
+                    break
+                masks.add(mask)
+            else:
+                if len(masks) == 1:
+                    columns[name] = {"key": key, "mask": masks.pop()}
+                    break
+    return columns, len(columns)
+
+
+def _build_template(query, headers, candidate, list_path, columns):
+    content_type = candidate["headers"].get("content-type", "")
+    body_kind, body = _decode_body(candidate["post_data"], content_type)
+    query_paths, agency_paths, date_paths, page_path, size_path = [], [], [], None, None
+    for path, value in _walk(body):
+        if not path:
+            continue
+        key = str(path[-1])
+        if value == query:
+            query_paths.append(list(path))
+        elif value == "" and _AGENCY_RE.search(key):
+            agency_paths.append(list(path))
+        elif isinstance(value, str) and _DATE_RE.match(value):
+            date_paths.append((value, list(path)))
+        elif _PAGE_SIZE_RE.search(key):
+            size_path = list(path)
+        elif _PAGE_NO_RE.search(key) and str(value).isdigit():
+            page_path = list(path)
+    if not query_paths:
+        raise BackendReplayError("요청 본문에서 검색어 위치를 찾을 수 없음")
+    date_paths.sort()
+    dates = None
+    if len(date_paths) >= 2:
+        (first, from_path), (last, to_path) = date_paths[0], date_paths[-1]
+        dates = {
+            "from": from_path,
+            "to": to_path,
+            "separator": _DATE_RE.match(first).group(2),
+            "span_days": (_parse_date(last) - _parse_date(first)).days,
+        }
+    return {
+        "saved_at": time.time(),
+        "url": candidate["url"],
+        "method": candidate["method"],
+        "headers": {k: v for k, v in candidate["headers"].items() if k.lower() in _REPLAY_HEADERS},
+        "body_kind": body_kind,
+        "body": body,
+        "query_paths": query_paths,
+        "agency_paths": agency_paths,
+        "dates": dates,
+        "page_path": page_path,
+        "size_path": size_path,
+        "list_path": list(list_path),
+        "headers_out": headers,
+        "columns": columns,
+    }
+
+
+def _parse_date(value):
+    m = _DATE_RE.match(value)
+    return datetime.date(int(m.group(1)), int(m.group(3)), int(m.group(4)))
+
+
+def _format_date(date, separator):
+    return date.strftime(f"%Y{separator}%m{separator}%d")
+
+
+def load_template(path=TEMPLATE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_template(template, path=TEMPLATE_PATH):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".g2b_backend_")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(template, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class BackendClient:
+    """캡처한 템플릿을 커넥션 풀이 있는 httpx.AsyncClient로 재생"""
+
+    def __init__(self, template, max_connections=10, timeout=15.0):
+        import httpx
+
+        self.template = template
+        cookies = httpx.Cookies()
+        for cookie in template.get("cookies", []):
+            cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+        self._client = httpx.AsyncClient(
+            headers=template["headers"],
+            cookies=cookies,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            verify=False,
+        )
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    def _build_body(self, query, page_no, date_from=None, date_to=None, agency=None):
+        template = self.template
+        body = json.loads(json.dumps(template["body"]))
+        for path in template["query_paths"]:
+            _set(body, path, query)
+        for path in template.get("agency_paths") or ():
+            _set(body, path, agency or "")
+        dates = template.get("dates")
+        if dates:
+            date_to = date_to or datetime.date.today()
+            date_from = date_from or date_to - datetime.timedelta(days=dates["span_days"])
+            _set(body, dates["from"], _format_date(date_from, dates["separator"]))
+            _set(body, dates["to"], _format_date(date_to, dates["separator"]))
+        if template.get("page_path"):
+            old = _get(body, template["page_path"])
+            _set(body, template["page_path"], page_no if isinstance(old, int) else str(page_no))
+        return body
+
+    async def fetch_page(self, query, page_no=1, date_from=None, date_to=None, agency=None):
+        """한 페이지를 요청해 HEADERS 순서의 행 목록으로 반환 (agency는 템플릿에 수요기관 파라미터가 있을 때만 적용)"""
+        template = self.template
+        body = self._build_body(query, page_no, date_from, date_to, agency)
+        kwargs = {}
+        if template["body_kind"] == "json":
+            kwargs["content"] = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        elif template["body_kind"] == "form":
+            kwargs["content"] = urlencode(body).encode("utf-8")
+        response = await self._client.request(template["method"], template["url"], **kwargs)
+        if response.status_code != 200:
+            raise BackendReplayError(f"HTTP {response.status_code}")
+        try:
+            data = response.json()
+            records = _get(data, template["list_path"])
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise BackendReplayError("응답 형식이 캡처 당시와 다름")
+        return [self._to_row(record) for record in records]
+
+    def _to_row(self, record):
+        row = []
+        for name in self.template["headers_out"]:
+            spec = self.template["columns"].get(name)
+            value = record.get(spec["key"]) if spec else None
+            if value is None:
+                row.append("")
+            elif spec["mask"]:
+                row.append(_apply_mask(spec["mask"], value))
+            else:
+                row.append(str(value).strip())
+        return row
+
+
+_shared_clients = {}
+
+
+def get_backend_client(template):
+    """이벤트 루프·템플릿별로 BackendClient를 재사용 (keep-alive 연결 유지)"""
+    loop = asyncio.get_running_loop()
+    key = id(loop)
+    entry = _shared_clients.get(key)
+    if entry is None or entry[0] != template.get("saved_at"):
+        if entry is not None:
+            loop.create_task(entry[1].aclose())
+        entry = (template.get("saved_at"), BackendClient(template))
+        _shared_clients[key] = entry
+    return entry[1]
+
+
+def supported_filters(template):
+    """템플릿 요청 파라미터로 서버에 넘길 수 있는 필터 이름들 (g2b_filters.FILTER_NAMES 중)"""
+    names = []
+    if template.get("dates"):
+        names.append("date")
+    if template.get("agency_paths"):
+        names.append("agency")
+    return names
+
+
+async def iter_backend_async(query, template, max_pages, date_from=None, date_to=None, client=None, agency=None):
+    """브라우저 없이 백엔드 요청만으로 결과를 페이지 단위로 yield"""
+    if client is None:
+        client = get_backend_client(template)
+    page_size = None
+    if template.get("size_path"):
+        try:
+            page_size = int(_get(template["body"], template["size_path"]))
+        except (KeyError, IndexError, TypeError, ValueError):
+            page_size = None
+    seen = set()
+    numbered = "No" in template["headers_out"] and "No" not in template["columns"]
+    offset = 0
+    for page_no in range(1, max_pages + 1):
+        if page_no > 1 and not template.get("page_path"):
+            return
+        rows = await client.fetch_page(query, page_no, date_from, date_to, agency)
+        if not rows:
+            return
+        signature = json.dumps(rows[0], ensure_ascii=False)
+        if signature in seen:
+            return
+        seen.add(signature)
+        if numbered:
+            index = template["headers_out"].index("No")
+            for i, row in enumerate(rows):
+                row[index] = str(offset + i + 1)
+        offset += len(rows)
+        print(f"   ✓ [백엔드] {page_no}페이지: {len(rows)}개 데이터 수집")
+        yield rows
+        if page_size and len(rows) < page_size:
+            return
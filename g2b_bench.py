@@ -0,0 +1,254 @@
+"""녹화된 G2B 응답(HAR)으로 크롤러를 오프라인 재생하고 단계별 성능을 측정하는 도구
+
+    python g2b_bench.py record 컴퓨터 --fixtures fixtures/     # 실제 사이트에서 HAR 녹화
+    python g2b_bench.py run --fixtures fixtures/ --runs 5 --concurrency 3 --output bench.json
+
+재생 중에는 사이트에 나가는 요청이 없으므로 CI에서도 돌릴 수 있다 (Chromium만 필요).
+tests/fixtures/synthetic_*.har는 팝업·목록 화면·그리드 XHR을 흉내 낸 합성 HAR로, tests/test_bench.py가 재생한다.
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import g2b_resilience
+import g2b_session
+import g2b_strategy
+from g2b_crawler import run_crawler_async
+from g2b_memory import rss_bytes
+from g2b_pool import BrowserPool
+from g2b_report import RunReport
+
+# 재생 시 브라우저 시계를 녹화 시각에 맞춘다. 검색 요청 본문에 조회 기간(오늘 기준 3개월)이
+# 들어가므로, 시계가 다르면 HAR의 POST 본문과 달라져 응답을 찾지 못한다.
+FROZEN_CLOCK_JS = """
+(() => {
+    const offset = %d - Date.now();
+    const RealDate = Date;
+    class FrozenDate extends RealDate {
+        constructor(...args) {
+            if (args.length === 0) super(RealDate.now() + offset);
+            else super(...args);
+        }
+        static now() { return RealDate.now() + offset; }
+    }
+    window.Date = FrozenDate;
+})();
+"""
+
+
+class HarFixture:
+    """HAR 파일 하나와 메타데이터(검색어, 녹화 시각)
+
+    mode="record"면 컨텍스트에 HAR 녹화를 켜고, mode="replay"면 route_from_har로
+    HAR에 있는 응답만 돌려준다. HAR에 없는 요청은 사이트로 나가지 않고 차단되며 misses로 센다.
+    """
+
+    def __init__(self, path, mode="replay", query=None, recorded_at=None):
+        self.path = path
+        self.mode = mode
+        self.query = query
+        self.recorded_at = recorded_at
+        self.misses = 0
+        if mode == "replay" and (query is None or recorded_at is None):
+            meta = self._load_meta()
+            self.query = query or meta.get("query")
+            self.recorded_at = recorded_at or meta.get("recorded_at")
+
+    @property
+    def meta_path(self):
+        return os.path.splitext(self.path)[0] + ".meta.json"
+
+    def _load_meta(self):
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_meta(self):
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump({"query": self.query, "recorded_at": self.recorded_at}, f, ensure_ascii=False)
+
+    def context_options(self):
+        if self.mode == "record":
+            return {"record_har_path": self.path, "record_har_content": "embed"}
+        return {}
+
+    async def install(self, context):
+        if self.mode != "replay":
+            return
+        # 나중에 등록한 route가 먼저 처리되므로: HAR → (없으면) 차단+집계 순서가 되도록 등록한다.
+        await context.route("**/*", self._on_miss)
+        await context.route_from_har(self.path, not_found="fallback")
+        if self.recorded_at:
+            await context.add_init_script(FROZEN_CLOCK_JS % int(self.recorded_at * 1000))
+
+    async def _on_miss(self, route):
+        self.misses += 1
+        await route.abort("internetdisconnected")
+
+
+@contextmanager
+def isolated_state(directory=None):
+    """재생하는 동안 차단기·전략 캐시·세션 스냅샷을 directory(없으면 임시 디렉터리)의 파일로 바꿔 둔다
+
+    실제 크롤러가 쓰는 G2B_BREAKER_PATH·G2B_STRATEGY_PATH·G2B_SESSION_PATH 파일을
+    벤치마크가 열거나(차단기 트립) 덮어쓰지(전략 순서) 않게 한다. 끝나면 원래 객체로 되돌린다.
+    """
+    own = directory is None
+    directory = directory or tempfile.mkdtemp(prefix="g2b_bench_")
+    saved = (g2b_resilience._default_breaker, g2b_strategy._default_strategies, g2b_session._default_snapshot)
+    g2b_resilience._default_breaker = g2b_resilience.CircuitBreaker(path=os.path.join(directory, "g2b_breaker.json"))
+    g2b_strategy._default_strategies = g2b_strategy.StrategyCache(os.path.join(directory, "g2b_strategy.json"))
+    g2b_session._default_snapshot = g2b_session.SessionSnapshot(os.path.join(directory, "g2b_session.json"))
+    try:
+        yield directory
+    finally:
+        g2b_resilience._default_breaker, g2b_strategy._default_strategies, g2b_session._default_snapshot = saved
+        if own:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def load_fixtures(directory):
+    return [HarFixture(path) for path in sorted(glob.glob(os.path.join(directory, "*.har")))]
+
+
+async def record_fixture(query, directory, browser_executable_path=None):
+    """실제 사이트에서 검색 한 번을 HAR로 녹화 (세션 스냅샷 없이 전체 경로를 녹화)"""
+    os.makedirs(directory, exist_ok=True)
+    name = "".join(ch if ch.isalnum() else "_" for ch in query)
+    fixture = HarFixture(os.path.join(directory, f"{name}.har"), "record", query, time.time())
+    async with BrowserPool(size=1, contexts_per_browser=1, browser_executable_path=browser_executable_path) as pool:
+        headers, rows = await run_crawler_async(query, pool=pool, use_snapshot=False, fixture=fixture)
+    fixture.save_meta()
+    print(f"녹화 완료: {fixture.path} ({len(rows or [])}건)")
+    return fixture
+
+
+def percentile(values, q):
+    """선형 보간 백분위수 (q: 0~100)"""
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * q / 100
+    lower = int(k)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (k - lower)
+
+
+def summarize(reports):
+    """RunReport 목록 → 전체/단계별 p50·p95 (ms)"""
+    totals = [r.total_ms for r in reports if r.total_ms is not None]
+    phases = {}
+    for report in reports:
+        for name, entry in report.phase_totals().items():
+            phases.setdefault(name, []).append(entry["ms"])
+    return {
+        "runs": len(reports),
+        "errors": sum(1 for r in reports if r.status == "error"),
+        "total_ms": {"p50": percentile(totals, 50), "p95": percentile(totals, 95)},
+        "phases_ms": {
+            name: {"p50": percentile(values, 50), "p95": percentile(values, 95), "n": len(values)}
+            for name, values in phases.items()
+        },
+    }
+
+
+def peak_rss_kb():
+    """이 프로세스와 (종료된) 자식 프로세스(Chromium)의 최대 RSS, KB (Linux 기준)
+
+    getrusage가 없으면(Windows) 지금 이 프로세스의 RSS만 남긴다.
+    """
+    if resource is None:
+        return {"self": rss_bytes(children=False) // 1024, "children": None}
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+
+async def _replay_once(pool, fixture):
+    report = RunReport(fixture.query, "browser")
+    await run_crawler_async(fixture.query, pool=pool, use_snapshot=False, report=report, fixture=fixture)
+    return report
+
+
+async def run_benchmark(fixtures, runs=5, concurrency=3, browser_executable_path=None):
+    """HAR 재생으로 검색 지연(순차 runs회)과 다중 검색 처리량(동시 concurrency개)을 측정"""
+    if not fixtures:
+        raise ValueError("재생할 HAR 파일이 없습니다")
+    result = {"fixtures": [f.path for f in fixtures], "latency": {}, "throughput": None}
+    pool = BrowserPool(size=max(1, (concurrency + 1) // 2), contexts_per_browser=2,
+                       browser_executable_path=browser_executable_path)
+    with isolated_state():
+        async with pool:
+            for fixture in fixtures:
+                reports = [await _replay_once(pool, fixture) for _ in range(runs)]
+                result["latency"][fixture.query] = summarize(reports)
+
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def limited(fixture):
+                async with semaphore:
+                    return await _replay_once(pool, fixture)
+
+            batch = [f for _ in range(runs) for f in fixtures]
+            started = time.perf_counter()
+            reports = await asyncio.gather(*(limited(f) for f in batch))
+            elapsed = time.perf_counter() - started
+            result["throughput"] = {
+                "concurrency": concurrency,
+                "searches": len(batch),
+                "seconds": round(elapsed, 3),
+                "searches_per_sec": round(len(batch) / elapsed, 3) if elapsed else None,
+                "rows_per_sec": round(sum(r.rows for r in reports) / elapsed, 1) if elapsed else None,
+                **summarize(reports),
+            }
+            result["pool"] = pool.stats()
+    result["har_misses"] = {f.query: f.misses for f in fixtures}
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="G2B 크롤러 HAR 녹화/오프라인 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="실제 사이트에서 검색을 HAR로 녹화")
+    rec.add_argument("queries", nargs="+")
+    rec.add_argument("--fixtures", default="fixtures")
+    rec.add_argument("--browser")
+    run = sub.add_parser("run", help="녹화된 HAR로 벤치마크 실행")
+    run.add_argument("--fixtures", default="fixtures")
+    run.add_argument("--runs", type=int, default=5)
+    run.add_argument("--concurrency", type=int, default=3)
+    run.add_argument("--output")
+    run.add_argument("--browser")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        for query in args.queries:
+            asyncio.run(record_fixture(query, args.fixtures, args.browser))
+        return 0
+
+    result = asyncio.run(run_benchmark(load_fixtures(args.fixtures), args.runs, args.concurrency, args.browser))
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    return 1 if any(entry["errors"] for entry in result["latency"].values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
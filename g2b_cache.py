@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_TTL = int(os.environ.get("G2B_CACHE_TTL", "600"))             # 이 시간 안이면 그대로 반환
+CACHE_STALE_TTL = int(os.environ.get("G2B_CACHE_STALE_TTL", "3600"))  # TTL 이후 이 시간까지는 바로 반환 + 백그라운드 갱신
+CACHE_SIZE = int(os.environ.get("G2B_CACHE_SIZE", "64"))
+CACHE_DIR = os.environ.get("G2B_CACHE_DIR") or None                   # 지정하면 디스크에도 저장
+
+
+def make_key(query, date_range=None, filters=None):
+    """(검색어, 조회 기간, 필터)로 캐시 키 생성 (dict 순서·공백 차이는 무시)"""
+    parts = [(query or "").strip(), date_range, filters]
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """검색 결과 TTL + LRU 캐시 (메모리, 선택적으로 디스크)
+
+    - TTL 안: 그대로 반환 ('hit')
+    - TTL 이후 stale_ttl 안: 옛 결과를 바로 반환하고 백그라운드 스레드에서 갱신 ('stale')
+    - 그 밖: fetch를 호출해 새로 저장 ('miss')
+    실패(None)나 빈 결과는 저장하지 않는다. directory를 주면 재시작 후에도 남는다.
+    """
+
+    def __init__(self, ttl=CACHE_TTL, stale_ttl=CACHE_STALE_TTL, max_entries=CACHE_SIZE, directory=CACHE_DIR):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        """(값, 'fresh' | 'stale') 또는 (None, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is None:
+                return None, None
+            with self._lock:
+                self._remember(key, entry)
+        stored_at, value = entry
+        age = time.time() - stored_at
+        if age <= self.ttl:
+            return value, "fresh"
+        if age <= self.ttl + self.stale_ttl:
+            return value, "stale"
+        return None, None
+
+    def put(self, key, value):
+        entry = (time.time(), value)
+        with self._lock:
+            self._remember(key, entry)
+        if self.directory:
+            self._save(key, entry)
+
+    def offer(self, key, value):
+        """저장할 만한 결과(실패·빈 결과가 아님)일 때만 저장하고 저장 여부를 반환"""
+        if not _cacheable(value):
+            return False
+        self.put(key, value)
+        return True
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+        if self.directory:
+            names = [f"{key}.json"] if key else [n for n in os.listdir(self.directory) if n.endswith(".json")]
+            for name in names:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def get_or_fetch(self, key, fetch, refresh=None):
+        """캐시에서 찾고 없으면 fetch()로 채운다, (값, 'hit' | 'stale' | 'miss')를 반환
+
+        refresh는 백그라운드 갱신에 쓸 함수(없으면 fetch)다.
+        """
+        value, state = self.get(key)
+        if state == "fresh":
+            return value, "hit"
+        if state == "stale":
+            self._refresh_in_background(key, refresh or fetch)
+            return value, "stale"
+        value = fetch()
+        self.offer(key, value)
+        return value, "miss"
+
+    def _refresh_in_background(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self.offer(key, fetch())
+            except Exception as e:
+                print(f"   - 캐시 백그라운드 갱신 실패: {str(e)[:50]}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="g2b-cache-refresh", daemon=True).start()
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        path = os.path.join(self.directory, f"{key}.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)
+            return data["stored_at"], data["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, key, entry):
+        stored_at, value = entry
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".g2b_cache_")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": stored_at, "value": value}, f, ensure_ascii=False)
+            os.replace(tmp_path, os.path.join(self.directory, f"{key}.json"))
+            self._prune_disk()
+        except OSError as e:
+            print(f"   - 캐시 디스크 저장 실패: {str(e)[:50]}")
+
+    def _prune_disk(self):
+        """디스크 항목도 max_entries개로 유지 (오래 안 쓴 것부터 삭제)"""
+        paths = [os.path.join(self.directory, n) for n in os.listdir(self.directory) if n.endswith(".json")]
+        if len(paths) <= self.max_entries:
+            return
+        paths.sort(key=lambda p: os.path.getmtime(p))
+        for path in paths[:len(paths) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _cacheable(value):
+    return bool(value) and value[0] is not None and bool(value[1])
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
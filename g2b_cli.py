@@ -0,0 +1,116 @@
+"""검색 결과를 그리드 페이지가 읽히는 대로 표준 출력이나 파일로 흘려 쓰는 명령행 도구 (Streamlit 없이)
+
+    python g2b_cli.py --query 컴퓨터 --query 노트북 --concurrency 2 > 결과.jsonl
+    python g2b_cli.py --queries-file keywords.txt --format csv --output 결과.csv
+    python g2b_cli.py --query 서버 --output 결과.parquet
+
+진행 로그는 표준 오류로 보내므로 표준 출력에는 결과 데이터만 나간다 (jq 등 다른 도구에 바로 파이프 가능).
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+
+from g2b_crawler import HEADERS, MAX_PAGES, find_browser_executable, iter_crawler_many_async
+from g2b_export import guess_format, open_exporter
+from g2b_filters import SearchFilters
+
+CLI_FORMATS = ("jsonl", "csv", "parquet")
+KEYWORD_COLUMN = "검색어"
+KEY_COLUMN = "제안공고번호"
+
+
+def load_queries(args):
+    """--query와 --queries-file('-'이면 표준 입력)의 검색어 (한 줄에 하나, #은 주석)"""
+    queries = list(args.query or [])
+    if args.queries_file:
+        if args.queries_file == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(args.queries_file, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        queries += [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+    return list(dict.fromkeys(queries))
+
+
+async def crawl_to(target, fmt, queries, concurrency=3, dedupe=True, reports=None, **options):
+    """검색어들을 동시에 검색하며 행을 target(경로 또는 바이너리 스트림)에 페이지 단위로 바로 쓴다 → 쓴 행 수
+
+    첫 열은 검색어이고, dedupe면 이미 쓴 제안공고번호는 다시 쓰지 않는다 (먼저 찾은 검색어로 남는다).
+    options는 iter_crawler_many_async 인자(engine, max_pages, filters, browser_executable_path 등)다.
+    """
+    headers = [KEYWORD_COLUMN] + HEADERS
+    key_index = HEADERS.index(KEY_COLUMN)
+    seen = set()
+    extra = {"bom": False} if fmt == "csv" else {}
+    with open_exporter(target, headers, fmt, **extra) as exporter:
+        async for query, rows in iter_crawler_many_async(queries, concurrency, reports=reports, **options):
+            if dedupe:
+                fresh = []
+                for row in rows:
+                    number = row[key_index]
+                    if number and number in seen:
+                        continue
+                    seen.add(number)
+                    fresh.append(row)
+                rows = fresh
+            exporter.write([[query] + row for row in rows])
+    return exporter.rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="g2b-crawl", description="G2B 제안공고 검색 결과를 JSON Lines/CSV/Parquet으로 흘려 쓰기")
+    parser.add_argument("--query", "-q", action="append", help="검색어 (여러 번 지정 가능)")
+    parser.add_argument("--queries-file", help="검색어 파일 (한 줄에 하나, '-'이면 표준 입력)")
+    parser.add_argument("--concurrency", "-c", type=int, default=3, help="동시에 검색할 검색어 수")
+    parser.add_argument("--format", "-f", choices=CLI_FORMATS, help="출력 형식 (기본: --output 확장자, 없으면 jsonl)")
+    parser.add_argument("--output", "-o", default="-", help="출력 파일 (기본: 표준 출력)")
+    parser.add_argument("--engine", choices=["browser", "backend"], default="browser")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES)
+    parser.add_argument("--date-from", help="게시일자 시작 (YYYY-MM-DD)")
+    parser.add_argument("--date-to", help="게시일자 끝 (YYYY-MM-DD)")
+    parser.add_argument("--agency", help="수요기관 (부분 일치)")
+    parser.add_argument("--status", help="공고상태 (부분 일치)")
+    parser.add_argument("--no-dedupe", action="store_true", help="여러 검색어에 걸린 공고를 검색어마다 모두 쓴다")
+    args = parser.parse_args(argv)
+
+    queries = load_queries(args)
+    if not queries:
+        parser.error("검색어가 없습니다 (--query 또는 --queries-file)")
+    to_stdout = args.output == "-"
+    fmt = args.format or ("jsonl" if to_stdout else guess_format(args.output))
+    if fmt not in CLI_FORMATS:
+        parser.error(f"지원하지 않는 형식: {fmt} ({', '.join(CLI_FORMATS)})")
+    if fmt == "parquet" and to_stdout:
+        parser.error("Parquet은 --output 파일로만 쓸 수 있습니다")
+    filters = SearchFilters.coerce({
+        "date_from": args.date_from, "date_to": args.date_to, "agency": args.agency, "status": args.status,
+    })
+    for name in ("date_from", "date_to"):
+        if getattr(args, name) and getattr(filters, name) is None:
+            parser.error(f"날짜 형식이 잘못되었습니다: {getattr(args, name)}")
+
+    target = sys.stdout.buffer if to_stdout else args.output
+    reports = []
+    try:
+        with contextlib.redirect_stdout(sys.stderr):  # 크롤러 진행 로그가 결과 데이터에 섞이지 않게
+            rows = asyncio.run(crawl_to(
+                target, fmt, queries, args.concurrency, not args.no_dedupe, reports,
+                browser_executable_path=find_browser_executable(), engine=args.engine, max_pages=args.max_pages,
+                filters=filters,
+            ))
+    except BrokenPipeError:
+        # 소비자(head 등)가 먼저 끝남: 남은 출력은 버리고 정상 종료
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    failed = [report.query for report in reports if report.status == "error"]
+    print(f"=== {len(queries)}개 검색어, {rows}건 출력"
+          + (f", 실패: {', '.join(failed)}" if failed else "") + " ===", file=sys.stderr)
+    if failed:
+        return 2 if rows else 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,598 +1,1309 @@
 import asyncio
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
-import pandas as pd
+import datetime
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+import glob
 import os
 import platform
+import threading
 
-async def run_crawler_async(query="컴퓨터", browser_executable_path=None):
-    """Streamlit Cloud 환경에 최적화된 G2B 크롤러"""
-    browser = None
-    context = None
-    page = None
-    
+from g2b_pool import BrowserPool, get_shared_pool, run_on_pool_loop
+from g2b_session import default_snapshot
+from g2b_store import default_store
+from g2b_strategy import run_strategies
+from g2b_cache import default_cache, make_key
+from g2b_dom import DomQuery
+from g2b_models import rows_to_notices
+from g2b_backend import BackendCapture, iter_backend_async, load_template, save_template, supported_filters
+from g2b_filters import DEFAULT_PERIOD, SearchFilters
+from g2b_memory import GC_EVERY, GRID_CHUNK, LOW_MEMORY, MemoryMonitor, cap_concurrency, collect_garbage
+from g2b_report import RunReport
+from g2b_resilience import BlockedError, CircuitOpenError, PhaseFailed, block_reason, check_page, retry_phase
+from g2b_routing import DEFAULT_PROFILE, ResourceFilter
+from g2b_waits import LatencyBudget, is_data_response, request_mentions, wait_first, wait_for_function_quiet
+
+HEADERS = ["No", "제안공고번호", "수요기관", "제안공고명", "공고게시일자", "공고마감일시", "공고상태", "사유", "기타"]
+MAX_PAGES = 50  # 안전장치: 100건 × 50페이지
+MENU_XPATH = 'xpath=//a[contains(text(), "제안공고목록")]'
+SEARCH_INPUT_SELECTOR = 'td[data-title="제안공고명"] input[type="text"]'
+MENU_READY_SELECTOR = 'a[id$="_btnPrpblist"], a[title*="제안공고목록"], a[href*="Prpblist"], a[onclick*="Prpblist"]'
+POPUP_HEADER_SELECTOR = "div[id^='mf_wfm_container_wq_uuid_'][class='w2window_header']"
+
+async def iter_crawler_async(query="컴퓨터", browser_executable_path=None, pool=None, max_pages=MAX_PAGES,
+                             use_snapshot=True, engine="browser", timeouts=None, report=None,
+                             resources=DEFAULT_PROFILE, fixture=None, filters=None):
+    """검색 결과를 그리드 페이지 단위(행 목록)로 흘려보내는 비동기 제너레이터
+
+    열 순서는 HEADERS와 같다. 소비자가 중간에 멈추면 컨텍스트도 바로 반납된다.
+    use_snapshot이면 세션 스냅샷(g2b_session)으로 목록 화면까지의 탐색을 건너뛴다.
+    engine="backend"이면 캡처해 둔 백엔드 요청을 HTTP로 재생하고(g2b_backend),
+    템플릿이 없거나 재생이 실패하면 브라우저 경로로 돌아가 템플릿을 새로 캡처한다.
+    timeouts는 단계별 대기 상한(ms)과 'total'(검색 한 번의 전체 시간 예산) 설정이다.
+    report(RunReport)를 넘기면 단계별 소요 시간과 성공한 방법이 채워진다.
+    resources는 리소스 차단 프로필 이름(g2b_routing.PROFILES) 또는 ResourceFilter, 'off'면 차단하지 않는다.
+    fixture(g2b_bench.HarFixture)를 넘기면 실제 사이트 대신 녹화된 HAR로 응답하거나 HAR를 녹화한다.
+    filters(g2b_filters.SearchFilters 또는 dict)는 게시일자 범위·수요기관·공고상태 조건으로,
+    검색 폼/백엔드 파라미터로 먼저 적용하고 적용하지 못한 조건만 받은 행에 거른다.
+    """
     print("--- G2B 크롤러 시작 (Streamlit Cloud) ---")
     print(f"Python 버전: {platform.python_version()}")
     print(f"운영체제: {platform.system()}")
     print(f"검색어: '{query}'")
-    
+    filters = SearchFilters.coerce(filters)
+    if filters.active():
+        print(f"검색 조건: {filters.describe()}")
+
+    report = report if report is not None else RunReport(query, engine)
+    report.query, report.engine = query, engine
+    budget = LatencyBudget.from_config(timeouts)
+    total_rows = 0
+    error = None
+    monitor = MemoryMonitor(report).start()
     try:
-        async with async_playwright() as p:
-            print("1. Playwright 초기화")
-            
-            browser_args = [
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-gpu',
-                '--single-process',
-                '--no-zygote',
-                '--disable-blink-features=AutomationControlled',
-                '--window-size=1920,1080',
-                '--start-maximized',
-                '--disable-extensions',
-                '--disable-images',
-                '--disable-javascript-harmony-shipping',
-                '--disable-background-timer-throttling',
-                '--disable-renderer-backgrounding',
-                '--disable-features=TranslateUI',
-                '--disable-ipc-flooding-protection'
-            ]
-            
-            if browser_executable_path:
-                print(f"2. Chromium 실행 (경로: {browser_executable_path})")
-                browser = await p.chromium.launch(
-                    headless=True,
-                    executable_path=browser_executable_path,
-                    args=browser_args,
-                    timeout=30000
-                )
-            else:
-                print("2. Chromium 실행 (기본 경로)")
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=browser_args,
-                    timeout=30000
+        capture = None
+        if engine == "backend":
+            template = load_template()
+            if template:
+                produced = False
+                date_from, date_to = filters.date_range() if filters.has_dates else (None, None)
+                pages = _timed_pages(
+                    iter_backend_async(query, template, max_pages, date_from, date_to, agency=filters.agency or None),
+                    report, "backend",
                 )
-            
-            print("3. 브라우저 컨텍스트 생성")
-            
-            context = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='ko-KR',
-                timezone_id='Asia/Seoul',
-                ignore_https_errors=True,
-                extra_http_headers={
-                    'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Cache-Control': 'no-cache',
-                    'Pragma': 'no-cache'
-                }
-            )
-            
-            await context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-                window.chrome = {
-                    runtime: {},
-                    loadTimes: function() {},
-                    csi: function() {},
-                    app: {}
-                };
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [
-                        { name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer' },
-                        { name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai' },
-                        { name: 'Native Client', filename: 'internal-nacl-plugin' }
-                    ],
-                });
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['ko-KR', 'ko', 'en-US', 'en'],
-                });
-                Object.defineProperty(navigator, 'platform', {
-                    get: () => 'Linux x86_64'
-                });
-                Object.defineProperty(navigator, 'hardwareConcurrency', {
-                    get: () => 4
-                });
-                Object.defineProperty(navigator, 'deviceMemory', {
-                    get: () => 8
-                });
-            """)
-            
-            page = await context.new_page()
-            print("4. 새 페이지 생성 완료")
-            
-            page.set_default_timeout(30000)
-            page.set_default_navigation_timeout(30000)
-
-            print("5. G2B 사이트 접속 시도")
-            
-            urls_to_try = [
-                "https://shop.g2b.go.kr/index.do",
-                "https://shop.g2b.go.kr/",
-                "https://www.g2b.go.kr/"
-            ]
-            
-            page_loaded = False
-            for url in urls_to_try:
                 try:
-                    print(f"   - URL 시도: {url}")
-                    response = await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-                    
-                    if response and response.status == 200:
-                        await asyncio.sleep(1)  # [최적화] 3초 → 1초
-                        title = await page.title()
-                        print(f"   - 페이지 제목: {title}")
-                        if "나라장터" in title or "조달청" in title or "G2B" in title.upper():
-                            page_loaded = True
-                            print("   ✓ 정상 페이지 로드 확인")
-                            break
-                        elif "접근" in title or "브라우저" in title:
-                            print("   ⚠️ 브라우저 차단 페이지 감지")
-                            continue
+                    async for rows in _client_filtered(pages, filters, supported_filters(template), report):
+                        produced = True
+                        total_rows += len(rows)
+                        yield rows
+                    report.set("engine_used", "backend")
+                    print("\n--- 크롤러 종료 (백엔드) ---")
+                    return
                 except Exception as e:
-                    print(f"   - 실패: {str(e)[:50]}")
-                    continue
-            
-            if not page_loaded:
-                print("\n⚠️ 모든 URL 접속 실패. 우회 방법 시도...")
-                await context.add_cookies([
-                    {"name": "WMONID", "value": "streamlit_session", "domain": ".g2b.go.kr", "path": "/"},
-                    {"name": "JSESSIONID", "value": "abcdef123456", "domain": ".g2b.go.kr", "path": "/"}
-                ])
-                await page.goto("https://shop.g2b.go.kr/index.do", wait_until='domcontentloaded')
-                await asyncio.sleep(1)  # [최적화] 3초 → 1초
-
-            print("6. 페이지 안정화 대기")
+                    if produced:
+                        raise
+                    report.set("backend_fallback", str(e)[:200])
+                    print(f"   ⚠️ 백엔드 재생 실패 ({str(e)[:50]}), 브라우저 경로로 전환")
+            else:
+                report.set("backend_fallback", "템플릿 없음")
+            if not filters.active():  # 조건이 박힌 요청은 기본 검색 템플릿으로 쓸 수 없다
+                capture = BackendCapture(query, HEADERS)
+        report.set("engine_used", "browser")
+
+        own_pool = None
+        try:
+            if pool is None:
+                own_pool = BrowserPool(size=1, contexts_per_browser=1, browser_executable_path=browser_executable_path)
+                pool = own_pool
+            with report.phase("launch"):
+                await pool.start()
+            snapshot = default_snapshot() if use_snapshot else None
+            state = snapshot.load() if snapshot is not None else None
+            options = {'storage_state': state['storage_state']} if state else {}
+            if fixture is not None:
+                options.update(fixture.context_options())
+            async with pool.context(report=report, **options) as context:
+                if fixture is not None:
+                    await fixture.install(context)
+                resource_filter = ResourceFilter.from_profile(resources)
+                if resource_filter is not None:
+                    await resource_filter.install(context)
+                try:
+                    page, applied = await _prepare_search(context, query, snapshot, state, capture, budget, report,
+                                                          filters)
+                    pages = _iter_result_pages(page, max_pages, budget, report)
+                    async for rows in _client_filtered(pages, filters, applied, report):
+                        if capture is not None:
+                            await _save_capture(capture, context, rows)
+                            capture = None
+                        total_rows += len(rows)
+                        yield rows
+                finally:
+                    if resource_filter is not None:
+                        for name, value in resource_filter.stats().items():
+                            report.incr(name, value)
+                        print(f"   - 리소스 요청: 허용 {resource_filter.requests_allowed}건 "
+                              f"({resource_filter.bytes_allowed // 1024}KB), 차단 {resource_filter.requests_blocked}건")
+        finally:
+            if own_pool is not None:
+                await own_pool.close()
+            print("\n--- 크롤러 종료 ---")
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        monitor.stop()
+        report.finish(total_rows, error=error)
+        print(f"⏱️ 총 {report.total_ms}ms: " + ", ".join(
+            f"{name} {entry['ms']:.0f}ms" for name, entry in report.phase_totals().items()
+        ) + f" (최대 RSS {report.info['peak_rss_mb']}MB)")
+
+async def _timed_pages(pages, report, phase):
+    """비동기 제너레이터의 각 페이지 생성 시간을 report의 phase로 기록 (소비자 처리 시간은 제외)"""
+    while True:
+        with report.phase(phase):
             try:
-                await page.wait_for_load_state('networkidle', timeout=10000)
-            except PlaywrightTimeout:
-                print("   - 네트워크 안정화 타임아웃 (정상)")
-
-            print("7. 공지 팝업 닫기 시작")
-            closed_count = 0
-            for attempt in range(5):
-                popup_headers = await page.query_selector_all("div[id^='mf_wfm_container_wq_uuid_'][class='w2window_header']")
-                print(f"   - 시도 {attempt + 1}: {len(popup_headers)}개의 팝업 헤더 발견")
-                if len(popup_headers) == 0:
-                    if attempt == 0:
-                        print("   - 팝업이 없거나 로딩 중... 잠시 대기")
-                        await asyncio.sleep(0.2)  # [최적화] 1초 → 0.2초
-                        continue
-                    else:
-                        print("   - 더 이상 팝업이 없음")
-                        break
-                closed_this_round = False
-                for i, header in enumerate(popup_headers):
+                rows = await pages.__anext__()
+            except StopAsyncIteration:
+                return
+        report.pages += 1
+        yield rows
+
+async def _client_filtered(pages, filters, applied, report):
+    """서버(검색 폼/백엔드 파라미터)에 적용하지 못한 조건으로 페이지 행을 거른다
+
+    게시일 조건을 직접 거를 때는 목록이 최신순이므로 페이지 전체가 시작일보다 이르면 멈춘다.
+    """
+    remaining = [name for name in filters.active() if name not in applied]
+    if filters.active():
+        report.set("filters_server", [name for name in filters.active() if name in applied])
+        report.set("filters_client", remaining)
+    if remaining:
+        print(f"   - 결과에서 직접 거르는 조건: {', '.join(remaining)}")
+    try:
+        async for rows in pages:
+            if not remaining:
+                yield rows
+                continue
+            kept, exhausted = filters.client_filter(rows, HEADERS, remaining)
+            report.incr("rows_filtered_client", len(rows) - len(kept))
+            if kept:
+                yield kept
+            if exhausted:
+                print("   - 게시일 범위 이전 공고만 남아 페이지 넘김 종료")
+                return
+    finally:
+        await pages.aclose()
+
+async def iter_notices_async(query="컴퓨터", **options):
+    """iter_crawler_async와 같지만 페이지마다 ProposalNotice(g2b_models) 목록을 흘려보낸다
+
+    날짜는 파싱되어 있고, 표 형태가 필요하면 to_columns/notices_to_rows로 그때 바꾼다.
+    """
+    pages = iter_crawler_async(query, **options)
+    try:
+        async for rows in pages:
+            yield rows_to_notices(rows, HEADERS)
+    finally:
+        await pages.aclose()
+
+async def run_crawler_async(query="컴퓨터", browser_executable_path=None, pool=None, max_pages=MAX_PAGES,
+                            use_snapshot=True, engine="browser", timeouts=None, report=None,
+                            resources=DEFAULT_PROFILE, fixture=None, filters=None):
+    """Streamlit Cloud 환경에 최적화된 G2B 크롤러
+
+    pool을 넘기면 미리 띄워 둔 브라우저에서 컨텍스트만 빌려 검색하고,
+    없으면 이번 검색 전용 풀(브라우저 1개)을 만들었다가 닫는다.
+    모든 결과 페이지를 모아 (headers, rows)로 반환한다.
+    report(RunReport)를 넘기면 실행 리포트가 채워진다.
+    filters(g2b_filters.SearchFilters)로 게시일자 범위·수요기관·공고상태를 좁힐 수 있다.
+    """
+    data = []
+    try:
+        async for rows in iter_crawler_async(query, browser_executable_path, pool, max_pages, use_snapshot, engine, timeouts, report,
+                                            resources, fixture, filters):
+            data.extend(rows)
+    except CircuitOpenError as e:
+        print(f"\n[중단] {str(e)}")
+    except Exception as e:
+        print(f"\n[ERROR] 크롤링 실패: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        if data:
+            print(f"   - 실패 전까지 수집한 {len(data)}건을 반환합니다.")
+    if not data:
+        return None, None
+    print(f"   ✓ 총 {len(data)}개 데이터 수집 완료")
+    return list(HEADERS), data
+
+async def run_crawler_incremental_async(query="컴퓨터", store=None, known_pages=1, report=None, **options):
+    """증분 검색: 결과를 저장소(g2b_store)에 쌓고 지난 실행 이후 새로 나왔거나 바뀐 공고만 반환
+
+    목록은 최신 공고가 먼저 나오므로, 새/변경 공고가 하나도 없는 페이지가
+    known_pages번 연속 나오면 페이지 넘김을 멈춘다. 반환 표의 첫 열 '구분'은 신규/변경이다.
+    options는 iter_crawler_async로 그대로 넘어간다.
+    """
+    store = store if store is not None else default_store()
+    report = report if report is not None else RunReport(query, options.get("engine", "browser"))
+    changes = []
+    known_streak = 0
+    pages = iter_crawler_async(query, report=report, **options)
+    try:
+        async for rows in pages:
+            fresh = [(change, row) for change, row in store.record(HEADERS, rows, query) if change != "same"]
+            changes.extend(fresh)
+            known_streak = 0 if fresh else known_streak + 1
+            if known_streak >= known_pages:
+                print(f"   - 이미 수집한 공고만 있는 페이지 {known_streak}개, 증분 수집 종료")
+                break
+    except Exception as e:
+        print(f"\n[ERROR] 증분 크롤링 실패: {str(e)}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        await pages.aclose()
+    labels = {"new": "신규", "changed": "변경"}
+    report.incr("notices_new", sum(1 for change, _ in changes if change == "new"))
+    report.incr("notices_changed", sum(1 for change, _ in changes if change == "changed"))
+    print(f"   ✓ 신규 {report.counters['notices_new']}건, 변경 {report.counters['notices_changed']}건")
+    return ["구분"] + list(HEADERS), [[labels[change]] + list(row) for change, row in changes]
+
+async def _save_capture(capture, context, rows):
+    """첫 페이지 행으로 백엔드 요청 템플릿을 만들어 저장 (실패해도 검색은 계속)"""
+    try:
+        template = await capture.finalize(context, rows)
+        if template:
+            save_template(template)
+    except Exception as e:
+        print(f"   - 백엔드 템플릿 저장 실패: {str(e)[:50]}")
+
+async def _prepare_search(context, query, snapshot=None, state=None, capture=None, budget=None, report=None,
+                          filters=None):
+    """빌려온 컨텍스트에서 사이트 접속부터 검색 실행까지 수행하고 (결과 화면 페이지, 폼에 적용한 조건 이름들)을 반환
+
+    state(유효한 세션 스냅샷)가 있으면 목록 화면으로 바로 이동하고,
+    실패하면 스냅샷을 버리고 전체 경로(5~8단계)로 진행한다.
+    """
+    page = await context.new_page()
+    print("4. 새 페이지 생성 완료")
+
+    page.set_default_timeout(30000)
+    page.set_default_navigation_timeout(30000)
+    budget = budget or LatencyBudget()
+    report = report if report is not None else RunReport(query)
+
+    resumed = False
+    report.set("snapshot", "off" if snapshot is None else "none")
+    if state:
+        with report.phase("resume"):
+            resumed = await _resume_list_screen(page, state, budget)
+        report.set("snapshot", "resumed" if resumed else "stale")
+        if not resumed and snapshot is not None:
+            print("   - 세션 스냅샷이 만료됨, 전체 경로로 진행")
+            snapshot.invalidate()
+
+    if not resumed:
+        # 단계마다 실패한 그 단계만 백오프 후 다시 시도한다 (차단이 이어지면 차단기가 열려 바로 실패)
+        with report.phase("navigation"):
+            await retry_phase("navigation", lambda: _open_site(context, page, budget), report=report)
+        home_url = page.url
+        with report.phase("popups"):
+            await _close_popups(page, budget, report)
+        with report.phase("menu"):
+            async def open_list():
+                selector = await _open_proposal_list(page, budget, report)
+                list_page = await _wait_list_screen(context, page, budget)
+                if not await _list_screen_ready(list_page, budget.timeout("form")):
+                    await check_page(list_page)
+                    raise PhaseFailed("제안공고목록 화면이 열리지 않음")
+                return selector, list_page
+
+            async def back_home():
+                await page.goto(home_url, wait_until='domcontentloaded', timeout=budget.timeout("navigation"))
+                await _close_popups(page, budget, report)
+
+            menu_selector, page = await retry_phase("menu", open_list, report=report, on_retry=back_home)
+
+    print("\n9. 검색 조건 설정")
+
+    if len(context.pages) > 1:
+        print("   - 새 탭/창 감지, 전환")
+        page = context.pages[-1]
+        await page.bring_to_front()
+
+    if not resumed and snapshot is not None and await _list_screen_ready(page, budget.timeout("form")):
+        try:
+            await snapshot.save(context, page.url, home_url, menu_selector)
+        except Exception as e:
+            print(f"   - 세션 스냅샷 저장 실패: {str(e)[:50]}")
+
+    with report.phase("form"):
+        applied = await _fill_search_form(page, query, budget, report, filters)
+    if capture is not None:
+        capture.attach(page)
+    with report.phase("search"):
+        async def submit():
+            if await _submit_search(page, query, budget, report) is None:
+                await check_page(page)
+                raise PhaseFailed("검색 결과 응답 없음")
+
+        await retry_phase("search", submit, report=report)
+    return page, applied
+
+async def open_search_results(context, query, budget=None, report=None, use_snapshot=True):
+    """빌려온 컨텍스트에서 query로 검색한 결과 화면 페이지를 반환 (상세 보기 같은 후속 단계용)
+
+    컨텍스트는 세션 스냅샷의 storage_state로 만들어 두면 목록 화면으로 바로 이어진다.
+    """
+    snapshot = default_snapshot() if use_snapshot else None
+    state = snapshot.load() if snapshot is not None else None
+    page, _ = await _prepare_search(context, query, snapshot, state, budget=budget, report=report)
+    return page
+
+async def _list_screen_ready(page, timeout):
+    """제안공고목록 검색 폼이 나타났는지 확인"""
+    try:
+        await page.wait_for_selector(SEARCH_INPUT_SELECTOR, state="attached", timeout=timeout)
+        return True
+    except PlaywrightTimeout:
+        return False
+
+async def _wait_list_screen(context, page, budget):
+    """메뉴 클릭 후 검색 폼이 붙거나 새 탭이 열릴 때까지 대기하고 목록 화면 페이지를 반환"""
+    timeout = budget.timeout("menu")
+    opened = await wait_first(
+        page.wait_for_selector(SEARCH_INPUT_SELECTOR, state="attached", timeout=timeout),
+        context.wait_for_event("page", timeout=timeout),
+        timeout_ms=timeout,
+    )
+    if opened == 1:
+        page = context.pages[-1]
+        await _list_screen_ready(page, budget.timeout("menu"))
+    elif opened is None:
+        print("   - 목록 화면 전환 확인 타임아웃 (계속 진행)")
+    return page
+
+async def _resume_list_screen(page, state, budget):
+    """세션 스냅샷으로 목록 화면을 곧바로 연다 (성공 여부 반환)"""
+    print("5. 세션 스냅샷으로 제안공고목록 바로 열기")
+    list_url = state.get("list_url")
+    home_url = state.get("home_url")
+    menu_selector = state.get("menu_selector")
+    try:
+        target = list_url if list_url and list_url != home_url else home_url
+        if not target:
+            return False
+        await page.goto(target, wait_until='domcontentloaded', timeout=budget.timeout("navigation"))
+        if target == list_url and await _list_screen_ready(page, budget.timeout("menu")):
+            print(f"   ✓ 목록 화면 직접 접속: {list_url}")
+            await page.evaluate(CLOSE_POPUPS_JS)
+            return True
+        if menu_selector:
+            await page.locator(menu_selector).first.dispatch_event("click", timeout=budget.timeout("settle"))
+            list_page = await _wait_list_screen(page.context, page, budget)
+            if await _list_screen_ready(list_page, budget.timeout("form")):
+                print(f"   ✓ 저장된 메뉴로 목록 화면 이동: {menu_selector}")
+                await list_page.evaluate(CLOSE_POPUPS_JS)
+                return True
+    except Exception as e:
+        print(f"   - 스냅샷 경로 실패: {str(e)[:50]}")
+    return False
+
+async def _open_site(context, page, budget):
+    """5~6단계: G2B 접속 및 안정화 대기"""
+    print("5. G2B 사이트 접속 시도")
+    
+    urls_to_try = [
+        "https://shop.g2b.go.kr/index.do",
+        "https://shop.g2b.go.kr/",
+        "https://www.g2b.go.kr/"
+    ]
+    
+    page_loaded = False
+    blocked = None
+    for url in urls_to_try:
+        try:
+            print(f"   - URL 시도: {url}")
+            response = await page.goto(url, wait_until='domcontentloaded', timeout=budget.timeout("navigation"))
+            title = await page.title()
+            reason = block_reason(title, response.status if response else None)
+            if reason:
+                print(f"   ⚠️ {reason}")
+                blocked = reason
+                continue
+            if response and response.status == 200:
+                print(f"   - 페이지 제목: {title}")
+                if "나라장터" in title or "조달청" in title or "G2B" in title.upper():
+                    page_loaded = True
+                    print("   ✓ 정상 페이지 로드 확인")
+                    break
+        except Exception as e:
+            print(f"   - 실패: {str(e)[:50]}")
+            continue
+    
+    if not page_loaded:
+        # 가짜 세션 쿠키로 우회하지 않고 실패로 돌려 retry_phase가 백오프 후 다시 시도하게 한다
+        if blocked:
+            raise BlockedError(blocked)
+        raise PhaseFailed("G2B 사이트 접속 실패 (모든 URL)")
+
+    print("6. 페이지 안정화 대기 (메뉴 로드)")
+    try:
+        await page.wait_for_selector(MENU_READY_SELECTOR, state="attached", timeout=budget.timeout("settle"))
+        print("   ✓ 메뉴 로드 확인")
+    except PlaywrightTimeout:
+        print("   - 메뉴 로드 대기 타임아웃 (계속 진행)")
+
+CLOSE_POPUPS_JS = """
+    () => {
+        let closed = 0;
+        const closeButtons = document.querySelectorAll('button.w2window_close');
+        closeButtons.forEach(btn => {
+            if (btn && btn.offsetParent !== null) {  btn.click(); closed++; }
+        });
+        const inputButtons = document.querySelectorAll('input[type="button"][value="닫기"]');
+        inputButtons.forEach(btn => {
+            if (btn && btn.offsetParent !== null) { btn.click(); closed++; }
+        });
+        return closed;
+    }
+"""
+
+async def _close_popups(page, budget, report):
+    """7단계: 공지 팝업 닫기"""
+    print("7. 공지 팝업 닫기 시작")
+    dom = DomQuery(page, report)
+
+    async def close_by_headers():
+        closed_count = 0
+        for attempt in range(5):
+            popups = await dom.popups(POPUP_HEADER_SELECTOR)
+            print(f"   - 시도 {attempt + 1}: {len(popups)}개의 팝업 헤더 발견")
+            if len(popups) == 0:
+                if attempt == 0:
+                    print("   - 팝업이 없거나 로딩 중... 등장 대기")
                     try:
-                        popup_container = await header.evaluate_handle("""
-                            (element) => {
-                                let parent = element.parentElement;
-                                while (parent) {
-                                    if (parent.classList && parent.classList.contains('w2popup_window')) {
-                                        return parent;
-                                    }
-                                    parent = parent.parentElement;
-                                }
-                                return element.parentElement;
-                            }
-                        """)
-                        is_visible = await popup_container.is_visible()
-                        if not is_visible:
-                            print(f"     - 팝업 {i+1}은 이미 숨겨짐")
-                            continue
-                        print(f"     - 팝업 {i+1} 처리 중...")
-                        close_button = await header.query_selector('button[type="button"][class="w2window_close"]')
-                        if not close_button:
-                            close_button = await header.query_selector('button.w2window_close')
-                        if not close_button:
-                            close_button = await popup_container.query_selector('button[id$="_close"]')
-                        if not close_button:
-                            close_button = await popup_container.query_selector('input[type="button"][value="닫기"]')
-                        if close_button and await close_button.is_visible():
-                            await close_button.click()
-                            await asyncio.sleep(0.1)  # [최적화] 0.5초 → 0.1초
-                            closed_count += 1
-                            closed_this_round = True
-                            print(f"     ✓ 팝업 {i+1} 닫기 성공 (총 {closed_count}개)")
-                        else:
-                            print(f"     - 팝업 {i+1}의 닫기 버튼을 찾을 수 없음")
-                    except Exception as e:
-                        print(f"     - 팝업 {i+1} 처리 실패: {str(e)[:50]}")
-                        continue
-                if not closed_this_round:
-                    print(f"   - 이번 시도에서 닫은 팝업 없음")
+                        await page.wait_for_selector(POPUP_HEADER_SELECTOR, state="attached",
+                                                     timeout=budget.timeout("popups"))
+                    except PlaywrightTimeout:
+                        print("   - 팝업 없음")
+                        break
+                    continue
+                else:
+                    print("   - 더 이상 팝업이 없음")
                     break
-                await asyncio.sleep(0.1)  # [최적화] 0.5초 → 0.1초
-            
-            if closed_count == 0:
-                print("   - JavaScript로 팝업 닫기 시도...")
-                js_closed = await page.evaluate("""
-                    () => {
-                        let closed = 0;
-                        const closeButtons = document.querySelectorAll('button.w2window_close');
-                        closeButtons.forEach(btn => {
-                            if (btn && btn.offsetParent !== null) {  btn.click(); closed++; }
-                        });
-                        const inputButtons = document.querySelectorAll('input[type="button"][value="닫기"]');
-                        inputButtons.forEach(btn => {
-                            if (btn && btn.offsetParent !== null) { btn.click(); closed++; }
-                        });
-                        return closed;
-                    }
-                """)
-                if js_closed > 0:
-                    closed_count = js_closed
-                    print(f"   ✓ JavaScript로 {js_closed}개 팝업 닫기 성공")
-            print(f"   ✓ 총 {closed_count}개의 팝업을 닫았습니다.")
-
-            print("   - 페이지 하단으로 스크롤")
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(0.2)  # [최적화] 1초 → 0.2초
-
-            print("\n8. '제안공고목록' 버튼 찾기")
-            await page.evaluate("window.scrollTo(0, 0)")
-            await asyncio.sleep(0.1)  # [최적화] 0.5초 → 0.1초
-
-            all_links = await page.query_selector_all("a")
-            print(f"   - 페이지의 전체 링크 수: {len(all_links)}")
-            
-            proposal_links = []
-            for link in all_links[:50]:
-                try:
-                    text = await link.inner_text()
-                    title = await link.get_attribute("title")
-                    if text and "제안" in text:
-                        proposal_links.append(f"text: {text[:30]}")
-                    elif title and "제안" in title:
-                        proposal_links.append(f"title: {title[:30]}")
-                except:
+            closed_this_round = False
+            for i, popup in enumerate(popups):
+                if not popup["visible"]:
+                    print(f"     - 팝업 {i+1}은 이미 숨겨짐")
+                    continue
+                print(f"     - 팝업 {i+1} 처리 중...")
+                if not popup["close"] or not popup["closeVisible"]:
+                    print(f"     - 팝업 {i+1}의 닫기 버튼을 찾을 수 없음")
                     continue
-            
-            if proposal_links:
-                print(f"   - 제안 관련 링크 발견: {proposal_links[:3]}")
-            
-            button_clicked = False
-            
-            btn_selectors = [
-                'a[id^="mf_wfm_container_wq_uuid_"][id$="_btnPrpblist"]',
-                'a[title*="제안공고목록"]',
-                'a:has-text("제안공고목록")',
-                'div.w2textbox:has-text("제안공고목록")',
-                'a[href*="Prpblist"]',
-                'a[onclick*="Prpblist"]'
-            ]
-            
-            for sel in btn_selectors:
                 try:
-                    elem = await page.query_selector(sel)
-                    if elem and await elem.is_visible():
-                        await elem.scroll_into_view_if_needed()
-                        await asyncio.sleep(0.1)  # [최적화] 0.5초 → 0.1초
-                        await elem.click()
-                        button_clicked = True
-                        print(f"   ✓ 버튼 클릭 성공: {sel}")
-                        break
+                    await dom.click(popup["close"], timeout=budget.timeout("popups"))
+                    if not await dom.wait_hidden(popup["container"], timeout=budget.timeout("popups")):
+                        print(f"     - 팝업 {i+1}이 아직 보임")
+                    closed_count += 1
+                    closed_this_round = True
+                    print(f"     ✓ 팝업 {i+1} 닫기 성공 (총 {closed_count}개)")
                 except Exception as e:
-                    print(f"   - 선택자 {sel} 실패: {str(e)[:30]}")
+                    print(f"     - 팝업 {i+1} 처리 실패: {str(e)[:50]}")
                     continue
-            
-            if not button_clicked:
+            if not closed_this_round:
+                print(f"   - 이번 시도에서 닫은 팝업 없음")
+                break
+        return closed_count
+
+    async def close_by_js():
+        print("   - JavaScript로 팝업 닫기 시도...")
+        js_closed = await dom.evaluate(CLOSE_POPUPS_JS)
+        if js_closed > 0:
+            print(f"   ✓ JavaScript로 {js_closed}개 팝업 닫기 성공")
+        return js_closed
+
+    _, closed_count = await run_strategies("popups", [("header", close_by_headers), ("js", close_by_js)],
+                                           report=report)
+    closed_count = closed_count or 0
+    report.incr("popups_closed", closed_count)
+    print(f"   ✓ 총 {closed_count}개의 팝업을 닫았습니다.")
+
+    print("   - 페이지 하단으로 스크롤")
+    await dom.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+
+async def _open_proposal_list(page, budget, report):
+    """8단계: '제안공고목록' 화면으로 이동 (재사용 가능한 메뉴 선택자를 반환)"""
+    print("\n8. '제안공고목록' 버튼 찾기")
+    dom = DomQuery(page, report)
+    await dom.evaluate("window.scrollTo(0, 0)")
+
+    found = await dom.links("제안")
+    print(f"   - 페이지의 전체 링크 수: {found['total']}")
+    proposal_links = [
+        f"text: {link['text'][:30]}" if "제안" in link["text"] else f"title: {link['title'][:30]}"
+        for link in found["links"]
+    ]
+    if proposal_links:
+        print(f"   - 제안 관련 링크 발견: {proposal_links[:3]}")
+    
+    btn_selectors = [
+        'a[id^="mf_wfm_container_wq_uuid_"][id$="_btnPrpblist"]',
+        'a[title*="제안공고목록"]',
+        'a:has-text("제안공고목록")',
+        'div.w2textbox:has-text("제안공고목록")',
+        'a[href*="Prpblist"]',
+        'a[onclick*="Prpblist"]'
+    ]
+    states = dict(zip(btn_selectors, await dom.selector_states(btn_selectors)))
+
+    def click_selector(sel):
+        async def attempt():
+            state = states[sel]
+            if state is None:
+                # :has-text 등 Playwright 전용 선택자는 CSS로 미리 확인할 수 없어 직접 확인
+                if not await dom.is_visible(sel):
+                    return False
+            elif not state["visible"]:
+                return False
+            await dom.click(sel, timeout=budget.timeout("menu"))
+            print(f"   ✓ 버튼 클릭 성공: {sel}")
+            return sel
+        return attempt
+
+    async def click_xpath():
+        await dom.click(MENU_XPATH, timeout=min(3000, budget.timeout("menu")))
+        print("   ✓ 버튼 클릭 성공 (XPath)")
+        return MENU_XPATH
+
+    async def link_walk():
+        print("   - 모든 링크를 순회하며 찾기...")
+        for link in found["links"]:
+            if "제안공고" not in link["title"] and "제안공고" not in link["text"]:
+                continue
+            print(f"     - 발견: text='{link['text'][:20]}', title='{link['title']}'")
+            if link["href"] and link["href"].strip() != "javascript:void(null)":
                 try:
-                    await page.click('xpath=//a[contains(text(), "제안공고목록")]', timeout=3000)
-                    button_clicked = True
-                    print("   ✓ 버튼 클릭 성공 (XPath)")
-                except:
-                    pass
-            if not button_clicked:
-                print("   - 모든 링크를 순회하며 찾기...")
-                all_a = await page.query_selector_all("a")
-                for a in all_a:
-                    try:
-                        title = await a.get_attribute("title")
-                        href = await a.get_attribute("href")
-                        inner = await a.inner_text()
-                        if (title and "제안공고" in title) or (inner and "제안공고" in inner):
-                            print(f"     - 발견: text='{inner[:20]}', title='{title}'")
-                            if href and href.strip() != "javascript:void(null)":
-                                await a.scroll_into_view_if_needed()
-                                await asyncio.sleep(0.05)  # [최적화] 0.2초 → 0.05초
-                                await a.click()
-                                button_clicked = True
-                                print("   ✓ 버튼 클릭 성공 (링크 순회)")
-                                break
-                    except:
-                        continue
-            if not button_clicked:
-                print("   - JavaScript로 강제 클릭 시도...")
-                clicked = await page.evaluate("""
-                    () => {
-                        const links = document.querySelectorAll('a');
-                        for (let link of links) {
-                            if (link.innerText && link.innerText.includes('제안공고목록')) {
-                                link.click();
-                                return true;
-                            }
-                            if (link.title && link.title.includes('제안공고목록')) {
-                                link.click();
-                                return true;
-                            }
-                        }
-                        return false;
+                    await dom.click(link["selector"], timeout=budget.timeout("menu"))
+                except Exception:
+                    continue
+                print("   ✓ 버튼 클릭 성공 (링크 순회)")
+                return "link-walk"
+        return False
+
+    async def js_click():
+        print("   - JavaScript로 강제 클릭 시도...")
+        clicked = await dom.evaluate("""
+            () => {
+                const links = document.querySelectorAll('a');
+                for (let link of links) {
+                    if (link.innerText && link.innerText.includes('제안공고목록')) {
+                        link.click();
+                        return true;
                     }
-                """)
-                if clicked:
-                    button_clicked = True
-                    print("   ✓ 버튼 클릭 성공 (JavaScript)")
-            if not button_clicked:
-                content = await page.content()
-                if len(content) < 5000:
-                    raise Exception(f"페이지가 제대로 로드되지 않음 (크기: {len(content)} bytes)")
-                else:
-                    try:
-                        await page.screenshot(path="debug_screenshot.png")
-                        print("   - 디버그 스크린샷 저장: debug_screenshot.png")
-                    except:
-                        pass
-                    raise Exception("제안공고목록 버튼을 찾을 수 없음")
-
-            await asyncio.sleep(0.7)  # [최적화] 3초 → 0.7초
-            
-            print("\n9. 검색 조건 설정")
-            
-            if len(context.pages) > 1:
-                print("   - 새 탭/창 감지, 전환")
-                page = context.pages[-1]
-                await page.bring_to_front()
+                    if (link.title && link.title.includes('제안공고목록')) {
+                        link.click();
+                        return true;
+                    }
+                }
+                return false;
+            }
+        """)
+        if clicked:
+            print("   ✓ 버튼 클릭 성공 (JavaScript)")
+        return "js" if clicked else False
 
+    strategies = [(sel, click_selector(sel)) for sel in btn_selectors]
+    strategies += [("xpath", click_xpath), ("link-walk", link_walk), ("js", js_click)]
+    winner, result = await run_strategies("menu", strategies, report=report)
+    button_clicked = winner is not None
+    # 세션 스냅샷에 남길 선택자 (링크 순회/JS 클릭은 다시 쓸 선택자가 없음)
+    menu_selector = result if winner in btn_selectors or winner == "xpath" else None
+    if not button_clicked:
+        content = await page.content()
+        if len(content) < 5000:
+            raise PhaseFailed(f"페이지가 제대로 로드되지 않음 (크기: {len(content)} bytes)")
+        else:
             try:
-                await page.click('input[title="3개월"]', timeout=3000)
-                print("   ✓ 3개월 선택")
+                await page.screenshot(path="debug_screenshot.png")
+                print("   - 디버그 스크린샷 저장: debug_screenshot.png")
             except:
-                await page.evaluate("""
-                    document.querySelectorAll('input[type="radio"]').forEach(r => {
-                        if (r.title && r.title.includes('3개월')) r.click();
-                    });
-                """)
-                print("   ✓ 3개월 선택 (JS)")
-
-            print(f"\n   검색어 '{query}' 입력 시도...")
-            input_success = False
-            try:
-                input_elem = await page.query_selector('td[data-title="제안공고명"] input[type="text"]')
-                if input_elem:
-                    await input_elem.click()
-                    await asyncio.sleep(0.07)  # [최적화] 0.2초 → 0.07초
-                    await input_elem.clear()
-                    await asyncio.sleep(0.07)  # [최적화] 0.2초 → 0.07초
-                    await input_elem.type(query, delay=30)  # [최적화] delay=100 → 30
-                    await asyncio.sleep(0.08)  # [최적화] 0.3초 → 0.08초
-                    input_value = await input_elem.input_value()
-                    if input_value == query:
-                        input_success = True
-                        print(f"   ✓ 검색어 '{query}' 입력 완료 (방법 1)")
-                    else:
-                        print(f"   ⚠️ 입력 값 불일치: '{input_value}' != '{query}'")
-            except Exception as e:
-                print(f"   - 방법 1 실패: {str(e)[:50]}")
-            if not input_success:
-                try:
-                    input_elem = await page.query_selector('input[placeholder*="제안공고명"], input[title*="제안공고명"]')
-                    if input_elem:
-                        await input_elem.click()
-                        await asyncio.sleep(0.07)
-                        await input_elem.clear()
-                        await asyncio.sleep(0.07)
-                        await input_elem.type(query, delay=30)
-                        await asyncio.sleep(0.08)
-                        input_value = await input_elem.input_value()
-                        if input_value == query:
-                            input_success = True
-                            print(f"   ✓ 검색어 '{query}' 입력 완료 (방법 2)")
-                except Exception as e:
-                    print(f"   - 방법 2 실패: {str(e)[:50]}")
-            if not input_success:
-                try:
-                    js_result = await page.evaluate(f"""
-                        () => {{
-                            const inputs = document.querySelectorAll('input[type="text"]');
-                            for (let input of inputs) {{
-                                const td = input.closest('td');
-                                if (td) {{
-                                    const dataTitle = td.getAttribute('data-title');
-                                    if (dataTitle && dataTitle === '제안공고명') {{
-                                        input.focus();
-                                        input.value = '';
-                                        input.value = '{query}';
-                                        input.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                                        input.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                                        input.dispatchEvent(new KeyboardEvent('keyup', {{ bubbles: true }}));
-                                        return {{ success: true, value: input.value }};
-                                    }}
-                                }}
-                                if ((input.placeholder && input.placeholder.includes('제안공고')) ||
-                                    (input.title && input.title.includes('제안공고'))) {{
-                                    input.focus();
-                                    input.value = '{query}';
-                                    input.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                                    input.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                                    return {{ success: true, value: input.value }};
-                                }}
-                            }}
-                            return {{ success: false, value: null }};
-                        }}
-                    """)
-                    if js_result and js_result.get('success'):
-                        input_success = True
-                        print(f"   ✓ 검색어 '{query}' 입력 완료 (JavaScript)")
-                        print(f"     입력된 값: {js_result.get('value')}")
-                except Exception as e:
-                    print(f"   - 방법 3 실패: {str(e)[:50]}")
-            if input_success:
-                await asyncio.sleep(0.05)  # [최적화] 0.5초 → 0.05초
-            else:
-                print(f"   ⚠️ 검색어 입력 실패! 전체 검색이 될 수 있습니다.")
-
-            print("\n   검색 버튼 클릭 전 입력 값 최종 확인...")
-            final_check = await page.evaluate("""
-                () => {
-                    const inputs = document.querySelectorAll('input[type="text"]');
-                    for (let input of inputs) {
-                        const td = input.closest('td');
-                        if (td && td.getAttribute('data-title') === '제안공고명') {
-                            return input.value;
+                pass
+            raise PhaseFailed("제안공고목록 버튼을 찾을 수 없음")
+
+    print(f"   - DOM 왕복 {dom.round_trips}회")
+    return menu_selector
+
+# 검색 폼에서 data-title(열 이름)이 titles 중 하나를 포함하는 칸의 입력/선택 요소를 채우는 JS
+FILL_FIELD_JS = """
+    ({titles, values}) => {
+        for (const td of document.querySelectorAll('td[data-title], th[data-title]')) {
+            const title = td.getAttribute('data-title') || '';
+            if (!titles.some(t => title.includes(t))) continue;
+            const inputs = Array.from(td.querySelectorAll('input[type="text"]')).filter(i => !i.readOnly || i.value);
+            if (inputs.length < values.length) continue;
+            values.forEach((value, i) => {
+                const input = inputs[i];
+                input.focus();
+                input.value = value;
+                input.dispatchEvent(new Event('input', { bubbles: true }));
+                input.dispatchEvent(new Event('change', { bubbles: true }));
+                input.dispatchEvent(new Event('blur', { bubbles: true }));
+            });
+            return inputs.slice(0, values.length).map(i => i.value);
+        }
+        return null;
+    }
+"""
+
+SELECT_OPTION_JS = """
+    ({titles, label}) => {
+        const selects = [];
+        for (const td of document.querySelectorAll('td[data-title], th[data-title]')) {
+            const title = td.getAttribute('data-title') || '';
+            if (titles.some(t => title.includes(t))) selects.push(...td.querySelectorAll('select'));
+        }
+        for (const select of selects) {
+            const option = Array.from(select.options).find(o => o.text.trim().includes(label));
+            if (!option) continue;
+            select.value = option.value;
+            select.dispatchEvent(new Event('change', { bubbles: true }));
+            return option.text.trim();
+        }
+        return null;
+    }
+"""
+DATE_FIELD_TITLES = ["게시일", "공고일"]
+AGENCY_FIELD_TITLES = ["수요기관"]
+STATUS_FIELD_TITLES = ["공고상태", "진행상태"]
+
+async def _fill_filters(page, filters, budget, report):
+    """게시일자 범위·수요기관·공고상태를 검색 폼에 넣고, 넣은 조건 이름 목록을 반환"""
+    applied = []
+
+    async def fill_field(titles, values):
+        filled = await page.evaluate(FILL_FIELD_JS, {"titles": titles, "values": values})
+        # 달력 입력은 표시 형식(YYYY-MM-DD 등)으로 바뀔 수 있으므로 구분자를 빼고 비교
+        plain = lambda v: "".join(ch for ch in v if ch not in "-./ ")
+        return bool(filled) and [plain(v) for v in filled] == [plain(v) for v in values]
+
+    if filters.has_dates:
+        date_from, date_to = filters.date_range()
+        values = [date_from.strftime("%Y%m%d"), date_to.strftime("%Y%m%d")]
+
+        async def dates_fill():
+            for i, value in enumerate(values):
+                field = page.locator(", ".join(
+                    f'td[data-title*="{t}"] input[type="text"]' for t in DATE_FIELD_TITLES
+                )).nth(i)
+                await field.fill(value, timeout=min(3000, budget.timeout("form")))
+            return True
+
+        async def dates_js():
+            return await fill_field(DATE_FIELD_TITLES, values)
+
+        winner, _ = await run_strategies("filter_date", [("fill", dates_fill), ("js", dates_js)], report=report)
+        if winner:
+            applied.append("date")
+            print(f"   ✓ 게시일자 {date_from} ~ {date_to} 입력")
+
+    if filters.agency:
+        async def agency_type():
+            field = page.locator(", ".join(
+                f'td[data-title*="{t}"] input[type="text"]' for t in AGENCY_FIELD_TITLES
+            )).first
+            await field.fill(filters.agency, timeout=min(3000, budget.timeout("form")))
+            return await field.input_value() == filters.agency
+
+        async def agency_js():
+            return await fill_field(AGENCY_FIELD_TITLES, [filters.agency])
+
+        winner, _ = await run_strategies("filter_agency", [("fill", agency_type), ("js", agency_js)], report=report)
+        if winner:
+            applied.append("agency")
+            print(f"   ✓ 수요기관 '{filters.agency}' 입력")
+
+    if filters.status:
+        async def status_js():
+            return await page.evaluate(SELECT_OPTION_JS, {"titles": STATUS_FIELD_TITLES, "label": filters.status})
+
+        winner, label = await run_strategies("filter_status", [("js", status_js)], report=report)
+        if winner:
+            applied.append("status")
+            print(f"   ✓ 공고상태 '{label}' 선택")
+
+    return applied
+
+async def _fill_search_form(page, query, budget, report, filters=None):
+    """9단계: 조회 기간·검색 조건과 검색어 입력 (단계마다 지난번에 성공한 방법부터 시도)
+
+    폼에 적용한 조건 이름(g2b_filters.FILTER_NAMES 중) 목록을 반환한다.
+    """
+    filters = filters if filters is not None else SearchFilters()
+    applied = await _fill_filters(page, filters, budget, report)
+
+    async def period_click():
+        await page.click(f'input[title="{DEFAULT_PERIOD}"]', timeout=min(3000, budget.timeout("form")))
+        print(f"   ✓ {DEFAULT_PERIOD} 선택")
+        return True
+
+    async def period_js():
+        await page.evaluate("""
+            (period) => document.querySelectorAll('input[type="radio"]').forEach(r => {
+                if (r.title && r.title.includes(period)) r.click();
+            })
+        """, DEFAULT_PERIOD)
+        print(f"   ✓ {DEFAULT_PERIOD} 선택 (JS)")
+        return True
+
+    if "date" not in applied:
+        await run_strategies("period", [("click", period_click), ("js", period_js)], report=report)
+        if filters.has_dates:
+            print(f"   ⚠️ 게시일자 입력 실패, {DEFAULT_PERIOD} 조회 결과에서 직접 거릅니다.")
+
+    print(f"\n   검색어 '{query}' 입력 시도...")
+
+    def type_into(selector, label):
+        async def attempt():
+            input_elem = await page.query_selector(selector)
+            if not input_elem:
+                return False
+            await input_elem.click(timeout=budget.timeout("form"))
+            await input_elem.clear()
+            await input_elem.type(query, delay=30)
+            input_value = await input_elem.input_value()
+            if input_value != query:
+                print(f"   ⚠️ 입력 값 불일치: '{input_value}' != '{query}'")
+                return False
+            print(f"   ✓ 검색어 '{query}' 입력 완료 ({label})")
+            return True
+        return attempt
+
+    async def input_js():
+        js_result = await page.evaluate("""
+            (query) => {
+                const inputs = document.querySelectorAll('input[type="text"]');
+                for (let input of inputs) {
+                    const td = input.closest('td');
+                    if (td) {
+                        const dataTitle = td.getAttribute('data-title');
+                        if (dataTitle && dataTitle === '제안공고명') {
+                            input.focus();
+                            input.value = '';
+                            input.value = query;
+                            input.dispatchEvent(new Event('input', { bubbles: true }));
+                            input.dispatchEvent(new Event('change', { bubbles: true }));
+                            input.dispatchEvent(new KeyboardEvent('keyup', { bubbles: true }));
+                            return { success: true, value: input.value };
                         }
                     }
-                    return null;
+                    if ((input.placeholder && input.placeholder.includes('제안공고')) ||
+                        (input.title && input.title.includes('제안공고'))) {
+                        input.focus();
+                        input.value = query;
+                        input.dispatchEvent(new Event('input', { bubbles: true }));
+                        input.dispatchEvent(new Event('change', { bubbles: true }));
+                        return { success: true, value: input.value };
+                    }
                 }
-            """)
-            if final_check:
-                print(f"   → 최종 확인된 검색어: '{final_check}'")
-                if final_check != query:
-                    print(f"   ⚠️ 경고: 입력된 검색어가 다릅니다! '{final_check}' != '{query}'")
-            else:
-                print("   ⚠️ 검색어 필드를 찾을 수 없음")
+                return { success: false, value: null };
+            }
+        """, query)
+        if js_result and js_result.get('success'):
+            print(f"   ✓ 검색어 '{query}' 입력 완료 (JavaScript)")
+            print(f"     입력된 값: {js_result.get('value')}")
+            return True
+        return False
 
-            try:
-                await page.select_option('select[id*="RecordCountPerPage"]', "100")
-                print("   ✓ 표시 수 100개 설정")
-            except:
-                await page.evaluate("""
-                    document.querySelectorAll('select').forEach(s => {
-                        if (s.id && s.id.includes('RecordCountPerPage')) {
-                            s.value = '100';
-                            s.dispatchEvent(new Event('change', { bubbles: true }));
-                        }
-                    });
-                """)
-                print("   ✓ 표시 수 100개 설정 (JS)")
+    winner, _ = await run_strategies("input", [
+        ("data-title", type_into(SEARCH_INPUT_SELECTOR, "방법 1")),
+        ("placeholder", type_into('input[placeholder*="제안공고명"], input[title*="제안공고명"]', "방법 2")),
+        ("js", input_js),
+    ], report=report)
+    if winner is None:
+        report.method("input", "failed")
+        print(f"   ⚠️ 검색어 입력 실패! 전체 검색이 될 수 있습니다.")
 
-            try:
-                await page.click('input[value="적용"]', timeout=2000)
-                await asyncio.sleep(0.07)  # [최적화] 1초 → 0.07초
-                print("   ✓ 적용 버튼 클릭")
-            except:
-                print("   - 적용 버튼 클릭 실패 (계속 진행)")
+    print("\n   검색 버튼 클릭 전 입력 값 최종 확인...")
+    final_check = await page.evaluate("""
+        () => {
+            const inputs = document.querySelectorAll('input[type="text"]');
+            for (let input of inputs) {
+                const td = input.closest('td');
+                if (td && td.getAttribute('data-title') === '제안공고명') {
+                    return input.value;
+                }
+            }
+            return null;
+        }
+    """)
+    if final_check:
+        print(f"   → 최종 확인된 검색어: '{final_check}'")
+        if final_check != query:
+            print(f"   ⚠️ 경고: 입력된 검색어가 다릅니다! '{final_check}' != '{query}'")
+    else:
+        print("   ⚠️ 검색어 필드를 찾을 수 없음")
+    return applied
 
-            try:
-                await page.click('input[value="검색"]', timeout=3000)
-                print("   ✓ 검색 실행")
-            except:
-                await page.evaluate("""
-                    document.querySelectorAll('input[type="button"]').forEach(btn => {
-                        if (btn.value === '검색') btn.click();
-                    });
-                """)
-                print("   ✓ 검색 실행 (JS)")
-
-            await asyncio.sleep(1.5)  # [최적화] 5초 → 1.5초
-
-            print("\n10. 검색 결과 수집")
-            
-            table_found = False
-            data = []
-            table_data = await page.evaluate("""
-                () => {
-                    const tables = document.querySelectorAll('table');
-                    for (let table of tables) {
-                        if (table.id && (table.id.includes('grdPrps') || table.id.includes('Pbanc'))) {
-                            const rows = [];
-                            const trs = table.querySelectorAll('tr');
-                            for (let tr of trs) {
-                                const row = [];
-                                const tds = tr.querySelectorAll('td');
-                                for (let td of tds) {
-                                    let text = '';
-                                    const nobr = td.querySelector('nobr');
-                                    const link = td.querySelector('a');
-                                    if (nobr) {
-                                        text = nobr.innerText;
-                                    } else if (link) {
-                                        text = link.innerText;
-                                    } else {
-                                        text = td.innerText;
-                                    }
-                                    row.push(text.trim());
-                                }
-                                if (row.length > 0 && row.some(cell => cell != '')) {
-                                    rows.push(row);
-                                }
-                            }
-                            if (rows.length > 0) {
-                                return rows;
-                            }
+async def _submit_search(page, query, budget, report):
+    """표시 수 설정 후 검색을 실행하고, 검색 응답·그리드 갱신 중 먼저 오는 신호까지 대기"""
+    async def page_size_select():
+        await page.select_option('select[id*="RecordCountPerPage"]', "100", timeout=budget.timeout("form"))
+        print("   ✓ 표시 수 100개 설정")
+        return True
+
+    async def page_size_js():
+        await page.evaluate("""
+            document.querySelectorAll('select').forEach(s => {
+                if (s.id && s.id.includes('RecordCountPerPage')) {
+                    s.value = '100';
+                    s.dispatchEvent(new Event('change', { bubbles: true }));
+                }
+            });
+        """)
+        print("   ✓ 표시 수 100개 설정 (JS)")
+        return True
+
+    await run_strategies("page_size", [("select", page_size_select), ("js", page_size_js)], report=report)
+
+    try:
+        await page.click('input[value="적용"]', timeout=min(2000, budget.timeout("form")))
+        print("   ✓ 적용 버튼 클릭")
+    except:
+        print("   - 적용 버튼 클릭 실패 (계속 진행)")
+
+    _, signature = await _read_grid(page)
+    timeout = budget.timeout("search")
+    grid_changed = page.wait_for_function(GRID_CHANGED_JS, arg=signature, timeout=timeout)
+    responded = page.wait_for_event(
+        "response",
+        predicate=lambda r: is_data_response(r) and request_mentions(r.request, query),
+        timeout=timeout,
+    )
+    waiter = asyncio.ensure_future(wait_first(grid_changed, responded, timeout_ms=timeout))
+    await asyncio.sleep(0)  # 클릭 전에 대기 리스너가 등록되도록 한 번 양보
+
+    async def submit_click():
+        await page.click('input[value="검색"]', timeout=3000)
+        print("   ✓ 검색 실행")
+        return True
+
+    async def submit_js():
+        await page.evaluate("""
+            document.querySelectorAll('input[type="button"]').forEach(btn => {
+                if (btn.value === '검색') btn.click();
+            });
+        """)
+        print("   ✓ 검색 실행 (JS)")
+        return True
+
+    await run_strategies("submit", [("click", submit_click), ("js", submit_js)], report=report)
+
+    signal = await waiter
+    report.method("search_wait", {0: "grid", 1: "response"}.get(signal, "timeout"))
+    if signal == 0:
+        print("   ✓ 그리드 갱신 확인")
+    elif signal == 1:
+        # 응답은 왔고 렌더링만 남음: 짧게 그리드 갱신을 기다린다
+        if await wait_for_function_quiet(page, GRID_CHANGED_JS, signature, min(2000, budget.timeout("search"))):
+            print("   ✓ 검색 응답 수신 후 그리드 갱신 확인")
+        else:
+            print("   ✓ 검색 응답 수신 (그리드 변화 없음)")
+    else:
+        print("   ⚠️ 검색 결과 대기 타임아웃")
+    return signal
+
+# 결과 그리드(grdPrps/Pbanc)의 행과, 페이지 전환 감지에 쓰는 서명(행 수 + 첫 행)을 읽는 JS
+# readGrid(start, limit)는 start번째 행부터 limit개만 돌려준다 (저메모리 모드의 나눠 읽기)
+GRID_READER_JS = """
+    function readGrid(start = 0, limit = Infinity) {
+        const tables = document.querySelectorAll('table');
+        for (let table of tables) {
+            if (table.id && (table.id.includes('grdPrps') || table.id.includes('Pbanc'))) {
+                const rows = [];
+                const trs = table.querySelectorAll('tr');
+                for (let tr of trs) {
+                    const row = [];
+                    const tds = tr.querySelectorAll('td');
+                    for (let td of tds) {
+                        let text = '';
+                        const nobr = td.querySelector('nobr');
+                        const link = td.querySelector('a');
+                        if (nobr) {
+                            text = nobr.innerText;
+                        } else if (link) {
+                            text = link.innerText;
+                        } else {
+                            text = td.innerText;
                         }
+                        row.push(text.trim());
+                    }
+                    if (row.length > 0 && row.some(cell => cell != '')) {
+                        rows.push(row);
                     }
-                    return null;
                 }
-            """)
-            if table_data:
-                data = table_data
-                table_found = True
-                print(f"   ✓ {len(data)}개 데이터 수집 완료")
-            else:
+                if (rows.length > 0) {
+                    return {
+                        rows: rows.slice(start, start + limit),
+                        total: rows.length,
+                        signature: JSON.stringify([rows.length, rows[0]])
+                    };
+                }
+            }
+        }
+        return null;
+    }
+"""
+
+GRID_CHANGED_JS = (
+    "(prev) => { " + GRID_READER_JS + " const g = readGrid(); return !!g && g.signature !== prev; }"
+)
+
+async def _read_grid(page, chunk=None):
+    """그리드 행과 서명, chunk를 주면 그 행 수씩 나눠 읽는다 (한 번에 큰 배열을 직렬화하지 않게)"""
+    if not chunk:
+        grid = await page.evaluate("() => { " + GRID_READER_JS + " return readGrid(); }")
+        if not grid:
+            return [], None
+        return grid["rows"], grid["signature"]
+    reader = "([start, limit]) => { " + GRID_READER_JS + " return readGrid(start, limit); }"
+    rows = []
+    signature = None
+    while True:
+        grid = await page.evaluate(reader, [len(rows), chunk])
+        if not grid:
+            return rows, signature
+        if signature is not None and grid["signature"] != signature:
+            rows, signature = [], None  # 읽는 도중 그리드가 바뀜: 처음부터 다시
+            continue
+        signature = grid["signature"]
+        rows.extend(grid["rows"])
+        if not grid["rows"] or len(rows) >= grid["total"]:
+            return rows, signature
+
+async def _extract_grid(page):
+    """현재 그리드 페이지의 행을 HEADERS 길이에 맞춰 반환 (없으면 빈 목록, 서명 None)"""
+    rows, signature = await _read_grid(page, GRID_CHUNK if LOW_MEMORY else None)
+    return [_normalize_row(row) for row in rows], signature
+
+def _normalize_row(row):
+    row = list(row[:len(HEADERS)])
+    if len(row) < len(HEADERS):
+        row += [""] * (len(HEADERS) - len(row))
+    return row
+
+async def _goto_next_page(page, next_page_no, signature, timeout):
+    """그리드 페이지 목록에서 다음 페이지(번호 → '다음' 버튼 순)를 눌러 그리드가 바뀔 때까지 대기"""
+    clicked = await page.evaluate("""
+        (nextNo) => {
+            const visible = el => el.offsetParent !== null;
+            const boxes = Array.from(document.querySelectorAll(
+                '[class*="w2pageList"], [id*="pgl"], [id*="PageList"], [id*="pageList"]'
+            )).filter(visible);
+            for (const box of boxes) {
+                const items = Array.from(box.querySelectorAll('a, button, li, span')).filter(visible);
+                const numbered = items.find(el =>
+                    el.children.length === 0 && el.innerText && el.innerText.trim() === String(nextNo)
+                );
+                if (numbered) {
+                    numbered.click();
+                    return 'page ' + nextNo;
+                }
+                const next = items.find(el => {
+                    const label = [
+                        el.getAttribute('title'), el.getAttribute('alt'),
+                        el.getAttribute('class'), el.innerText
+                    ].join(' ').toLowerCase();
+                    const isLast = label.includes('last') || label.includes('마지막');
+                    return !isLast && (label.includes('next') || label.includes('다음'));
+                });
+                if (next) {
+                    next.click();
+                    return 'next';
+                }
+            }
+            return null;
+        }
+    """, next_page_no)
+    if not clicked:
+        return False
+    if not await wait_for_function_quiet(page, GRID_CHANGED_JS, signature, timeout):
+        print(f"   - {next_page_no}페이지로 전환되지 않음 ({clicked}), 수집 종료")
+        return False
+    return True
+
+async def _iter_result_pages(page, max_pages, budget, report):
+    """10단계: 그리드를 페이지 단위로 읽어 yield
+
+    페이지 넘김은 전체 시간 예산을 쓰지 않고 페이지마다 'page' 단계 상한만 기다린다.
+    """
+    print("\n10. 검색 결과 수집")
+    seen = set()
+    page_no = 1
+    while True:
+        with report.phase("extraction"):
+            rows, signature = await _extract_grid(page)
+        if not rows:
+            if page_no == 1:
                 print("   ⚠️ 테이블 데이터를 찾을 수 없음")
-            if table_found and data:
-                df = pd.DataFrame(data)
-                headers = ["No", "제안공고번호", "수요기관", "제안공고명", "공고게시일자", "공고마감일시", "공고상태", "사유", "기타"]
-                if len(df.columns) < len(headers):
-                    headers = headers[:len(df.columns)]
-                elif len(df.columns) > len(headers):
-                    df = df.iloc[:, :len(headers)]
-                df.columns = headers
-                print(f"   ✓ DataFrame 생성 완료")
-                return headers, df.values.tolist()
-            else:
-                return None, None
+            return
+        if signature in seen:
+            print(f"   - {page_no}페이지가 이전 페이지와 같음, 수집 종료")
+            return
+        seen.add(signature)
+        print(f"   ✓ {page_no}페이지: {len(rows)}개 데이터 수집")
+        report.pages += 1
+        yield rows
+        if page_no >= max_pages:
+            print(f"   - 최대 {max_pages}페이지 도달, 수집 종료")
+            return
+        page_no += 1
+        if LOW_MEMORY and GC_EVERY and page_no % GC_EVERY == 0:
+            with report.phase("gc"):
+                if await collect_garbage(page):
+                    report.incr("gc_runs")
+        with report.phase("pagination"):
+            moved = await _goto_next_page(page, page_no, signature, budget.phase_timeout("page"))
+        if not moved:
+            return
 
-    except Exception as e:
-        print(f"\n[ERROR] 크롤링 실패: {str(e)}")
-        import traceback
-        traceback.print_exc()
+async def run_crawler_many_async(queries, concurrency=3, browser_executable_path=None, pool=None, engine="browser",
+                                 timeouts=None, reports=None, filters=None):
+    """여러 검색어를 한 이벤트 루프에서 동시에 검색하고 결과를 하나의 표로 합친다
+
+    첫 열에 '검색어'를 붙이고, 같은 제안공고번호가 여러 검색어에 걸리면
+    한 행으로 합치고 검색어 칸에 모두 나열한다.
+    reports(list)를 넘기면 검색어별 RunReport가 추가된다.
+    """
+    queries = [q.strip() for q in queries if q and q.strip()]
+    queries = list(dict.fromkeys(queries))
+    if not queries:
         return None, None
-        
+    concurrency = cap_concurrency(min(int(concurrency), len(queries)))
+    print(f"=== 다중 검색 시작: {len(queries)}개 검색어, 동시 {concurrency}개 ===")
+
+    own_pool = None
+    if pool is None:
+        own_pool = BrowserPool(
+            size=(concurrency + 1) // 2,
+            contexts_per_browser=2,
+            browser_executable_path=browser_executable_path,
+        )
+        pool = own_pool
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def search_one(query):
+        async with semaphore:
+            report = RunReport(query, engine)
+            if reports is not None:
+                reports.append(report)
+            return query, await run_crawler_async(query, pool=pool, engine=engine, timeouts=timeouts, report=report,
+                                                  filters=filters)
+
+    try:
+        results = await asyncio.gather(*(search_one(q) for q in queries))
     finally:
+        if own_pool is not None:
+            await own_pool.close()
+    return merge_keyword_results(results)
+
+async def iter_crawler_many_async(queries, concurrency=3, browser_executable_path=None, pool=None, reports=None,
+                                  **options):
+    """여러 검색어를 동시에 검색하며 (검색어, 행 목록)을 그리드 페이지가 읽히는 대로 흘려보내는 비동기 제너레이터
+
+    options는 iter_crawler_async의 나머지 인자(engine, max_pages, timeouts, filters 등)다.
+    한 검색어가 실패해도 나머지는 계속하고, 실패는 reports(list)에 추가되는 검색어별 RunReport에 남는다.
+    소비자가 중간에 멈추면 진행 중인 검색을 취소하고 컨텍스트를 반납한다.
+    """
+    queries = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+    if not queries:
+        return
+    concurrency = cap_concurrency(min(int(concurrency), len(queries)))
+    own_pool = None
+    if pool is None:
+        own_pool = BrowserPool(
+            size=(concurrency + 1) // 2,
+            contexts_per_browser=min(2, concurrency),
+            browser_executable_path=browser_executable_path,
+        )
+        pool = own_pool
+    semaphore = asyncio.Semaphore(concurrency)
+    queue = asyncio.Queue()
+    done = object()
+
+    async def search_one(query):
+        async with semaphore:
+            report = RunReport(query, options.get("engine", "browser"))
+            if reports is not None:
+                reports.append(report)
+            pages = iter_crawler_async(query, pool=pool, report=report, **options)
+            try:
+                async for rows in pages:
+                    queue.put_nowait((query, rows))
+            except Exception as e:
+                print(f"\n[ERROR] '{query}' 크롤링 실패: {str(e)}")
+            finally:
+                await pages.aclose()
+
+    async def search_all():
         try:
-            if page:
-                await page.close()
-            if context:
-                await context.close()
-            if browser:
-                await browser.close()
-        except:
-            pass
-        print("\n--- 크롤러 종료 ---")
-
-def run_g2b_crawler(query="컴퓨터", browser_executable_path=None):
-    """Streamlit Cloud 환경용 G2B 크롤러 실행"""
-    if not browser_executable_path:
-        possible_paths = [
-            "/usr/bin/chromium",
-            "/usr/bin/chromium-browser",
-            "/app/.apt/usr/bin/chromium",
-            "/app/.apt/usr/bin/chromium-browser",
-            "/home/appuser/.cache/ms-playwright/chromium-*/chrome-linux/chrome"
-        ]
-        for path in possible_paths:
-            if os.path.exists(path):
-                browser_executable_path = path
-                print(f"Chromium 경로 자동 감지: {path}")
+            await asyncio.gather(*(search_one(q) for q in queries))
+        finally:
+            queue.put_nowait(done)
+
+    runner = asyncio.ensure_future(search_all())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
                 break
+            yield item
+        await runner
+    finally:
+        if not runner.done():
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+        if own_pool is not None:
+            await own_pool.close()
+
+def merge_keyword_results(results):
+    """[(검색어, (headers, rows)), ...]를 검색어 열이 붙은 하나의 표로 병합"""
+    merged_headers = None
+    merged_rows = []
+    by_number = {}
+    for query, (headers, rows) in results:
+        if not headers or not rows:
+            print(f"   - '{query}': 결과 없음")
+            continue
+        if merged_headers is None:
+            merged_headers = ["검색어"] + list(headers)
+        key_index = headers.index("제안공고번호") if "제안공고번호" in headers else None
+        added = 0
+        for row in rows:
+            row = list(row)[:len(merged_headers) - 1]
+            row += [""] * (len(merged_headers) - 1 - len(row))
+            number = row[key_index] if key_index is not None else None
+            if number and number in by_number:
+                existing = by_number[number]
+                if query not in existing[0].split(", "):
+                    existing[0] = f"{existing[0]}, {query}"
+                continue
+            merged = [query] + row
+            if number:
+                by_number[number] = merged
+            merged_rows.append(merged)
+            added += 1
+        print(f"   - '{query}': {len(rows)}건 중 {added}건 추가")
+    if not merged_rows:
+        return None, None
+    print(f"=== 다중 검색 완료: 중복 제거 후 {len(merged_rows)}건 ===")
+    return merged_headers, merged_rows
+
+BROWSER_CANDIDATES = [
+    "/usr/bin/chromium",
+    "/usr/bin/chromium-browser",
+    "/app/.apt/usr/bin/chromium",
+    "/app/.apt/usr/bin/chromium-browser",
+    "/home/appuser/.cache/ms-playwright/chromium-*/chrome-linux/chrome",
+]
+_browser_executable = None
+_browser_probed = False
+_browser_lock = threading.Lock()
+
+def find_browser_executable(refresh=False):
+    """시스템에 설치된 Chromium 실행 파일 경로 탐색 (없으면 None → Playwright 기본값)
+
+    한 번 찾은 결과는 프로세스 안에서 재사용한다 (refresh=True면 다시 찾는다).
+    """
+    global _browser_executable, _browser_probed
+    with _browser_lock:
+        if refresh or not _browser_probed:
+            _browser_executable = None
+            candidates = list(BROWSER_CANDIDATES)
+            browsers_path = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+            if browsers_path:
+                candidates.append(os.path.join(browsers_path, "chromium-*", "chrome-linux", "chrome"))
+            for pattern in candidates:
+                found = sorted(glob.glob(pattern))
+                if found:
+                    _browser_executable = found[-1]
+                    print(f"Chromium 경로 자동 감지: {_browser_executable}")
+                    break
+            _browser_probed = True
+        return _browser_executable
+
+def run_g2b_crawler(query="컴퓨터", browser_executable_path=None, use_pool=True, engine="browser", timeouts=None,
+                    report=None, filters=None):
+    """Streamlit Cloud 환경용 G2B 크롤러 실행
+
+    use_pool=True(기본)이면 프로세스 전역 브라우저 풀을 재사용하므로
+    두 번째 검색부터는 Chromium 기동 비용이 들지 않는다.
+    engine="backend"이면 브라우저 렌더링 없이 백엔드 요청 재생을 먼저 시도한다.
+    report(RunReport)를 넘기면 단계별 소요 시간 리포트가 채워진다.
+    filters(g2b_filters.SearchFilters)는 검색 폼/백엔드 파라미터로 넘길 검색 조건이다.
+    """
+    if not browser_executable_path:
+        browser_executable_path = find_browser_executable()
+    options = {"engine": engine, "timeouts": timeouts, "report": report, "filters": filters}
+    if use_pool:
+        try:
+            pool = get_shared_pool(browser_executable_path)
+        except Exception as e:
+            print(f"브라우저 풀 준비 실패, 단독 실행으로 전환: {e}")
+        else:
+            return run_on_pool_loop(run_crawler_async(query, pool=pool, **options))
     try:
         loop = asyncio.get_running_loop()
         import nest_asyncio
         nest_asyncio.apply()
-        task = loop.create_task(run_crawler_async(query, browser_executable_path))
+        task = loop.create_task(run_crawler_async(query, browser_executable_path, **options))
         return loop.run_until_complete(task)
     except RuntimeError:
-        return asyncio.run(run_crawler_async(query, browser_executable_path))
+        return asyncio.run(run_crawler_async(query, browser_executable_path, **options))
     except Exception as e:
         print(f"실행 오류: {e}")
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
-            return loop.run_until_complete(run_crawler_async(query, browser_executable_path))
+            return loop.run_until_complete(run_crawler_async(query, browser_executable_path, **options))
         finally:
             loop.close()
+
+def run_g2b_crawler_many(queries, concurrency=3, browser_executable_path=None, engine="browser", timeouts=None,
+                         reports=None, filters=None):
+    """여러 검색어를 공유 브라우저 풀에서 동시에 검색 (동기 래퍼)"""
+    if not browser_executable_path:
+        browser_executable_path = find_browser_executable()
+    try:
+        pool = get_shared_pool(browser_executable_path)
+    except Exception as e:
+        print(f"브라우저 풀 준비 실패, 전용 풀로 실행: {e}")
+        return asyncio.run(run_crawler_many_async(queries, concurrency, browser_executable_path, engine=engine, timeouts=timeouts,
+                                                  reports=reports, filters=filters))
+    if concurrency > pool.capacity:
+        print(f"   - 공유 풀 용량({pool.capacity})이 동시 검색 수보다 작아 {pool.capacity}개씩 실행됩니다.")
+    return run_on_pool_loop(run_crawler_many_async(queries, concurrency, pool=pool, engine=engine, timeouts=timeouts,
+                                                   reports=reports, filters=filters))
+
+def run_g2b_crawler_incremental(query="컴퓨터", browser_executable_path=None, store=None, engine="browser",
+                                timeouts=None, report=None, filters=None):
+    """증분 검색 동기 래퍼 (공유 브라우저 풀 사용), (headers, 신규/변경 행)을 반환"""
+    if not browser_executable_path:
+        browser_executable_path = find_browser_executable()
+    options = {"engine": engine, "timeouts": timeouts, "filters": filters}
+    try:
+        pool = get_shared_pool(browser_executable_path)
+    except Exception as e:
+        print(f"브라우저 풀 준비 실패, 단독 실행으로 전환: {e}")
+        return asyncio.run(run_crawler_incremental_async(
+            query, store, report=report, browser_executable_path=browser_executable_path, **options))
+    return run_on_pool_loop(run_crawler_incremental_async(query, store, report=report, pool=pool, **options))
+
+def search_cache_key(query, filters=None):
+    """결과 캐시 키: (검색어, 조회 기간, 필터), 기간을 지정하지 않으면 오늘 기준 3개월"""
+    filters = SearchFilters.coerce(filters)
+    if filters.has_dates:
+        date_range = [d.isoformat() for d in filters.date_range()]
+    else:
+        date_range = (DEFAULT_PERIOD, datetime.date.today().isoformat())
+    return make_key(query, date_range, filters.cache_parts())
+
+def run_g2b_crawler_cached(query="컴퓨터", browser_executable_path=None, engine="browser", timeouts=None,
+                           report=None, cache=None, filters=None):
+    """결과 캐시(g2b_cache)를 거치는 run_g2b_crawler
+
+    키(search_cache_key)는 (검색어, 조회 기간, 필터)이고 조회 기간은 오늘 기준 3개월이므로 날짜가 바뀌면 새로 검색한다.
+    TTL이 지난 결과는 바로 돌려주고 백그라운드에서 다시 검색해 채운다.
+    """
+    cache = cache if cache is not None else default_cache()
+    key = search_cache_key(query, filters)
+    result, state = cache.get_or_fetch(
+        key,
+        lambda: run_g2b_crawler(query, browser_executable_path, engine=engine, timeouts=timeouts, report=report,
+                                filters=filters),
+        refresh=lambda: run_g2b_crawler(query, browser_executable_path, engine=engine, timeouts=timeouts, filters=filters),
+    )
+    print(f"   - 결과 캐시: {state}")
+    if report is not None:
+        report.set("cache", state)
+        if state != "miss":
+            report.finish(len(result[1]))
+    return result
@@ -0,0 +1,182 @@
+"""설정한 검색어 목록을 주기적으로 수집해 결과 저장소(g2b_store)에 쌓는 백그라운드 수집기
+
+    python g2b_daemon.py 컴퓨터 노트북 --interval 1800 --concurrency 2
+    python g2b_daemon.py --keywords-file keywords.txt --once      # cron용 1회 실행
+
+Streamlit 앱은 검색 대신 저장소에서 바로 결과를 읽는다 ("저장된 결과 보기").
+"""
+import argparse
+import asyncio
+import os
+import random
+import signal
+import time
+
+from g2b_crawler import MAX_PAGES, find_browser_executable, run_crawler_incremental_async
+from g2b_memory import cap_concurrency
+from g2b_pool import BrowserPool
+from g2b_report import RunReport
+from g2b_store import ResultStore, STORE_PATH
+
+DAEMON_INTERVAL = int(os.environ.get("G2B_DAEMON_INTERVAL", "1800"))
+DAEMON_JITTER = float(os.environ.get("G2B_DAEMON_JITTER", "0.2"))
+DAEMON_CONCURRENCY = int(os.environ.get("G2B_DAEMON_CONCURRENCY", "2"))
+DAEMON_FULL_EVERY = int(os.environ.get("G2B_DAEMON_FULL_EVERY", "6"))
+SLOW_RUN_MS = int(os.environ.get("G2B_DAEMON_SLOW_MS", "90000"))
+BACKOFF_BASE = 60
+BACKOFF_MAX = 6 * 3600
+
+
+def jittered(seconds, jitter=DAEMON_JITTER):
+    """seconds에 ±jitter 비율의 무작위 편차를 더한다 (여러 수집기가 같은 시각에 몰리지 않게)"""
+    return max(0.0, seconds * (1 + random.uniform(-jitter, jitter)))
+
+
+def backoff_delay(failures, base=BACKOFF_BASE, maximum=BACKOFF_MAX):
+    """연속 실패 횟수에 따른 지수 백오프 (지터 포함)"""
+    if failures <= 0:
+        return 0.0
+    return jittered(min(maximum, base * 2 ** (failures - 1)))
+
+
+class CrawlDaemon:
+    """검색어 목록을 주기적으로 증분 수집하는 데몬
+
+    - 한 주기에 검색어들을 최대 concurrency개씩 동시에 수집 (브라우저 풀 공유)
+    - 보통은 증분 수집, full_every 주기마다 한 번은 전체 페이지를 훑어 뒤쪽 공고의 상태 변경도 반영
+    - 실패·느린 응답(slow_ms 초과)이 이어진 검색어는 지수 백오프로 잠시 쉬고,
+      한 주기 전체가 실패하면 다음 주기까지의 간격도 같은 방식으로 늘린다
+    """
+
+    def __init__(self, keywords, store=None, interval=DAEMON_INTERVAL, concurrency=DAEMON_CONCURRENCY,
+                 full_every=DAEMON_FULL_EVERY, slow_ms=SLOW_RUN_MS, browser_executable_path=None, engine="browser"):
+        self.keywords = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+        self.store = store if store is not None else ResultStore()
+        self.interval = interval
+        self.concurrency = cap_concurrency(concurrency)
+        self.full_every = max(1, full_every)
+        self.slow_ms = slow_ms
+        self.browser_executable_path = browser_executable_path
+        self.engine = engine
+        self.cycle = 0
+        self.failures = {}       # 검색어별 연속 실패(느림 포함) 횟수
+        self.resume_at = {}      # 검색어별 백오프 해제 시각
+        self.cycle_failures = 0  # 전체가 실패한 연속 주기 수
+        self._stop = asyncio.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    async def run_forever(self):
+        async with BrowserPool(size=(self.concurrency + 1) // 2, contexts_per_browser=min(2, self.concurrency),
+                               browser_executable_path=self.browser_executable_path) as pool:
+            while not self._stop.is_set():
+                await self.run_cycle(pool)
+                delay = jittered(self.interval) + backoff_delay(self.cycle_failures)
+                print(f"=== 다음 수집까지 {delay:.0f}초 ===")
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run_once(self):
+        async with BrowserPool(size=(self.concurrency + 1) // 2, contexts_per_browser=min(2, self.concurrency),
+                               browser_executable_path=self.browser_executable_path) as pool:
+            return await self.run_cycle(pool)
+
+    async def run_cycle(self, pool):
+        """검색어 전체를 한 번 수집하고 검색어별 RunReport 목록을 반환"""
+        self.cycle += 1
+        full = self.cycle % self.full_every == 1 or self.full_every == 1
+        now = time.time()
+        due = [k for k in self.keywords if self.resume_at.get(k, 0) <= now]
+        skipped = len(self.keywords) - len(due)
+        print(f"=== 수집 주기 {self.cycle} ({'전체' if full else '증분'}): {len(due)}개 검색어"
+              + (f", 백오프 중 {skipped}개 건너뜀" if skipped else "") + " ===")
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def crawl(keyword):
+            async with semaphore:
+                if self._stop.is_set():
+                    return None
+                await asyncio.sleep(jittered(2.0, 1.0))  # 동시에 시작하는 검색 사이 간격
+                return await self._crawl_keyword(pool, keyword, full)
+
+        reports = [r for r in await asyncio.gather(*(crawl(k) for k in due)) if r is not None]
+        if reports and all(r.status == "error" for r in reports):
+            self.cycle_failures += 1
+        else:
+            self.cycle_failures = 0
+        return reports
+
+    async def _crawl_keyword(self, pool, keyword, full):
+        report = RunReport(keyword, self.engine)
+        started = time.time()
+        known_pages = MAX_PAGES if full else 1
+        await run_crawler_incremental_async(keyword, self.store, known_pages=known_pages, report=report,
+                                            pool=pool, engine=self.engine)
+        slow = (report.total_ms or 0) > self.slow_ms
+        if report.status == "error" or slow:
+            failures = self.failures.get(keyword, 0) + 1
+            self.failures[keyword] = failures
+            delay = backoff_delay(failures)
+            self.resume_at[keyword] = time.time() + delay
+            reason = report.error if report.status == "error" else f"느린 응답 {report.total_ms:.0f}ms"
+            print(f"   ⚠️ '{keyword}' {reason} → {delay:.0f}초 백오프")
+        else:
+            self.failures.pop(keyword, None)
+            self.resume_at.pop(keyword, None)
+        self.store.record_run(
+            keyword, started, time.time(), report.status, "full" if full else "incremental",
+            rows=report.rows, new=report.counters.get("notices_new", 0),
+            changed=report.counters.get("notices_changed", 0), error=report.error,
+        )
+        return report
+
+
+def load_keywords(args):
+    keywords = list(args.keywords)
+    if args.keywords_file:
+        with open(args.keywords_file, encoding="utf-8") as f:
+            keywords += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not keywords:
+        keywords = [k for k in os.environ.get("G2B_DAEMON_KEYWORDS", "").split(",") if k.strip()]
+    return keywords
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="G2B 제안공고 백그라운드 수집기")
+    parser.add_argument("keywords", nargs="*", help="검색어 (없으면 --keywords-file 또는 G2B_DAEMON_KEYWORDS)")
+    parser.add_argument("--keywords-file")
+    parser.add_argument("--interval", type=int, default=DAEMON_INTERVAL, help="수집 간격(초), ±지터 적용")
+    parser.add_argument("--concurrency", type=int, default=DAEMON_CONCURRENCY)
+    parser.add_argument("--full-every", type=int, default=DAEMON_FULL_EVERY, help="몇 주기마다 전체 페이지를 수집할지")
+    parser.add_argument("--store", default=STORE_PATH)
+    parser.add_argument("--engine", choices=["browser", "backend"], default="browser")
+    parser.add_argument("--once", action="store_true", help="한 주기만 실행하고 종료 (cron용)")
+    args = parser.parse_args(argv)
+
+    keywords = load_keywords(args)
+    if not keywords:
+        parser.error("검색어가 없습니다")
+    daemon = CrawlDaemon(keywords, ResultStore(args.store), args.interval, args.concurrency, args.full_every,
+                         browser_executable_path=find_browser_executable(), engine=args.engine)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, daemon.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+        if args.once:
+            reports = await daemon.run_once()
+            return 1 if reports and all(r.status == "error" for r in reports) else 0
+        await daemon.run_forever()
+        return 0
+
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
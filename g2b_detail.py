@@ -0,0 +1,293 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from urllib.parse import quote
+
+from g2b_crawler import find_browser_executable, open_search_results
+from g2b_pool import get_shared_pool, run_on_pool_loop
+from g2b_report import RunReport
+from g2b_routing import DEFAULT_PROFILE, ResourceFilter
+from g2b_session import default_snapshot
+from g2b_store import KEY_COLUMN, default_store
+from g2b_waits import LatencyBudget, wait_first, wait_for_function_quiet
+
+DETAIL_CONCURRENCY = int(os.environ.get("G2B_DETAIL_CONCURRENCY", "4"))         # 동시에 여는 상세 페이지 수
+DETAIL_MAX_AGE = int(os.environ.get("G2B_DETAIL_MAX_AGE", str(7 * 24 * 3600)))  # 이보다 오래된 상세 정보는 다시 가져옴
+DETAIL_TIMEOUT = int(os.environ.get("G2B_DETAIL_TIMEOUT_MS", "10000"))
+DETAIL_SEARCH_LIMIT = int(os.environ.get("G2B_DETAIL_SEARCH_LIMIT", "20"))  # 한 번에 공고명 검색으로 여는 상세 화면 수 상한
+DETAIL_TEMPLATE_PATH = os.environ.get(
+    "G2B_DETAIL_PATH", os.path.join(tempfile.gettempdir(), "g2b_detail.json")
+)
+
+# 결과 표에 덧붙이는 열과, 상세 화면 항목 이름 후보 (앞의 것이 우선, 정확히 같은 이름을 먼저 찾는다)
+DETAIL_COLUMNS = ["예산", "품목", "담당자", "연락처", "첨부파일"]
+DETAIL_LABELS = {
+    "예산": ("배정예산", "사업금액", "추정가격", "예산금액", "예산"),
+    "품목": ("세부품명", "품목", "품명"),
+    "담당자": ("담당자명", "담당자"),
+    "연락처": ("담당자 전화번호", "전화번호", "연락처"),
+}
+_NOT_NAME = ("전화", "연락처", "이메일", "팩스")  # '담당자'를 부분 일치로 찾을 때 건너뛸 항목
+
+# 상세 화면이 그려졌는지: 공고번호가 보이고 상세 화면에만 있는 항목 이름이 있으면 준비된 것으로 본다
+DETAIL_READY_JS = """
+    (number) => {
+        if (!document.body || !document.body.innerText.includes(number)) return false;
+        const marks = ['담당자', '첨부파일', '배정예산', '사업금액', '추정가격'];
+        return Array.from(document.querySelectorAll('th, label')).some(
+            el => marks.some(m => (el.innerText || '').includes(m))
+        );
+    }
+"""
+
+# 상세 화면의 항목(th → 옆 td, data-title 칸)과 첨부파일 링크를 한 번에 읽는다
+DETAIL_READER_JS = """
+    () => {
+        const clean = (t) => (t || '').replace(/\\s+/g, ' ').trim();
+        const fields = {};
+        const put = (label, value) => {
+            label = clean(label).replace(/[:：*]/g, '').trim();
+            value = clean(value);
+            if (label && label.length <= 30 && value && !(label in fields)) fields[label] = value;
+        };
+        for (const th of document.querySelectorAll('th')) {
+            const td = th.nextElementSibling;
+            if (td && td.tagName === 'TD') put(th.innerText, td.innerText);
+        }
+        for (const td of document.querySelectorAll('td[data-title]')) {
+            const table = td.closest('table');
+            if (table && table.id && table.id.includes('grd')) continue;  // 결과 그리드 칸은 제외
+            put(td.getAttribute('data-title'), td.innerText);
+        }
+        const attachments = [];
+        const seen = new Set();
+        for (const a of document.querySelectorAll('a')) {
+            const name = clean(a.innerText || a.getAttribute('title'));
+            const href = a.getAttribute('href') || '';
+            const onclick = a.getAttribute('onclick') || '';
+            const isFile = /\\.(hwpx?|pdf|docx?|xlsx?|pptx?|zip|txt)$/i.test(name) || /down/i.test(href + onclick);
+            if (!name || !isFile || seen.has(name)) continue;
+            seen.add(name);
+            attachments.push({name, href: href.startsWith('javascript') ? '' : a.href});
+        }
+        return {fields, attachments};
+    }
+"""
+
+
+def _pick(fields, names, exclude=()):
+    for name in names:
+        if fields.get(name):
+            return fields[name]
+    for name in names:
+        for label, value in fields.items():
+            if name in label and not any(word in label for word in exclude):
+                return value
+    return ""
+
+
+def detail_columns(detail):
+    """상세 정보 → DETAIL_COLUMNS 순서의 값 목록 (없으면 빈 칸)"""
+    if not detail:
+        return [""] * len(DETAIL_COLUMNS)
+    fields = detail.get("fields", {})
+    values = {
+        column: _pick(fields, names, _NOT_NAME if column == "담당자" else ())
+        for column, names in DETAIL_LABELS.items()
+    }
+    values["첨부파일"] = ", ".join(a["name"] for a in detail.get("attachments", []))
+    return [values[column] for column in DETAIL_COLUMNS]
+
+
+def load_detail_template(path=DETAIL_TEMPLATE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            template = json.load(f)
+        return template if "{number}" in template.get("url", "") else None
+    except (OSError, ValueError):
+        return None
+
+
+def save_detail_template(url, number, path=DETAIL_TEMPLATE_PATH):
+    """상세 화면 URL에 공고번호가 들어 있으면 '{number}' 자리표시자로 바꿔 저장 (다음부터는 URL로 바로 연다)"""
+    encoded = quote(number, safe="")
+    if number not in url and encoded not in url:
+        return None
+    template = {"url": url.replace(number, "{number}").replace(encoded, "{number}"), "saved_at": time.time()}
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".g2b_detail_")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(template, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return template
+
+
+class DetailFetcher:
+    """결과 행의 상세 화면을 풀의 컨텍스트 여러 개에서 동시에 열어 예산·품목·담당자·첨부파일을 가져온다
+
+    상세 정보는 저장소(g2b_store)에 제안공고번호로 남겨 max_age 안에서는 다시 열지 않는다.
+    상세 화면 URL에 공고번호가 들어 있으면 템플릿으로 기억해 다음부터는 URL로 바로 열고,
+    아니면 공고명으로 검색해 그 행의 링크를 누르는 방법으로 연다. 이 방법은 상세 화면마다 검색 전체를
+    다시 하므로 실행 한 번에 search_limit건까지만 쓰고 나머지는 비워 둔다 (report 'details_search_skipped').
+    """
+
+    def __init__(self, pool, store=None, concurrency=DETAIL_CONCURRENCY, max_age=DETAIL_MAX_AGE,
+                 resources=DEFAULT_PROFILE, report=None, search_limit=DETAIL_SEARCH_LIMIT):
+        self.pool = pool
+        self.search_limit = search_limit
+        self.searches = 0
+        self.store = store if store is not None else default_store()
+        self.concurrency = concurrency
+        self.max_age = max_age
+        self.resources = resources
+        self.report = report if report is not None else RunReport("상세", "browser")
+        self.template = load_detail_template()
+
+    async def fetch_many(self, notices):
+        """[(제안공고번호, 제안공고명), ...]의 상세 정보 → {제안공고번호: 상세 정보}
+
+        저장소에 있는 것은 그대로 쓰고, 나머지만 워커(컨텍스트) concurrency개가 나눠 연다.
+        """
+        notices = list(dict(n for n in notices if n[0]).items())
+        found = self.store.details([number for number, _ in notices], self.max_age)
+        todo = [(number, title) for number, title in notices if number not in found]
+        self.report.incr("details_cached", len(found))
+        if not todo:
+            return found
+        workers = max(1, min(self.concurrency, self.pool.capacity, len(todo)))
+        print(f"📎 상세 정보: {len(found)}건 저장소 재사용, {len(todo)}건을 {workers}개 페이지에서 가져옵니다.")
+        await self.pool.start()
+        queue = asyncio.Queue()
+        for item in todo:
+            queue.put_nowait(item)
+        await asyncio.gather(*(self._worker(queue, found) for _ in range(workers)))
+        return found
+
+    async def _worker(self, queue, found):
+        state = default_snapshot().load()
+        options = {"storage_state": state["storage_state"]} if state else {}
+        async with self.pool.context(report=self.report, **options) as context:
+            resource_filter = ResourceFilter.from_profile(self.resources)
+            if resource_filter is not None:
+                await resource_filter.install(context)
+            while not queue.empty():
+                number, title = queue.get_nowait()
+                try:
+                    with self.report.phase("detail"):
+                        detail = await self._fetch(context, number, title)
+                except Exception as e:
+                    print(f"   - '{number}' 상세 정보 실패: {str(e)[:50]}")
+                    detail = None
+                if detail:
+                    found[number] = detail
+                    self.store.save_detail(number, detail)
+                    self.report.incr("details_fetched")
+                else:
+                    self.report.incr("details_failed")
+
+    async def _fetch(self, context, number, title):
+        if self.template is not None:
+            detail = await self._fetch_by_url(context, number)
+            if detail:
+                self.report.method("detail", "url")
+                return detail
+        if self.searches >= self.search_limit:
+            self.report.incr("details_search_skipped")
+            return None
+        self.searches += 1
+        self.report.incr("details_search")
+        if self.searches == 1:
+            print("   - 상세 화면 URL 템플릿이 없어 공고명 검색으로 엽니다 "
+                  f"(이번 실행에서 최대 {self.search_limit}건)")
+        elif self.searches == self.search_limit:
+            print(f"   ⚠️ 공고명 검색으로 연 상세 화면이 {self.search_limit}건에 도달, 나머지는 건너뜁니다")
+        detail = await self._fetch_by_search(context, number, title)
+        if detail:
+            self.report.method("detail", "search")
+        return detail
+
+    async def _read(self, page, number):
+        if not await wait_for_function_quiet(page, DETAIL_READY_JS, number, DETAIL_TIMEOUT):
+            return None
+        detail = await page.evaluate(DETAIL_READER_JS)
+        if not detail["fields"]:
+            return None
+        detail["url"] = page.url
+        return detail
+
+    async def _fetch_by_url(self, context, number):
+        page = await context.new_page()
+        try:
+            await page.goto(self.template["url"].replace("{number}", quote(number, safe="")), timeout=DETAIL_TIMEOUT,
+                            wait_until="domcontentloaded")
+            return await self._read(page, number)
+        finally:
+            await page.close()
+
+    async def _fetch_by_search(self, context, number, title):
+        """공고명으로 검색한 뒤 그 공고번호 행의 링크를 눌러 상세 화면(같은 페이지 또는 새 창)을 읽는다"""
+        opened = set(context.pages)
+        try:
+            page = await open_search_results(context, title or number, LatencyBudget(), self.report)
+            row = page.locator("tr", has=page.get_by_text(number, exact=True)).first
+            popup = context.wait_for_event("page", timeout=DETAIL_TIMEOUT)
+            in_place = page.wait_for_function(DETAIL_READY_JS, arg=number, timeout=DETAIL_TIMEOUT)
+            waiter = asyncio.ensure_future(wait_first(popup, in_place, timeout_ms=DETAIL_TIMEOUT))
+            try:
+                await asyncio.sleep(0)  # 클릭 전에 대기 리스너가 등록되도록 한 번 양보
+                await row.locator("a").first.click(timeout=DETAIL_TIMEOUT)
+                signal = await waiter
+            finally:
+                # 클릭이 실패하거나 취소되면 새 창·상세 화면 대기도 함께 거둔다
+                if not waiter.done():
+                    waiter.cancel()
+                    await asyncio.gather(waiter, return_exceptions=True)
+            target = context.pages[-1] if signal == 0 else page
+            detail = await self._read(target, number)
+            if detail and self.template is None:
+                self.template = save_detail_template(target.url, number)
+                if self.template is not None:
+                    print(f"   ✓ 상세 화면 URL 템플릿 저장: {self.template['url']}")
+            return detail
+        finally:
+            # 검색 도중 실패해도, 메뉴·상세 링크가 새 창을 열었어도 이번에 연 페이지는 모두 닫는다
+            for page in [p for p in context.pages if p not in opened]:
+                await page.close()
+
+    async def enrich(self, headers, rows, numbers=None):
+        """(headers, rows)에 DETAIL_COLUMNS 열을 붙여 반환 (numbers를 주면 그 공고만 가져오고 나머지 칸은 비움)"""
+        headers = list(headers)
+        if KEY_COLUMN not in headers:
+            raise ValueError(f"'{KEY_COLUMN}' 열이 없어 상세 정보를 붙일 수 없습니다")
+        key = headers.index(KEY_COLUMN)
+        title = headers.index("제안공고명") if "제안공고명" in headers else None
+        wanted = set(numbers) if numbers is not None else None
+        targets = [
+            (row[key], row[title] if title is not None else "")
+            for row in rows
+            if key < len(row) and (wanted is None or row[key] in wanted)
+        ]
+        details = await self.fetch_many(targets)
+        print(f"   ✓ 상세 정보 {len(details)}/{len(dict(targets))}건")
+        return headers + DETAIL_COLUMNS, [
+            list(row) + detail_columns(details.get(row[key]) if key < len(row) else None) for row in rows
+        ]
+
+
+async def enrich_async(headers, rows, pool, numbers=None, store=None, concurrency=DETAIL_CONCURRENCY, report=None):
+    """검색 결과 (headers, rows)에 상세 정보 열을 붙인다 (파이프라인의 선택 단계)"""
+    fetcher = DetailFetcher(pool, store, concurrency, report=report)
+    return await fetcher.enrich(headers, rows, numbers)
+
+
+def enrich_results(result, browser_executable_path=None, numbers=None, store=None, concurrency=DETAIL_CONCURRENCY,
+                   report=None):
+    """run_g2b_crawler 결과에 상세 정보 열을 붙이는 동기 래퍼 (공유 브라우저 풀 사용)"""
+    headers, rows = result
+    if not rows:
+        return result
+    pool = get_shared_pool(browser_executable_path or find_browser_executable())
+    return run_on_pool_loop(enrich_async(headers, rows, pool, numbers, store, concurrency, report))
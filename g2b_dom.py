@@ -0,0 +1,148 @@
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+# 요소마다 inner_text/get_attribute/is_visible/query_selector를 부르면 호출마다 CDP 왕복이 생긴다.
+# 아래 스크립트는 필요한 정보를 한 번의 page.evaluate로 모아 작은 dict(디스크립터)로 돌려주고,
+# 클릭처럼 실제 입력이 필요한 동작만 디스크립터의 selector로 따로 수행한다.
+_HELPERS_JS = """
+    const isVisible = (el) => {
+        if (!el) return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+    const cssPath = (el) => {
+        if (el.id && document.querySelectorAll('#' + CSS.escape(el.id)).length === 1) {
+            return '#' + CSS.escape(el.id);
+        }
+        const parts = [];
+        while (el && el.nodeType === 1 && el !== document.documentElement) {
+            if (el.id && document.querySelectorAll('#' + CSS.escape(el.id)).length === 1) {
+                parts.unshift('#' + CSS.escape(el.id));
+                break;
+            }
+            let index = 1;
+            for (let sib = el.previousElementSibling; sib; sib = sib.previousElementSibling) {
+                if (sib.tagName === el.tagName) index++;
+            }
+            parts.unshift(el.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+            el = el.parentElement;
+        }
+        return parts.join(' > ');
+    };
+"""
+
+LINKS_JS = """
+    ({keywords, limit}) => {
+    %s
+        const all = document.querySelectorAll('a');
+        const links = [];
+        for (const a of all) {
+            const text = (a.innerText || '').trim();
+            const title = a.getAttribute('title') || '';
+            if (!keywords.some(k => text.includes(k) || title.includes(k))) continue;
+            links.push({
+                text: text.slice(0, 60),
+                title: title.slice(0, 60),
+                href: a.getAttribute('href') || '',
+                visible: isVisible(a),
+                selector: cssPath(a),
+            });
+            if (limit && links.length >= limit) break;
+        }
+        return {total: all.length, links};
+    }
+""" % _HELPERS_JS
+
+POPUPS_JS = """
+    (headerSelector) => {
+    %s
+        const closeSelectors = [
+            [false, 'button[type="button"][class="w2window_close"]'],
+            [false, 'button.w2window_close'],
+            [true, 'button[id$="_close"]'],
+            [true, 'input[type="button"][value="닫기"]'],
+        ];
+        return Array.from(document.querySelectorAll(headerSelector)).map(header => {
+            const container = header.closest('.w2popup_window') || header.parentElement;
+            let close = null;
+            for (const [inContainer, sel] of closeSelectors) {
+                close = (inContainer ? container : header).querySelector(sel);
+                if (close) break;
+            }
+            return {
+                container: cssPath(container),
+                visible: isVisible(container),
+                close: close ? cssPath(close) : null,
+                closeVisible: isVisible(close),
+            };
+        });
+    }
+""" % _HELPERS_JS
+
+SELECTOR_STATES_JS = """
+    (selectors) => {
+    %s
+        return selectors.map(sel => {
+            let el;
+            try { el = document.querySelector(sel); } catch (e) { return null; }
+            return {found: !!el, visible: isVisible(el)};
+        });
+    }
+""" % _HELPERS_JS
+
+
+class DomQuery:
+    """선택자 탐색용 일괄 DOM 조회 계층
+
+    links/popups/selector_states는 각각 page.evaluate 한 번으로 끝나고,
+    click/wait_hidden/evaluate까지 포함한 모든 호출을 round_trips로 센다
+    (report가 있으면 'dom_round_trips' 카운터에도 더한다).
+    """
+
+    def __init__(self, page, report=None):
+        self.page = page
+        self.report = report
+        self.round_trips = 0
+
+    def _count(self):
+        self.round_trips += 1
+        if self.report is not None:
+            self.report.incr("dom_round_trips")
+
+    async def evaluate(self, expression, arg=None):
+        self._count()
+        return await self.page.evaluate(expression, arg)
+
+    async def links(self, keywords, limit=None):
+        """텍스트나 title에 keywords 중 하나가 들어간 링크 디스크립터와 전체 링크 수
+
+        반환: {'total': 전체 <a> 수, 'links': [{'text', 'title', 'href', 'visible', 'selector'}, ...]}
+        """
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        return await self.evaluate(LINKS_JS, {"keywords": list(keywords), "limit": limit})
+
+    async def popups(self, header_selector):
+        """팝업 헤더마다 {'container', 'visible', 'close', 'closeVisible'} 디스크립터"""
+        return await self.evaluate(POPUPS_JS, header_selector)
+
+    async def selector_states(self, selectors):
+        """선택자별 첫 요소의 {'found', 'visible'} (CSS로 해석할 수 없는 Playwright 전용 선택자는 None)"""
+        return await self.evaluate(SELECTOR_STATES_JS, list(selectors))
+
+    async def is_visible(self, selector):
+        """Playwright 선택자 하나의 표시 여부 (CSS로 일괄 조회할 수 없는 선택자용)"""
+        self._count()
+        return await self.page.is_visible(selector)
+
+    async def click(self, selector, timeout=None):
+        self._count()
+        await self.page.click(selector, timeout=timeout)
+
+    async def wait_hidden(self, selector, timeout=None):
+        """요소가 숨겨지거나 사라질 때까지 대기 (시간 초과면 False)"""
+        self._count()
+        try:
+            await self.page.wait_for_selector(selector, state="hidden", timeout=timeout)
+            return True
+        except PlaywrightTimeout:
+            return False
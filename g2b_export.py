@@ -0,0 +1,229 @@
+import csv
+import io
+import json
+import os
+
+# openpyxl·pyarrow는 무거워서 해당 형식으로 내보낼 때 처음 불러온다 (앱 시작 시간 단축)
+
+KEYWORD_COLUMN = "검색어"
+
+# 열 너비(문자 수)와 정렬. 스트리밍이라 전체 행을 미리 볼 수 없으므로 열 이름별로 고정한다.
+COLUMN_WIDTHS = {
+    "검색어": 14, "구분": 8, "No": 6, "제안공고번호": 20, "수요기관": 28, "제안공고명": 60,
+    "공고게시일자": 14, "공고마감일시": 18, "공고상태": 10, "사유": 20, "기타": 14,
+    "예산": 16, "품목": 30, "담당자": 12, "연락처": 16, "첨부파일": 40,
+}
+CENTER_COLUMNS = {"검색어", "구분", "No", "제안공고번호", "공고게시일자", "공고마감일시", "공고상태"}
+DEFAULT_WIDTH = 16
+
+_styles = None
+
+
+def _xlsx_styles():
+    """XLSX 머리글·테두리·정렬 서식 (openpyxl을 처음 쓸 때 한 번 만든다)"""
+    global _styles
+    if _styles is None:
+        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+        thin = Side(style="thin", color="D6DCE5")
+        _styles = {
+            "header_font": Font(bold=True, color="FFFFFF"),
+            "header_fill": PatternFill("solid", fgColor="233059"),
+            "border": Border(left=thin, right=thin, top=thin, bottom=thin),
+            "center": Alignment(horizontal="center", vertical="center"),
+            "left": Alignment(horizontal="left", vertical="center", wrap_text=True),
+        }
+    return _styles
+
+
+def _with_keyword(headers, query):
+    """query가 있고 검색어 열이 없으면 첫 열로 검색어를 붙인다"""
+    headers = list(headers)
+    if query is not None and KEYWORD_COLUMN not in headers:
+        return [KEYWORD_COLUMN] + headers, True
+    return headers, False
+
+
+class _Exporter:
+    """페이지(행 목록) 단위로 받아 바로 쓰는 내보내기 공통 부분"""
+
+    def __init__(self, target, headers, query=None):
+        self.target = target
+        self.headers, self._prepend = _with_keyword(headers, query)
+        self.query = query
+        self.rows = 0
+
+    def _prepare(self, row):
+        row = list(row)
+        if self._prepend:
+            row = [self.query] + row
+        width = len(self.headers)
+        return (row + [""] * (width - len(row)))[:width]
+
+    def write(self, rows):
+        for row in rows:
+            self._write_row(self._prepare(row))
+            self.rows += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _TextExporter(_Exporter):
+    """텍스트 형식 공통: 경로면 파일을 열고, 바이너리 스트림(sys.stdout.buffer 등)이면 감싸서 쓴다"""
+
+    def __init__(self, target, headers, query=None, encoding="utf-8"):
+        super().__init__(target, headers, query)
+        self._own = isinstance(target, (str, os.PathLike))
+        if self._own:
+            self._file = open(target, "w", encoding=encoding, newline="")
+        else:
+            self._file = io.TextIOWrapper(target, encoding=encoding, newline="", write_through=True)
+
+    def write(self, rows):
+        super().write(rows)
+        self._file.flush()  # 페이지마다 내보내 파이프 건너편에서 바로 읽을 수 있게
+
+    def close(self):
+        if self._own:
+            self._file.close()
+        else:
+            self._file.flush()
+            self._file.detach()  # 호출자가 준 파일은 닫지 않는다
+
+
+class CsvExporter(_TextExporter):
+    """UTF-8(BOM) CSV, 엑셀에서 바로 열린다"""
+
+    def __init__(self, target, headers, query=None, bom=True):
+        super().__init__(target, headers, query, "utf-8-sig" if bom else "utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.headers)
+
+    def _write_row(self, row):
+        self._writer.writerow(row)
+
+
+class JsonlExporter(_TextExporter):
+    """JSON Lines: 행마다 {열 이름: 값} 객체 한 줄 (jq, pandas.read_json(lines=True) 등으로 바로 읽힌다)"""
+
+    def _write_row(self, row):
+        self._file.write(json.dumps(dict(zip(self.headers, row)), ensure_ascii=False) + "\n")
+
+
+class XlsxExporter(_Exporter):
+    """서식 있는 XLSX (openpyxl write_only 모드: 행을 쓰는 즉시 디스크로 내보내 메모리가 일정)
+
+    검색어 열을 첫 열로, 열 이름별 너비·정렬, 머리글 강조, 틀 고정, 자동 필터를 적용한다.
+    """
+
+    def __init__(self, target, headers, query=None, sheet_title="제안공고"):
+        super().__init__(target, headers, query)
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.utils import get_column_letter
+
+        self._cell = WriteOnlyCell
+        self._column_letter = get_column_letter
+        styles = self._styles = _xlsx_styles()
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(sheet_title)
+        self._alignments = [styles["center"] if name in CENTER_COLUMNS else styles["left"] for name in self.headers]
+        for i, name in enumerate(self.headers, start=1):
+            self._sheet.column_dimensions[get_column_letter(i)].width = COLUMN_WIDTHS.get(name, DEFAULT_WIDTH)
+        self._sheet.freeze_panes = "A2"
+        header_cells = []
+        for name in self.headers:
+            cell = WriteOnlyCell(self._sheet, value=name)
+            cell.font = styles["header_font"]
+            cell.fill = styles["header_fill"]
+            cell.alignment = styles["center"]
+            cell.border = styles["border"]
+            header_cells.append(cell)
+        self._sheet.append(header_cells)
+
+    def _write_row(self, row):
+        cells = []
+        border = self._styles["border"]
+        for value, alignment in zip(row, self._alignments):
+            cell = self._cell(self._sheet, value=value)
+            cell.alignment = alignment
+            cell.border = border
+            cells.append(cell)
+        self._sheet.append(cells)
+
+    def close(self):
+        last = self._column_letter(len(self.headers))
+        self._sheet.auto_filter.ref = f"A1:{last}{self.rows + 1}"
+        self._workbook.save(self.target)
+
+
+class ParquetExporter(_Exporter):
+    """Parquet (pyarrow 필요), 페이지마다 row group 하나로 쓴다. 모든 열은 문자열"""
+
+    def __init__(self, target, headers, query=None, compression="zstd"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:  # Parquet 내보내기를 쓸 때만 필요
+            raise RuntimeError("Parquet 내보내기에는 pyarrow가 필요합니다: pip install pyarrow")
+        super().__init__(target, headers, query)
+        self._pa = pa
+        self._schema = pa.schema([(name, pa.string()) for name in self.headers])
+        self._writer = pq.ParquetWriter(target, self._schema, compression=compression)
+
+    def write(self, rows):
+        prepared = [self._prepare(row) for row in rows]
+        if not prepared:
+            return
+        pa = self._pa
+        columns = [
+            pa.array([None if row[i] is None else str(row[i]) for row in prepared], pa.string())
+            for i in range(len(self.headers))
+        ]
+        self._writer.write_table(pa.Table.from_arrays(columns, schema=self._schema))
+        self.rows += len(prepared)
+
+    def close(self):
+        self._writer.close()
+
+
+EXPORTERS = {"csv": CsvExporter, "jsonl": JsonlExporter, "xlsx": XlsxExporter, "parquet": ParquetExporter}
+MIME_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def guess_format(path):
+    ext = os.path.splitext(str(path))[1].lower().lstrip(".")
+    return {"xls": "xlsx", "pq": "parquet", "ndjson": "jsonl"}.get(ext, ext)
+
+
+def open_exporter(target, headers, fmt=None, query=None, **options):
+    """형식(csv/jsonl/xlsx/parquet, 없으면 확장자로 추정)에 맞는 내보내기 객체를 연다"""
+    fmt = fmt or guess_format(target)
+    if fmt not in EXPORTERS:
+        raise ValueError(f"지원하지 않는 형식: {fmt} ({', '.join(EXPORTERS)})")
+    return EXPORTERS[fmt](target, headers, query=query, **options)
+
+
+def export_pages(pages, headers, target, fmt=None, query=None, **options):
+    """페이지(행 목록) 이터러블을 그대로 흘려 써서 전체 결과를 메모리에 모으지 않는다, 쓴 행 수 반환"""
+    with open_exporter(target, headers, fmt, query, **options) as exporter:
+        for rows in pages:
+            exporter.write(rows)
+    return exporter.rows
+
+
+async def export_pages_async(pages, headers, target, fmt=None, query=None, **options):
+    """iter_crawler_async 같은 비동기 페이지 스트림을 받는 export_pages"""
+    with open_exporter(target, headers, fmt, query, **options) as exporter:
+        async for rows in pages:
+            exporter.write(rows)
+    return exporter.rows
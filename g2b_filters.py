@@ -0,0 +1,103 @@
+import datetime
+from dataclasses import dataclass
+
+from g2b_models import ProposalNotice, parse_date
+
+FILTER_NAMES = ("date", "agency", "status")
+DEFAULT_PERIOD = "3개월"  # 기간을 지정하지 않으면 누르는 조회 기간 라디오
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """검색 조건: 게시일자 범위, 수요기관, 공고상태
+
+    먼저 사이트 검색 폼(브라우저)이나 백엔드 요청 파라미터에 넣어 서버에서 거르고,
+    거기 넣지 못한 조건만 받은 행에 적용한다(client_filter). 문자열 조건은 부분 일치다.
+    """
+
+    date_from: datetime.date | None = None
+    date_to: datetime.date | None = None
+    agency: str = ""
+    status: str = ""
+
+    @classmethod
+    def coerce(cls, value):
+        """None, dict, SearchFilters를 SearchFilters로 (날짜는 문자열도 받음)"""
+        if value is None:
+            return cls()
+        if isinstance(value, cls):
+            return value
+        values = dict(value)
+        for name in ("date_from", "date_to"):
+            if isinstance(values.get(name), str):
+                values[name] = parse_date(values[name])
+            elif isinstance(values.get(name), datetime.datetime):
+                values[name] = values[name].date()
+        for name in ("agency", "status"):
+            values[name] = (values.get(name) or "").strip()
+        return cls(**values)
+
+    @property
+    def has_dates(self):
+        return self.date_from is not None or self.date_to is not None
+
+    def active(self):
+        """지정된 조건 이름들 (FILTER_NAMES 중)"""
+        names = []
+        if self.has_dates:
+            names.append("date")
+        if self.agency:
+            names.append("agency")
+        if self.status:
+            names.append("status")
+        return names
+
+    def date_range(self, today=None):
+        """(시작일, 종료일), 한쪽만 있으면 나머지를 기본 기간(3개월)으로 채운다"""
+        date_to = self.date_to or today or datetime.date.today()
+        date_from = self.date_from or date_to - datetime.timedelta(days=90)
+        return date_from, date_to
+
+    def cache_parts(self):
+        """결과 캐시 키에 넣을 기간 외 조건 (지정된 것만)"""
+        parts = {}
+        if self.agency:
+            parts["agency"] = self.agency
+        if self.status:
+            parts["status"] = self.status
+        return parts or None
+
+    def describe(self):
+        parts = []
+        if self.has_dates:
+            date_from, date_to = self.date_range()
+            parts.append(f"게시일 {date_from}~{date_to}")
+        if self.agency:
+            parts.append(f"수요기관 '{self.agency}'")
+        if self.status:
+            parts.append(f"공고상태 '{self.status}'")
+        return ", ".join(parts) or "없음"
+
+    def matches(self, notice, names=FILTER_NAMES):
+        if "date" in names and self.has_dates:
+            if notice.posted is None:
+                return False
+            date_from, date_to = self.date_range()
+            if not date_from <= notice.posted <= date_to:
+                return False
+        if "agency" in names and self.agency and self.agency not in notice.agency:
+            return False
+        if "status" in names and self.status and self.status not in notice.status:
+            return False
+        return True
+
+    def is_before_range(self, notice):
+        """게시일이 범위 시작보다 이른 공고인지 (목록은 최신순이라 이후 페이지는 볼 필요가 없다)"""
+        return self.date_from is not None and notice.posted is not None and notice.posted < self.date_from
+
+    def client_filter(self, rows, headers, names):
+        """서버에서 적용하지 못한 조건(names)으로 행을 거른다 → (남은 행, 페이지 전체가 범위 이전인지)"""
+        notices = [ProposalNotice.from_row(row, headers) for row in rows]
+        kept = [row for row, notice in zip(rows, notices) if self.matches(notice, names)]
+        exhausted = "date" in names and bool(notices) and all(self.is_before_range(n) for n in notices)
+        return kept, exhausted
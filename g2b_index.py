@@ -0,0 +1,425 @@
+import datetime
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+
+from g2b_filters import SearchFilters
+from g2b_models import ProposalNotice
+from g2b_store import RESULT_MAX_AGE, default_store
+
+INDEX_PATH = os.environ.get("G2B_INDEX_PATH", "g2b_index.db")
+INDEX_MAX_AGE = int(os.environ.get("G2B_INDEX_MAX_AGE", str(RESULT_MAX_AGE)))  # 이 안에 수집한 검색어는 색인으로 답한다
+INDEX_FUZZY = float(os.environ.get("G2B_INDEX_FUZZY", "0.6"))  # 유사 검색: 자모 단위 유사도가 이 값 이상이면 포함
+INDEX_FUZZY_CANDIDATES = int(os.environ.get("G2B_INDEX_FUZZY_CANDIDATES", "2000"))  # 유사도를 계산할 최대 후보 수
+INDEX_LIMIT = int(os.environ.get("G2B_INDEX_LIMIT", "2000"))
+SEARCH_PERIOD_DAYS = 90  # 기간 없이 검색하면 사이트가 보여 주는 기간 (g2b_filters.DEFAULT_PERIOD)
+
+FIELD_TITLE = 0
+FIELD_AGENCY = 1
+ALL_FIELDS = (FIELD_TITLE, FIELD_AGENCY)
+FIELD_PREFIXES = {"공고명": FIELD_TITLE, "title": FIELD_TITLE, "기관": FIELD_AGENCY, "수요기관": FIELD_AGENCY,
+                  "agency": FIELD_AGENCY}
+HIDDEN_COLUMNS = ("검색어", "구분")  # 수집 당시의 검색어/변경 표시는 색인 결과에 싣지 않는다
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id INTEGER PRIMARY KEY,
+    notice_no TEXT NOT NULL UNIQUE,
+    headers TEXT NOT NULL,
+    row TEXT NOT NULL,
+    title TEXT NOT NULL,
+    agency TEXT NOT NULL,
+    posted TEXT,
+    seen_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    gram TEXT NOT NULL,
+    field INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (gram, field, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_id);
+CREATE TABLE IF NOT EXISTS searches (
+    query TEXT PRIMARY KEY,
+    searched_at REAL NOT NULL,
+    rows INTEGER
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_STRIP_RE = re.compile(r"[\W_]+")
+_TOKEN_RE = re.compile(r'-?(?:\w+:)?"[^"]*"|\S+')
+
+
+def normalize(text):
+    """비교용 정규화: 전각/반각 통일, 소문자, 공백·기호 제거 ('노트북 구매' == '노트북구매')"""
+    return _STRIP_RE.sub("", unicodedata.normalize("NFKC", text or "").lower())
+
+
+def ngrams(text):
+    """정규화된 문자열의 글자 1-gram + 2-gram (띄어쓰기가 들쭉날쭉한 한국어 공고명용)"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+def query_grams(text):
+    """검색어 한 개를 찾는 데 쓰는 n-gram (한 글자면 1-gram, 아니면 2-gram)"""
+    if len(text) == 1:
+        return {text}
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ", "ㅁ", "ㅂ",
+              "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+
+def jamo(text):
+    """한글 음절을 호환 자모로 풀어 쓴다 ('놑북' → 'ㄴㅗㅌㅂㅜㄱ', 받침과 초성이 같은 글자가 되게)"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHOSEONG[code // 588] + _JUNGSEONG[code % 588 // 28] + _JONGSEONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _edit_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+def similarity(term, text):
+    """text 안에서 term과 가장 비슷한 구간의 자모 유사도 (0~1, 1 - 편집 거리/길이)
+
+    한 음절 오타('컴퓨타', '노트븍')나 받침이 옮겨 붙은 경우('놑북')도 높게 나온다.
+    term의 글자가 들어 있는 위치 주변 구간만 비교한다.
+    """
+    if term in text:
+        return 1.0
+    target = jamo(term)
+    size = len(term)
+    best = 0.0
+    seen = set()
+    for i, ch in enumerate(text):
+        if ch not in term:
+            continue
+        for width in (size - 1, size, size + 1):
+            for start in range(max(0, i - width + 1), min(i, len(text) - width) + 1):
+                window = text[start:start + width]
+                if not window or window in seen:
+                    continue
+                seen.add(window)
+                candidate = jamo(window)
+                best = max(best, 1 - _edit_distance(target, candidate) / max(len(target), len(candidate)))
+    return best
+
+
+@dataclass(frozen=True)
+class Term:
+    """검색어 하나 (정규화된 문자열과 찾을 필드)"""
+
+    text: str
+    fields: tuple = ALL_FIELDS
+
+
+def parse_query(text, fields=ALL_FIELDS):
+    """'노트북 -임차 서버|스토리지 기관:조달청' → ([[Term, ...], ...], [제외 Term, ...])
+
+    공백으로 나뉜 묶음은 모두 맞아야 하고(AND), 한 묶음 안의 '|' 또는 OR는 하나만 맞으면 된다.
+    '-'로 시작하면 제외, '공고명:' '기관:'으로 필드를 좁힌다. 따옴표 안의 공백은 무시된다.
+    """
+    groups, excluded = [], []
+    join = False
+    for token in _TOKEN_RE.findall(text or ""):
+        if token in ("OR", "|"):
+            join = bool(groups)
+            continue
+        negate = token.startswith("-") and len(token) > 1
+        if negate:
+            token = token[1:]
+        token_fields = fields
+        name, sep, rest = token.partition(":")
+        if sep and rest and name in FIELD_PREFIXES:
+            token_fields = (FIELD_PREFIXES[name],)
+            token = rest
+        terms = [Term(normalize(part), token_fields) for part in token.strip('"').split("|")]
+        terms = [term for term in terms if term.text]
+        if terms:
+            if negate:
+                excluded.extend(terms)
+            elif join:
+                groups[-1].extend(terms)
+            else:
+                groups.append(terms)
+        join = False
+    return groups, excluded
+
+
+class NoticeIndex:
+    """수집한 공고의 제안공고명·수요기관 n-gram 역색인 (SQLite)
+
+    정확 검색은 검색어의 2-gram이 모두 있는 공고를 postings에서 고른 뒤 정규화된 원문에 검색어가
+    그대로 들어 있는지 확인한다. 유사 검색은 1-gram·2-gram이 하나라도 겹치는 공고를 후보로 삼아
+    한글을 자모로 풀어 비교한 유사도(similarity: 1 - 편집 거리/길이)로 점수를 매긴다.
+    searches에는 사이트에서 끝까지 검색한 검색어와 시각을 남겨, 최근 검색한 검색어는
+    사이트에 다시 가지 않고 색인으로 답할 수 있게 한다(covered).
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def add(self, headers, rows, seen_at=None):
+        """행들을 색인 (같은 제안공고번호는 덮어쓰고, 공고명·수요기관이 바뀐 경우에만 n-gram을 다시 만든다)"""
+        headers = list(headers)
+        seen_at = seen_at if seen_at is not None else time.time()
+        headers_json = json.dumps(headers, ensure_ascii=False)
+        count = 0
+        with self._lock, self._conn:
+            for row in rows:
+                notice = ProposalNotice.from_row(row, headers)
+                if not notice.number:
+                    continue
+                title, agency = normalize(notice.title), normalize(notice.agency)
+                posted = notice.posted.isoformat() if notice.posted else None
+                row_json = json.dumps(list(row), ensure_ascii=False)
+                existing = self._conn.execute(
+                    "SELECT doc_id, title, agency FROM docs WHERE notice_no = ?", (notice.number,)
+                ).fetchone()
+                if existing is not None:
+                    doc_id = existing["doc_id"]
+                    self._conn.execute(
+                        "UPDATE docs SET headers = ?, row = ?, title = ?, agency = ?, posted = ?, seen_at = ?"
+                        " WHERE doc_id = ?",
+                        (headers_json, row_json, title, agency, posted, seen_at, doc_id),
+                    )
+                    if (existing["title"], existing["agency"]) == (title, agency):
+                        count += 1
+                        continue
+                    self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                else:
+                    doc_id = self._conn.execute(
+                        "INSERT INTO docs (notice_no, headers, row, title, agency, posted, seen_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (notice.number, headers_json, row_json, title, agency, posted, seen_at),
+                    ).lastrowid
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO postings (gram, field, doc_id) VALUES (?, ?, ?)",
+                    [(gram, FIELD_TITLE, doc_id) for gram in ngrams(title)]
+                    + [(gram, FIELD_AGENCY, doc_id) for gram in ngrams(agency)],
+                )
+                count += 1
+        return count
+
+    def sync(self, store=None):
+        """결과 저장소(g2b_store)에서 지난 동기화 이후 다시 본 공고를 색인에 반영 → 반영한 건수"""
+        store = store if store is not None else default_store()
+        started = time.time()
+        since = float(self._meta("synced_at") or 0)
+        count = 0
+        batch, batch_headers, batch_seen = [], None, 0
+        for record in reversed(store.notices(seen_since=since)):
+            if batch and record["headers"] != batch_headers:
+                count += self.add(batch_headers, batch, batch_seen)
+                batch = []
+            batch_headers = record["headers"]
+            batch_seen = max(batch_seen, record["last_seen"])
+            batch.append(record["row"])
+        if batch:
+            count += self.add(batch_headers, batch, batch_seen)
+        self._set_meta("synced_at", started)
+        return count
+
+    def mark_searched(self, query, rows=0, searched_at=None):
+        """사이트에서 조건 없이 끝까지 검색한 검색어로 기록 (이후 covered()가 참)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (query, searched_at, rows) VALUES (?, ?, ?)",
+                (query.strip(), searched_at or time.time(), rows),
+            )
+
+    def covered(self, query, filters=None, max_age=INDEX_MAX_AGE, store=None):
+        """최근 max_age초 안에 사이트에서 검색한 검색어라 색인만으로 답할 수 있는지
+
+        백그라운드 수집기(g2b_daemon)가 성공한 검색어도 인정한다 (store를 넘긴 경우).
+        게시일자 범위가 그때 사이트가 보여 준 기간(최근 3개월)보다 앞서면 답할 수 없다.
+        """
+        query = query.strip()
+        with self._lock:
+            row = self._conn.execute("SELECT searched_at FROM searches WHERE query = ?", (query,)).fetchone()
+        searched_at = row["searched_at"] if row is not None else 0
+        if store is not None:
+            last = store.last_run(query, status="ok")
+            if last:
+                searched_at = max(searched_at, last["finished_at"] or last["started_at"])
+        if searched_at < time.time() - max_age:
+            return False
+        filters = SearchFilters.coerce(filters)
+        if filters.date_from is not None:
+            oldest = datetime.date.fromtimestamp(searched_at) - datetime.timedelta(days=SEARCH_PERIOD_DAYS)
+            if filters.date_from < oldest:
+                return False
+        return True
+
+    def hits(self, query, filters=None, fuzzy=False, limit=INDEX_LIMIT, fields=ALL_FIELDS):
+        """검색식에 맞는 공고 [(점수, headers, row), ...] (점수 높은 순, 같으면 최근 게시 순)
+
+        fuzzy가 참이면 자모 유사도(similarity)가 INDEX_FUZZY(또는 그 값) 이상인 공고도 포함한다 (한 글자 오타 등).
+        검색식이 비어 있으면 조건(filters)에 맞는 모든 공고.
+        """
+        groups, excluded = parse_query(query, fields)
+        threshold = 0.0 if not fuzzy else (INDEX_FUZZY if fuzzy is True else float(fuzzy))
+        with self._lock:
+            scores = None
+            for group in groups:
+                matched = {}
+                for term in group:
+                    for doc_id, score in self._match(term, threshold).items():
+                        matched[doc_id] = max(score, matched.get(doc_id, 0.0))
+                if scores is None:
+                    scores = matched
+                else:
+                    scores = {doc_id: scores[doc_id] + score for doc_id, score in matched.items() if doc_id in scores}
+                if not scores:
+                    return []
+            skip = set().union(*(self._match(term, 0.0) for term in excluded))
+            if scores is None:
+                docs = self._conn.execute("SELECT doc_id, headers, row, posted FROM docs").fetchall()
+                scores = {doc["doc_id"]: 0.0 for doc in docs}
+            else:
+                docs = self._docs(scores)
+        docs = [doc for doc in docs if doc["doc_id"] not in skip]
+        filters = SearchFilters.coerce(filters)
+        names = filters.active()
+        results = []
+        for doc in docs:
+            headers, row = json.loads(doc["headers"]), json.loads(doc["row"])
+            if names and not filters.matches(ProposalNotice.from_row(row, headers), names):
+                continue
+            results.append((scores[doc["doc_id"]], doc["posted"] or "", headers, row))
+        results.sort(key=lambda r: (r[0], r[1]), reverse=True)
+        return [(score / max(1, len(groups)), headers, row) for score, _, headers, row in results[:limit]]
+
+    def search(self, query, filters=None, fuzzy=False, limit=INDEX_LIMIT, fields=ALL_FIELDS):
+        """검색식에 맞는 공고를 크롤러와 같은 (headers, rows) 형태로 (없으면 (None, None))"""
+        return _align(self.hits(query, filters, fuzzy, limit, fields))
+
+    def lookup(self, query, filters=None):
+        """사이트 검색을 대신할 때: 검색어 전체를 공고명에서 찾는다 (공백 무시, 정확 일치)"""
+        return self.search('"' + query.replace('"', " ") + '"', filters, fields=(FIELD_TITLE,))
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def _match(self, term, threshold):
+        """term에 맞는 doc_id → 점수 (정확 일치면 1.0, 유사 검색이면 자모 유사도)
+
+        정확 검색은 검색어의 2-gram이 모두 있는 공고만 후보로 보고, 유사 검색은 1-gram·2-gram 중
+        하나라도 겹치는 공고를 많이 겹치는 순으로 INDEX_FUZZY_CANDIDATES개까지 후보로 본다.
+        """
+        fuzzy = threshold > 0
+        grams = sorted(ngrams(term.text) if fuzzy else query_grams(term.text))
+        need = 1 if fuzzy else len(grams)
+        gram_marks = ",".join("?" * len(grams))
+        field_marks = ",".join("?" * len(term.fields))
+        rows = self._conn.execute(
+            f"SELECT doc_id, COUNT(DISTINCT gram) AS hits FROM postings"
+            f" WHERE gram IN ({gram_marks}) AND field IN ({field_marks})"
+            f" GROUP BY doc_id HAVING hits >= ? ORDER BY hits DESC LIMIT ?",
+            grams + list(term.fields) + [need, INDEX_FUZZY_CANDIDATES if fuzzy else -1],
+        ).fetchall()
+        candidates = [row["doc_id"] for row in rows]
+        if not candidates:
+            return {}
+        columns = [("title", "agency")[field] for field in term.fields]
+        scores = {}
+        for doc_id, title, agency in self._texts(candidates):
+            texts = {"title": title, "agency": agency}
+            if fuzzy:
+                score = max(similarity(term.text, texts[column]) for column in columns)
+            else:
+                score = 1.0 if any(term.text in texts[column] for column in columns) else 0.0
+            if score >= (threshold if fuzzy else 1.0):
+                scores[doc_id] = score
+        return scores
+
+    def _texts(self, doc_ids):
+        doc_ids = list(doc_ids)
+        for i in range(0, len(doc_ids), 500):
+            chunk = doc_ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            yield from self._conn.execute(f"SELECT doc_id, title, agency FROM docs WHERE doc_id IN ({marks})", chunk)
+
+    def _docs(self, doc_ids):
+        doc_ids = list(doc_ids)
+        docs = []
+        for i in range(0, len(doc_ids), 500):
+            chunk = doc_ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            docs.extend(self._conn.execute(
+                f"SELECT doc_id, headers, row, posted FROM docs WHERE doc_id IN ({marks})", chunk
+            ))
+        return docs
+
+    def _meta(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row is not None else None
+
+    def _set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def _align(hits):
+    """열 구성이 다른 행(상세 정보 열 등)을 첫 결과의 열 순서에 맞춘다"""
+    if not hits:
+        return None, None
+    headers = [name for name in hits[0][1] if name not in HIDDEN_COLUMNS]
+    rows = []
+    for _, row_headers, row in hits:
+        values = dict(zip(row_headers, row))
+        rows.append([values.get(name, "") for name in headers])
+    return headers, rows
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def default_index():
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = NoticeIndex()
+        return _default_index
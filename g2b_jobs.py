@@ -0,0 +1,332 @@
+import asyncio
+import contextvars
+import io
+import os
+import sys
+import threading
+import time
+import uuid
+
+from g2b_cache import CACHE_TTL, default_cache
+from g2b_crawler import (
+    HEADERS, find_browser_executable, iter_crawler_async, merge_keyword_results,
+    run_crawler_incremental_async, search_cache_key,
+)
+from g2b_detail import enrich_async
+from g2b_filters import SearchFilters
+from g2b_index import default_index
+from g2b_memory import cap_concurrency
+from g2b_pool import get_loop_thread, get_shared_pool
+from g2b_report import RunReport
+from g2b_store import default_store
+
+JOB_WORKERS = cap_concurrency(os.environ.get("G2B_JOB_WORKERS", "2"))  # 동시에 실행할 작업 수 (저메모리 모드면 1)
+JOB_TTL = int(os.environ.get("G2B_JOB_TTL", "3600"))        # 끝난 작업을 보관하는 시간(초)
+
+_job_log = contextvars.ContextVar("g2b_job_log", default=None)
+
+
+class _JobStdout:
+    """작업(asyncio 태스크) 안에서 찍은 print는 그 작업의 로그로, 나머지는 원래 stdout으로 보낸다"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        log = _job_log.get()
+        return (log if log is not None else self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+_stdout_lock = threading.Lock()
+
+
+def install_log_routing():
+    """작업 안에서 찍은 print가 그 작업의 로그(Job.log)로 가도록 sys.stdout을 감싼다
+
+    앱처럼 작업 로그를 화면에 보여 줄 프로세스가 시작할 때 한 번 부른다 (여러 번 불러도 한 번만 감싼다).
+    부르지 않으면 작업 로그는 비어 있고 print는 그대로 stdout으로 간다.
+    """
+    with _stdout_lock:
+        if not isinstance(sys.stdout, _JobStdout):
+            sys.stdout = _JobStdout(sys.stdout)
+        return sys.stdout
+
+
+def uninstall_log_routing():
+    """install_log_routing으로 감싼 sys.stdout을 원래대로 되돌린다"""
+    with _stdout_lock:
+        if isinstance(sys.stdout, _JobStdout):
+            sys.stdout = sys.stdout._stream
+
+
+class Job:
+    """백그라운드 검색 작업 하나의 상태와 진행 상황
+
+    status: queued → running → done | error | cancelled
+    """
+
+    def __init__(self, key, queries, mode, engine, cache_key=None, concurrency=None, filters=None, enrich=False):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.queries = list(queries)
+        self.mode = mode
+        self.engine = engine
+        self.filters = filters
+        self.enrich = enrich
+        self.cache_key = cache_key
+        self.concurrency = concurrency
+        self.cache = None
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.reports = []
+        self.rows = 0
+        self.result = None
+        self.error = None
+        self.log = io.StringIO()
+        self._future = None
+        self._finished = threading.Event()
+
+    @property
+    def done(self):
+        return self.status in ("done", "error", "cancelled")
+
+    def progress(self):
+        """UI 폴링용 진행 상황 (검색어별 현재 단계, 페이지 수)"""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "rows": self.rows,
+            "elapsed": round((self.finished_at or time.time()) - (self.started_at or self.created_at), 1),
+            "queries": [
+                {"query": r.query, "phase": r.current or r.status, "pages": r.pages}
+                for r in self.reports
+            ],
+        }
+
+    def cancel(self):
+        if not self.done and self._future is not None:
+            self._future.cancel()
+
+    def wait(self, timeout=None):
+        self._finished.wait(timeout)
+        return self.result
+
+    def _finish(self, status, result=None, error=None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self._finished.set()
+
+
+class JobQueue:
+    """검색을 공유 브라우저 풀의 이벤트 루프에서 백그라운드 작업으로 실행하는 큐
+
+    submit()은 바로 Job을 돌려주므로 Streamlit 스크립트 스레드가 검색 동안 묶이지 않는다.
+    같은 (모드, 검색어, 엔진) 작업이 이미 대기/실행 중이면 새로 만들지 않고 그 작업을 돌려주고,
+    결과 캐시가 있으면 작업 없이 바로 끝낸다 (오래된 캐시는 돌려준 뒤 백그라운드에서 갱신).
+    끝까지 검색한 결과는 공고 색인(g2b_index)에 넣어, 최근 검색한 검색어는 색인에서 바로 답할 수 있다.
+    작업별 로그(Job.log)는 install_log_routing()을 부른 프로세스에서만 채워진다.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, browser_executable_path=None, cache=None, store=None, index=None):
+        self.workers = workers
+        self.browser_executable_path = browser_executable_path
+        self.cache = cache
+        self.store = store
+        self.index = index
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._semaphore = None
+
+    def submit(self, queries, mode="search", engine="browser", use_cache=False, concurrency=None, filters=None,
+               enrich=False, use_index=False):
+        """검색 작업을 등록하고 Job을 바로 반환
+
+        mode: 'search' | 'incremental', concurrency: 검색어 동시 실행 수,
+        filters: 검색 조건(g2b_filters.SearchFilters 또는 dict),
+        enrich: 검색 뒤 상세 화면 정보(g2b_detail) 열을 붙일지 (결과 캐시는 쓰지 않고 상세 정보 저장소만 재사용),
+        use_index: 모든 검색어를 최근에 검색했다면 사이트에 가지 않고 공고 색인에서 답할지
+        """
+        queries = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+        if not queries:
+            raise ValueError("검색어가 없습니다")
+        filters = SearchFilters.coerce(filters)
+        key = (mode, tuple(queries), engine, filters, enrich)
+        if use_index and mode == "search" and not enrich:
+            job = self._from_index(key, queries, engine, filters, concurrency)
+            if job is not None:
+                return job
+        use_cache = use_cache and not enrich and mode == "search" and len(queries) == 1
+        cache_key = search_cache_key(queries[0], filters) if use_cache else None
+        cache = self.cache if self.cache is not None else default_cache()
+        if cache_key is not None:
+            value, state = cache.get(cache_key)
+            if state is not None:
+                job = Job(key, queries, mode, engine, filters=filters)
+                job.cache = "hit" if state == "fresh" else "stale"
+                job._finish("done", value)
+                with self._lock:
+                    self._jobs[job.id] = job
+                if state == "stale":
+                    self._start(key, queries, mode, engine, cache_key, concurrency, filters)
+                return job
+        return self._start(key, queries, mode, engine, cache_key, concurrency, filters, enrich)
+
+    def _from_index(self, key, queries, engine, filters, concurrency=None):
+        """색인이 모든 검색어를 답할 수 있으면 바로 끝난 Job (아니면 None)
+
+        결과 캐시의 TTL(CACHE_TTL)보다 오래전에 검색한 검색어가 있으면 색인 결과를 돌려준 뒤
+        오래된 캐시처럼 백그라운드에서 다시 검색해 색인을 갱신한다.
+        """
+        index = self._index()
+        store = self.store if self.store is not None else default_store()
+        try:
+            index.sync(store)
+            if not all(index.covered(query, filters, store=store) for query in queries):
+                return None
+            stale = not all(index.covered(query, filters, CACHE_TTL, store) for query in queries)
+        except Exception as e:
+            print(f"   - 색인 확인 실패 (사이트에서 검색): {str(e)[:80]}")
+            return None
+        job = Job(key, queries, "search", engine, filters=filters)
+        results = []
+        for query in queries:
+            report = RunReport(query, "index")
+            with report.phase("index"):
+                result = index.lookup(query, filters)
+            report.finish(len(result[1] or []))
+            job.reports.append(report)
+            results.append((query, result))
+        job.cache = "index-stale" if stale else "index"
+        job._finish("done", merge_keyword_results(results) if len(results) > 1 else results[0][1])
+        with self._lock:
+            self._jobs[job.id] = job
+        if stale:
+            cache_key = search_cache_key(queries[0], filters) if len(queries) == 1 else None
+            self._start(key, queries, "search", engine, cache_key, concurrency, filters)
+        return job
+
+    def _index(self):
+        return self.index if self.index is not None else default_index()
+
+    def _start(self, key, queries, mode, engine, cache_key, concurrency, filters, enrich=False):
+        with self._lock:
+            self._purge()
+            for job in self._jobs.values():
+                if job.key == key and not job.done:
+                    return job
+            job = Job(key, queries, mode, engine, cache_key, concurrency, filters, enrich)
+            self._jobs[job.id] = job
+        try:
+            pool = get_shared_pool(self.browser_executable_path or find_browser_executable())
+        except Exception as e:
+            job._finish("error", error=f"브라우저 풀 준비 실패: {e}")
+            return job
+        job._future = asyncio.run_coroutine_threadsafe(self._run(job, pool), get_loop_thread().loop)
+        job._future.add_done_callback(lambda f: job._finish("cancelled") if f.cancelled() and not job.done else None)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _purge(self):
+        cutoff = time.time() - JOB_TTL
+        for job_id in [j.id for j in self._jobs.values() if j.done and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    async def _run(self, job, pool):
+        _job_log.set(job.log)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        try:
+            async with self._semaphore:
+                job.status = "running"
+                job.started_at = time.time()
+                limit = asyncio.Semaphore(cap_concurrency(job.concurrency or len(job.queries)))
+
+                async def search(query):
+                    async with limit:
+                        return await self._search(job, pool, query)
+
+                results = await asyncio.gather(*(search(q) for q in job.queries))
+            result = merge_keyword_results(results) if len(results) > 1 else results[0][1]
+            if job.enrich and result[1]:
+                report = RunReport("상세 정보", "browser")
+                job.reports.append(report)
+                result = await enrich_async(result[0], result[1], pool, store=self.store, report=report)
+            if job.cache_key is not None:
+                (self.cache if self.cache is not None else default_cache()).offer(job.cache_key, result)
+                job.cache = "miss"
+            job._finish("done", result)
+        except asyncio.CancelledError:
+            print("작업이 취소되었습니다.")
+            job._finish("cancelled")
+            raise
+        except Exception as e:
+            print(f"\n[ERROR] 작업 실패: {str(e)}")
+            job._finish("error", error=f"{type(e).__name__}: {str(e)[:200]}")
+
+    async def _search(self, job, pool, query):
+        report = RunReport(query, job.engine)
+        job.reports.append(report)
+        complete = not job.filters.active()  # 조건 없이 끝까지 검색했을 때만 색인이 이 검색어를 대신할 수 있다
+        if job.mode == "incremental":
+            result = await run_crawler_incremental_async(query, self.store, report=report, pool=pool, engine=job.engine,
+                                                         filters=job.filters)
+            job.rows += len(result[1])
+            if complete and report.status != "error":
+                self._index().mark_searched(query, report.rows)
+            return query, result
+        rows = []
+        pages = iter_crawler_async(query, pool=pool, engine=job.engine, report=report, filters=job.filters)
+        try:
+            async for page_rows in pages:
+                rows.extend(page_rows)
+                job.rows += len(page_rows)
+        except Exception as e:
+            complete = False
+            print(f"\n[ERROR] '{query}' 크롤링 실패: {str(e)}")
+            if rows:
+                print(f"   - 실패 전까지 수집한 {len(rows)}건을 사용합니다.")
+        finally:
+            await pages.aclose()
+        try:
+            if rows:
+                self._index().add(HEADERS, rows)
+            if complete:
+                self._index().mark_searched(query, len(rows))
+        except Exception as e:
+            print(f"   - 색인 저장 실패: {str(e)[:80]}")
+        return query, ((list(HEADERS), rows) if rows else (None, None))
+
+
+_default_queue = None
+_default_lock = threading.Lock()
+
+
+def default_queue(browser_executable_path=None):
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = JobQueue(browser_executable_path=browser_executable_path)
+        return _default_queue
@@ -0,0 +1,224 @@
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+LOW_MEMORY = os.environ.get("G2B_LOW_MEMORY", "").lower() in ("1", "true", "yes", "on")  # 작은 컨테이너용 저메모리 모드
+LOW_MEMORY_PAGES = int(os.environ.get("G2B_LOW_MEMORY_PAGES", "1"))       # 저메모리 모드에서 동시에 여는 페이지(컨텍스트) 수
+LOW_MEMORY_MAX_USES = int(os.environ.get("G2B_LOW_MEMORY_MAX_USES", "5"))  # 이만큼 빌려준 브라우저는 재시작
+GRID_CHUNK = int(os.environ.get("G2B_GRID_CHUNK", "25"))                  # 그리드를 한 번에 읽는 행 수
+GC_EVERY = int(os.environ.get("G2B_GC_EVERY", "5"))                        # 이 페이지마다 브라우저 JS 힙 정리
+RSS_INTERVAL = float(os.environ.get("G2B_RSS_INTERVAL", "0.5"))            # RSS 측정 간격(초)
+
+# 저메모리 모드에서 Chromium에 더하는 인자: 캐시를 바로 버리고 뒤로 가기 캐시·렌더러 추가 프로세스를 막는다
+LOW_MEMORY_ARGS = [
+    '--aggressive-cache-discard',
+    '--disable-back-forward-cache',
+    '--renderer-process-limit=1',
+    '--disk-cache-size=1',
+]
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def cap_concurrency(value):
+    """저메모리 모드면 동시에 여는 페이지 수를 LOW_MEMORY_PAGES로 제한"""
+    value = max(1, int(value))
+    return min(value, max(1, LOW_MEMORY_PAGES)) if LOW_MEMORY else value
+
+
+def rss_bytes(children=True):
+    """현재 프로세스의 RSS(바이트), children이면 자식 프로세스(Playwright 드라이버·Chromium)까지 합친다
+
+    자식은 /proc/<pid>/task/*/children을 따라 이 프로세스의 자손만 읽는다 (/proc 전체를 훑지 않는다).
+    그 파일이 없는 커널에서는 /proc 전체에서 부모 관계를 찾고, /proc이 없는 환경에서는
+    이 프로세스의 최고 RSS(getrusage)로 대신하며, 그것도 없으면(Windows) 0이다.
+    """
+    root = os.getpid()
+    if children:
+        total = _tree_rss(root)
+        if total is not None:
+            return total
+    table = _proc_table() if children else {}
+    if not table:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * _PAGE_SIZE
+        except (OSError, ValueError, IndexError):
+            if resource is None:
+                return 0
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if sys.platform == "darwin" else peak * 1024
+    total = table.get(root, (0, 0))[1]
+    parents = {root}
+    remaining = dict(table)
+    remaining.pop(root, None)
+    while parents:
+        found = {pid for pid, (ppid, _) in remaining.items() if ppid in parents}
+        total += sum(remaining.pop(pid)[1] for pid in found)
+        parents = found
+    return total
+
+
+def _children(pid):
+    """pid의 자식 pid 목록 (children 파일을 지원하지 않으면 None)"""
+    try:
+        tasks = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return []
+    kids = []
+    for tid in tasks:
+        try:
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                kids.extend(int(kid) for kid in f.read().split())
+        except FileNotFoundError:
+            if not os.path.exists(f"/proc/{pid}/task/{tid}"):
+                continue  # 읽는 사이에 끝난 스레드
+            return None
+        except (OSError, ValueError):
+            continue
+    return kids
+
+
+def _tree_rss(root):
+    """root와 그 자손의 RSS 합 (children 파일을 쓸 수 없으면 None)"""
+    total = 0
+    stack = [root]
+    seen = set()
+    while stack:
+        pid = stack.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                total += int(f.read().split()[1]) * _PAGE_SIZE
+        except (OSError, ValueError, IndexError):
+            if pid == root:
+                return None
+            continue
+        kids = _children(pid)
+        if kids is None:
+            return None
+        stack.extend(kids)
+    return total
+
+
+def _proc_table():
+    """pid → (부모 pid, RSS 바이트), /proc이 없으면 빈 dict"""
+    try:
+        names = os.listdir("/proc")
+    except OSError:
+        return {}
+    table = {}
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                data = f.read()
+            fields = data[data.rfind(b")") + 2:].split()
+            table[int(name)] = (int(fields[1]), int(fields[21]) * _PAGE_SIZE)
+        except (OSError, ValueError, IndexError):
+            continue
+    return table
+
+
+def to_mb(value):
+    return round(value / (1024 * 1024), 1) if value else 0.0
+
+
+class _RssSampler:
+    """프로세스에 하나: 등록된 모니터가 있는 동안 별도 스레드에서 interval초마다 RSS를 재서 나눠 준다
+
+    동시에 여러 검색이 돌아도 측정은 한 번씩만 하고, 이벤트 루프는 측정을 기다리지 않는다.
+    """
+
+    def __init__(self, interval=RSS_INTERVAL):
+        self.interval = interval
+        self.last = None
+        self._monitors = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, monitor):
+        with self._lock:
+            self._monitors.add(monitor)
+            if self.last is not None:
+                monitor._observe(self.last)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="g2b-rss", daemon=True)
+                self._thread.start()
+
+    def remove(self, monitor):
+        with self._lock:
+            self._monitors.discard(monitor)
+
+    def _run(self):
+        while True:
+            try:
+                value = rss_bytes()
+            except Exception:
+                value = None
+            with self._lock:
+                if value is not None:
+                    self.last = value
+                    for monitor in self._monitors:
+                        monitor._observe(value)
+                if not self._monitors:
+                    self._thread = None
+                    return
+            time.sleep(self.interval)
+
+
+_sampler = _RssSampler()
+
+
+class MemoryMonitor:
+    """실행하는 동안 RSS 최고값을 리포트에 남긴다 (info: rss_start_mb, peak_rss_mb)
+
+    측정은 프로세스에 하나인 샘플러(_RssSampler)가 RSS_INTERVAL초마다 스레드에서 하고,
+    모니터는 그 값을 받아 처음 값과 최고값만 기억한다. 공유 풀을 쓰면 같은 프로세스의
+    브라우저·다른 검색까지 합친 값이므로 컨테이너 크기 산정에 그대로 쓸 수 있다.
+    """
+
+    def __init__(self, report=None, sampler=None):
+        self.report = report
+        self.sampler = sampler if sampler is not None else _sampler
+        self.start_rss = None
+        self.peak = 0
+
+    def start(self):
+        self.sampler.add(self)
+        return self
+
+    def stop(self):
+        self.sampler.remove(self)
+        if self.report is not None:
+            self.report.set("rss_start_mb", to_mb(self.start_rss))
+            self.report.set("peak_rss_mb", to_mb(self.peak))
+        return self.peak
+
+    def _observe(self, value):
+        if self.start_rss is None:
+            self.start_rss = value
+        self.peak = max(self.peak, value or 0)
+
+
+async def collect_garbage(page):
+    """CDP로 페이지의 JS 힙을 바로 정리한다 (WebSquare가 페이지를 넘길 때마다 남기는 객체 회수)"""
+    try:
+        session = await page.context.new_cdp_session(page)
+        try:
+            await session.send("HeapProfiler.collectGarbage")
+        finally:
+            await session.detach()
+        return True
+    except Exception as e:
+        print(f"   - JS 힙 정리 실패: {str(e)[:50]}")
+        return False
@@ -0,0 +1,146 @@
+import datetime
+import re
+from dataclasses import dataclass, field
+
+# 그리드/백엔드 행(list)의 열 이름 → ProposalNotice 필드
+COLUMN_FIELDS = {
+    "검색어": "keywords",
+    "구분": "change",
+    "No": "no",
+    "제안공고번호": "number",
+    "수요기관": "agency",
+    "제안공고명": "title",
+    "공고게시일자": "posted",
+    "공고마감일시": "deadline",
+    "공고상태": "status",
+    "사유": "reason",
+    "기타": "etc",
+}
+_DATE_RE = re.compile(r"(\d{4})\D(\d{1,2})\D(\d{1,2})(?:\D+(\d{1,2}):(\d{2})(?::(\d{2}))?)?")
+
+
+def parse_datetime(text):
+    """'2025/01/31', '2025-01-31 10:00', '2025.01.31 10:00:00' 등 → datetime (실패하면 None)"""
+    m = _DATE_RE.search(text or "")
+    if not m:
+        return None
+    year, month, day, hour, minute, second = (int(g) if g else 0 for g in m.groups())
+    try:
+        return datetime.datetime(year, month, day, hour, minute, second)
+    except ValueError:
+        return None
+
+
+def parse_date(text):
+    value = parse_datetime(text)
+    return value.date() if value else None
+
+
+@dataclass(slots=True)
+class ProposalNotice:
+    """제안공고 한 건
+
+    posted/deadline은 파싱된 date/datetime이고, 원문 문자열은 *_raw에 남겨
+    to_row()가 사이트에서 읽은 값 그대로 되돌린다 (결과 저장소의 변경 비교가 흔들리지 않게).
+    """
+
+    number: str
+    agency: str = ""
+    title: str = ""
+    posted: datetime.date | None = None
+    deadline: datetime.datetime | None = None
+    status: str = ""
+    no: int | None = None
+    reason: str = ""
+    etc: str = ""
+    keywords: str = ""
+    change: str = ""
+    posted_raw: str = field(default="", repr=False, compare=False)
+    deadline_raw: str = field(default="", repr=False, compare=False)
+
+    @classmethod
+    def from_row(cls, row, headers):
+        values = {}
+        for name, value in zip(headers, row):
+            name = COLUMN_FIELDS.get(name)
+            if name:
+                values[name] = "" if value is None else str(value).strip()
+        posted_raw = values.pop("posted", "")
+        deadline_raw = values.pop("deadline", "")
+        no = values.pop("no", "")
+        return cls(
+            number=values.pop("number", ""),
+            posted=parse_date(posted_raw),
+            deadline=parse_datetime(deadline_raw),
+            no=int(no) if no.isdigit() else None,
+            posted_raw=posted_raw,
+            deadline_raw=deadline_raw,
+            **values,
+        )
+
+    def value(self, column):
+        """열 이름의 타입 있는 값 (날짜는 date/datetime, No는 int)"""
+        return getattr(self, COLUMN_FIELDS[column])
+
+    def text(self, column):
+        """열 이름의 원문 문자열 값"""
+        name = COLUMN_FIELDS[column]
+        if name == "posted":
+            return self.posted_raw or (self.posted.strftime("%Y/%m/%d") if self.posted else "")
+        if name == "deadline":
+            return self.deadline_raw or (self.deadline.strftime("%Y/%m/%d %H:%M") if self.deadline else "")
+        if name == "no":
+            return "" if self.no is None else str(self.no)
+        return getattr(self, name)
+
+    def to_row(self, headers):
+        return [self.text(column) for column in headers]
+
+    @property
+    def is_open(self):
+        """마감 전인지 (마감일시를 모르면 None)"""
+        if self.deadline is None:
+            return None
+        return self.deadline > datetime.datetime.now()
+
+
+def rows_to_notices(rows, headers):
+    return [ProposalNotice.from_row(row, headers) for row in rows]
+
+
+def notices_to_rows(notices, headers):
+    return [notice.to_row(headers) for notice in notices]
+
+
+def to_columns(notices, headers):
+    """열 이름 → 타입 있는 값 목록 (DataFrame/Arrow 등 열 기반 형태가 필요할 때만 변환)"""
+    columns = [column for column in headers if column in COLUMN_FIELDS]
+    return {column: [notice.value(column) for notice in notices] for column in columns}
+
+
+def filter_notices(notices, status=None, agency=None, text=None, posted_from=None, posted_to=None,
+                   deadline_after=None):
+    """조건에 맞는 공고만 (문자열 조건은 부분 일치, 날짜 조건은 값이 없는 공고를 제외)"""
+    result = []
+    for notice in notices:
+        if status and status not in notice.status:
+            continue
+        if agency and agency not in notice.agency:
+            continue
+        if text and text not in notice.title:
+            continue
+        if posted_from and (notice.posted is None or notice.posted < posted_from):
+            continue
+        if posted_to and (notice.posted is None or notice.posted > posted_to):
+            continue
+        if deadline_after and (notice.deadline is None or notice.deadline < deadline_after):
+            continue
+        result.append(notice)
+    return result
+
+
+def sort_notices(notices, key="deadline", reverse=False):
+    """필드 기준 정렬, 값이 없는 공고는 항상 뒤로"""
+    present = [n for n in notices if getattr(n, key) is not None]
+    missing = [n for n in notices if getattr(n, key) is None]
+    return sorted(present, key=lambda n: getattr(n, key), reverse=reverse) + missing
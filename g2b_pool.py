@@ -0,0 +1,354 @@
+import asyncio
+import os
+import threading
+from contextlib import asynccontextmanager, nullcontext
+
+from playwright.async_api import async_playwright
+
+from g2b_memory import LOW_MEMORY, LOW_MEMORY_ARGS, LOW_MEMORY_MAX_USES, cap_concurrency
+
+BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--single-process',
+    '--no-zygote',
+    '--disable-blink-features=AutomationControlled',
+    '--window-size=1920,1080',
+    '--start-maximized',
+    '--disable-extensions',
+    '--disable-images',
+    '--disable-javascript-harmony-shipping',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-features=TranslateUI',
+    '--disable-ipc-flooding-protection'
+]
+
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'locale': 'ko-KR',
+    'timezone_id': 'Asia/Seoul',
+    'ignore_https_errors': True,
+    'extra_http_headers': {
+        'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Cache-Control': 'no-cache',
+        'Pragma': 'no-cache'
+    }
+}
+
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    window.chrome = {
+        runtime: {},
+        loadTimes: function() {},
+        csi: function() {},
+        app: {}
+    };
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [
+            { name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer' },
+            { name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai' },
+            { name: 'Native Client', filename: 'internal-nacl-plugin' }
+        ],
+    });
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['ko-KR', 'ko', 'en-US', 'en'],
+    });
+    Object.defineProperty(navigator, 'platform', {
+        get: () => 'Linux x86_64'
+    });
+    Object.defineProperty(navigator, 'hardwareConcurrency', {
+        get: () => 4
+    });
+    Object.defineProperty(navigator, 'deviceMemory', {
+        get: () => 8
+    });
+"""
+
+
+class _BrowserSlot:
+    """풀 안의 브라우저 한 개와 사용 상태"""
+
+    def __init__(self, index):
+        self.index = index
+        self.browser = None
+        self.uses = 0
+        self.active = 0
+        self.retiring = False
+        self.launching = False
+        self.crashed = False
+
+    @property
+    def healthy(self):
+        return (
+            self.browser is not None
+            and not self.crashed
+            and self.browser.is_connected()
+        )
+
+
+class BrowserPool:
+    """미리 띄워 둔 Chromium을 여러 검색이 빌려 쓰는 브라우저 풀
+
+    - size: 유지할 브라우저 수
+    - contexts_per_browser: 브라우저 하나에서 동시에 열 수 있는 컨텍스트 수
+    - max_uses: 이 횟수만큼 빌려준 브라우저는 재시작(메모리 누수 방지)
+
+    검색마다 새 BrowserContext를 만들어 쿠키/스토리지를 분리하고,
+    반납 시 컨텍스트를 닫는다. 브라우저가 죽으면 다음 대여 때 다시 띄운다.
+    """
+
+    def __init__(self, size=1, max_uses=20, contexts_per_browser=2,
+                 browser_executable_path=None, launch_timeout=30000):
+        self.size = max(1, int(size))
+        self.max_uses = max(1, int(max_uses))
+        self.contexts_per_browser = max(1, int(contexts_per_browser))
+        self.browser_executable_path = browser_executable_path
+        self.launch_timeout = launch_timeout
+        self._playwright = None
+        self._slots = [_BrowserSlot(i) for i in range(self.size)]
+        self._cond = None
+        self._start_lock = asyncio.Lock()  # 미리 띄우기(g2b_warmup)와 첫 검색이 동시에 start()해도 한 번만 기동
+        self._started = False
+        self._closed = False
+        self.launch_count = 0
+        self.lease_count = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Playwright를 기동하고 브라우저를 미리 띄워 둔다"""
+        async with self._start_lock:
+            if self._started:
+                return
+            self._cond = asyncio.Condition()
+            print("1. Playwright 초기화 (브라우저 풀)")
+            self._playwright = await async_playwright().start()
+            self._started = True
+            await asyncio.gather(*(self._launch(slot) for slot in self._slots))
+
+    async def close(self):
+        self._closed = True
+        for slot in self._slots:
+            await self._close_browser(slot)
+        if self._playwright:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+        self._started = False
+
+    async def _launch(self, slot):
+        await self._close_browser(slot)
+        if self.browser_executable_path:
+            print(f"2. Chromium 실행 #{slot.index} (경로: {self.browser_executable_path})")
+        else:
+            print(f"2. Chromium 실행 #{slot.index} (기본 경로)")
+        kwargs = {
+            'headless': True,
+            'args': BROWSER_ARGS + LOW_MEMORY_ARGS if LOW_MEMORY else BROWSER_ARGS,
+            'timeout': self.launch_timeout,
+        }
+        if self.browser_executable_path:
+            kwargs['executable_path'] = self.browser_executable_path
+        browser = await self._playwright.chromium.launch(**kwargs)
+        browser.on("disconnected", lambda _: self._mark_crashed(slot, browser))
+        slot.browser = browser
+        slot.uses = 0
+        slot.retiring = False
+        slot.crashed = False
+        self.launch_count += 1
+
+    def _mark_crashed(self, slot, browser):
+        if slot.browser is browser:
+            slot.crashed = True
+
+    async def _close_browser(self, slot):
+        browser, slot.browser = slot.browser, None
+        if browser is None:
+            return
+        try:
+            await browser.close()
+        except Exception:
+            pass
+
+    async def _restart(self, slot, raise_errors=False):
+        """잠금 밖에서 브라우저를 재시작하고 대기 중인 대여자를 깨운다"""
+        try:
+            if not self._closed:
+                await self._launch(slot)
+        except Exception as e:
+            print(f"   ⚠️ 브라우저 #{slot.index} 재시작 실패: {str(e)[:50]}")
+            slot.crashed = True
+            if raise_errors:
+                raise
+        finally:
+            async with self._cond:
+                slot.launching = False
+                self._cond.notify_all()
+
+    async def _acquire_slot(self):
+        while True:
+            restart = None
+            async with self._cond:
+                candidates = sorted(self._slots, key=lambda s: s.active)
+                for slot in candidates:
+                    if slot.launching or slot.retiring:
+                        continue
+                    if not slot.healthy:
+                        if slot.active == 0:
+                            slot.launching = True
+                            restart = slot
+                            break
+                        continue
+                    if slot.active < self.contexts_per_browser:
+                        slot.active += 1
+                        slot.uses += 1
+                        if slot.uses >= self.max_uses:
+                            slot.retiring = True
+                        return slot
+                else:
+                    await self._cond.wait()
+                    continue
+            print(f"   - 브라우저 #{restart.index} 상태 이상, 재시작")
+            await self._restart(restart, raise_errors=True)
+
+    async def _release_slot(self, slot):
+        restart = False
+        async with self._cond:
+            slot.active -= 1
+            if slot.active == 0 and (slot.retiring or not slot.healthy):
+                slot.launching = True
+                restart = True
+            self._cond.notify_all()
+        if restart:
+            reason = "사용 횟수 초과" if slot.retiring else "비정상 종료"
+            print(f"   - 브라우저 #{slot.index} 재활용 ({reason})")
+            await self._restart(slot)
+
+    @asynccontextmanager
+    async def context(self, report=None, **options):
+        """격리된 새 BrowserContext를 빌려준다 (with 블록이 끝나면 닫힘)
+
+        report(RunReport)를 넘기면 대여 대기('acquire')와 컨텍스트 생성('context') 시간을 기록한다.
+        """
+        if not self._started:
+            await self.start()
+        context = None
+        with report.phase("acquire") if report is not None else nullcontext():
+            slot = await self._acquire_slot()
+        self.lease_count += 1
+        try:
+            with report.phase("context") if report is not None else nullcontext():
+                print("3. 브라우저 컨텍스트 생성")
+                try:
+                    context = await slot.browser.new_context(**{**CONTEXT_OPTIONS, **options})
+                except Exception:
+                    if slot.browser is not None and slot.browser.is_connected():
+                        raise
+                    slot.crashed = True
+                    raise
+                await context.add_init_script(STEALTH_SCRIPT)
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            await self._release_slot(slot)
+
+    @property
+    def capacity(self):
+        """동시에 빌려줄 수 있는 최대 컨텍스트 수"""
+        return self.size * self.contexts_per_browser
+
+    def stats(self):
+        return {
+            'size': self.size,
+            'launches': self.launch_count,
+            'leases': self.lease_count,
+            'browsers': [
+                {
+                    'index': s.index,
+                    'healthy': s.healthy,
+                    'uses': s.uses,
+                    'active': s.active,
+                }
+                for s in self._slots
+            ],
+        }
+
+
+class _LoopThread:
+    """풀을 보관하는 전용 이벤트 루프 스레드 (Streamlit 재실행 사이에도 유지)"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="g2b-pool-loop", daemon=True)
+        self.thread.start()
+
+    def run(self, coro, timeout=None):
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return future.result(timeout)
+
+
+_loop_thread = None
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_loop_thread():
+    global _loop_thread
+    with _shared_lock:
+        if _loop_thread is None:
+            _loop_thread = _LoopThread()
+        return _loop_thread
+
+
+def get_shared_pool(browser_executable_path=None, size=None, max_uses=None, contexts_per_browser=None):
+    """프로세스 전역 브라우저 풀 (없으면 생성, 환경변수 G2B_POOL_* 로 조정)
+
+    저메모리 모드(G2B_LOW_MEMORY)에서는 동시 컨텍스트 수를 줄이고 브라우저를 더 자주 재시작한다.
+    """
+    global _shared_pool
+    loop_thread = get_loop_thread()
+    default_uses = LOW_MEMORY_MAX_USES if LOW_MEMORY else int(os.environ.get("G2B_POOL_MAX_USES", "20"))
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = BrowserPool(
+                size=size or int(os.environ.get("G2B_POOL_SIZE", "1")),
+                max_uses=max_uses or default_uses,
+                contexts_per_browser=cap_concurrency(
+                    contexts_per_browser or int(os.environ.get("G2B_POOL_CONTEXTS", "2"))
+                ),
+                browser_executable_path=browser_executable_path,
+            )
+        pool = _shared_pool
+    loop_thread.run(pool.start())
+    return pool
+
+
+def run_on_pool_loop(coro, timeout=None):
+    """공유 풀의 이벤트 루프에서 코루틴을 실행하고 결과를 기다린다"""
+    return get_loop_thread().run(coro, timeout)
+
+
+def shutdown_shared_pool():
+    global _shared_pool
+    with _shared_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None and _loop_thread is not None:
+        _loop_thread.run(pool.close())
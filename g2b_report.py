@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+METRICS_PATH = os.environ.get("G2B_METRICS_PATH")
+
+# 실행 리포트에 나오는 단계 이름 (표시 순서)
+PHASES = [
+    "launch", "acquire", "context", "resume", "navigation", "popups", "menu",
+    "form", "search", "extraction", "pagination", "backend",
+]
+
+
+class RunReport:
+    """검색 한 번의 단계별 소요 시간과 선택된 방법을 기록하는 JSON 직렬화 가능한 리포트
+
+    with report.phase("search"): ... 로 단계를 감싸면 소요 시간과 성공 여부가 남고,
+    report.method("menu", selector)로 폴백 중 어떤 선택자/방법이 성공했는지 기록한다.
+    같은 단계가 여러 번 실행되면(페이지별 추출 등) 합계와 횟수로 집계된다.
+    """
+
+    def __init__(self, query=None, engine=None):
+        self.query = query
+        self.engine = engine
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.finished_at = None
+        self.total_ms = None
+        self.phases = []
+        self.methods = {}
+        self.counters = {}
+        self.info = {}
+        self.rows = 0
+        self.pages = 0
+        self.status = "running"
+        self.error = None
+        self.current = None  # 진행 중인 단계 (진행 상황 표시용)
+
+    @contextmanager
+    def phase(self, name):
+        record = {"name": name, "ok": True}
+        self.current = name
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record["ok"] = False
+            record["error"] = f"{type(e).__name__}: {str(e)[:200]}"
+            raise
+        finally:
+            record["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            self.phases.append(record)
+
+    def method(self, phase, winner):
+        self.methods[phase] = winner
+
+    def incr(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, key, value):
+        self.info[key] = value
+
+    def finish(self, rows=0, pages=None, error=None):
+        self.rows = rows
+        if pages is not None:
+            self.pages = pages
+        self.finished_at = time.time()
+        self.current = None
+        self.total_ms = round((time.perf_counter() - self._t0) * 1000, 1)
+        if error is not None:
+            self.status = "error"
+            self.error = f"{type(error).__name__}: {str(error)[:200]}"
+        else:
+            self.status = "ok" if rows else "empty"
+        METRICS.observe(self)
+        return self
+
+    def phase_totals(self):
+        """단계별 {'ms': 합계, 'count': 횟수, 'ok': 모두 성공 여부}"""
+        totals = {}
+        for record in self.phases:
+            entry = totals.setdefault(record["name"], {"ms": 0.0, "count": 0, "ok": True})
+            entry["ms"] = round(entry["ms"] + record["duration_ms"], 1)
+            entry["count"] += 1
+            entry["ok"] = entry["ok"] and record["ok"]
+        order = {name: i for i, name in enumerate(PHASES)}
+        return dict(sorted(totals.items(), key=lambda kv: order.get(kv[0], len(order))))
+
+    def to_dict(self):
+        return {
+            "query": self.query,
+            "engine": self.engine,
+            "status": self.status,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "total_ms": self.total_ms,
+            "rows": self.rows,
+            "pages": self.pages,
+            "phases": self.phase_totals(),
+            "methods": dict(self.methods),
+            "counters": dict(self.counters),
+            "info": dict(self.info),
+            "timeline": list(self.phases),
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+    def to_prometheus(self, prefix="g2b_run"):
+        """이번 실행만의 값을 Prometheus 텍스트 형식 게이지로 출력"""
+        labels = {"query": self.query or ""}
+        lines = [
+            f"# TYPE {prefix}_duration_seconds gauge",
+            _sample(f"{prefix}_duration_seconds", labels, (self.total_ms or 0) / 1000),
+            f"# TYPE {prefix}_rows gauge",
+            _sample(f"{prefix}_rows", labels, self.rows),
+            f"# TYPE {prefix}_phase_duration_seconds gauge",
+        ]
+        for name, entry in self.phase_totals().items():
+            lines.append(_sample(f"{prefix}_phase_duration_seconds", {**labels, "phase": name}, entry["ms"] / 1000))
+        for name, value in sorted(self.counters.items()):
+            metric = f"{prefix}_{_metric_name(name)}"
+            lines += [f"# TYPE {metric} gauge", _sample(metric, labels, value)]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _metric_name(name):
+    return "".join(ch if ch.isalnum() or ch == "_" else "_" for ch in name)
+
+
+def _sample(name, labels, value):
+    if labels:
+        inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+        return f"{name}{{{inner}}} {value}"
+    return f"{name} {value}"
+
+
+class MetricsRegistry:
+    """여러 실행을 누적한 Prometheus 카운터/합계 (프로세스 단위)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = {}
+        self.rows = 0
+        self.phase_sum = {}
+        self.phase_count = {}
+        self.methods = {}
+        self.counters = {}
+
+    def observe(self, report):
+        with self._lock:
+            self.runs[report.status] = self.runs.get(report.status, 0) + 1
+            self.rows += report.rows
+            for name, entry in report.phase_totals().items():
+                self.phase_sum[name] = self.phase_sum.get(name, 0.0) + entry["ms"] / 1000
+                self.phase_count[name] = self.phase_count.get(name, 0) + entry["count"]
+            for phase, winner in report.methods.items():
+                key = (phase, str(winner))
+                self.methods[key] = self.methods.get(key, 0) + 1
+            for name, value in report.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+        if METRICS_PATH:
+            try:
+                write_textfile(METRICS_PATH, self)
+            except OSError:
+                pass
+
+    def to_prometheus(self, prefix="g2b"):
+        with self._lock:
+            lines = [f"# TYPE {prefix}_runs_total counter"]
+            lines += [_sample(f"{prefix}_runs_total", {"status": k}, v) for k, v in sorted(self.runs.items())]
+            lines += [f"# TYPE {prefix}_rows_total counter", _sample(f"{prefix}_rows_total", {}, self.rows)]
+            lines.append(f"# TYPE {prefix}_phase_duration_seconds summary")
+            for name in sorted(self.phase_sum):
+                lines.append(_sample(f"{prefix}_phase_duration_seconds_sum", {"phase": name},
+                                     round(self.phase_sum[name], 4)))
+                lines.append(_sample(f"{prefix}_phase_duration_seconds_count", {"phase": name},
+                                     self.phase_count[name]))
+            lines.append(f"# TYPE {prefix}_method_wins_total counter")
+            for (phase, winner), value in sorted(self.methods.items()):
+                lines.append(_sample(f"{prefix}_method_wins_total", {"phase": phase, "method": winner}, value))
+            for name, value in sorted(self.counters.items()):
+                metric = f"{prefix}_{_metric_name(name)}_total"
+                lines += [f"# TYPE {metric} counter", _sample(metric, {}, value)]
+            return "\n".join(lines) + "\n"
+
+
+def write_textfile(path, registry):
+    """node_exporter textfile collector용 .prom 파일로 원자적으로 기록"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(registry.to_prometheus())
+    os.replace(tmp_path, path)
+
+
+METRICS = MetricsRegistry()
+
+
+def render_prometheus():
+    return METRICS.to_prometheus()
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+from playwright.async_api import Error as PlaywrightError
+
+from g2b_waits import LatencyBudgetExceeded
+
+PHASE_RETRIES = int(os.environ.get("G2B_PHASE_RETRIES", "2"))            # 단계별 재시도 횟수 (첫 시도 제외)
+RETRY_BASE = float(os.environ.get("G2B_RETRY_BASE", "1.0"))              # 첫 재시도 대기(초), 이후 2배씩
+RETRY_MAX = float(os.environ.get("G2B_RETRY_MAX", "15.0"))
+BREAKER_THRESHOLD = int(os.environ.get("G2B_BREAKER_THRESHOLD", "3"))    # 연속 차단/스로틀 횟수
+BREAKER_COOLDOWN = int(os.environ.get("G2B_BREAKER_COOLDOWN", "300"))    # 차단기가 열려 있는 시간(초)
+BREAKER_PATH = os.environ.get(
+    "G2B_BREAKER_PATH", os.path.join(tempfile.gettempdir(), "g2b_breaker.json")
+)
+
+BLOCK_TITLE_WORDS = ("접근", "브라우저", "차단", "비정상")     # 차단 안내 페이지 제목
+BLOCK_STATUS = {403: "접근 거부(403)", 429: "요청 과다(429)", 503: "서비스 불가(503)"}
+
+
+class PhaseFailed(Exception):
+    """크롤링 단계가 기대한 화면/결과에 이르지 못함 (재시도 대상)"""
+
+
+class BlockedError(PhaseFailed):
+    """사이트가 차단 안내 페이지나 403/429/503으로 응답함"""
+
+
+class CircuitOpenError(Exception):
+    """최근 차단이 이어져 차단기가 열려 있음 (재시도하지 않고 바로 실패)"""
+
+
+def block_reason(title=None, status=None):
+    """응답 상태 코드나 페이지 제목으로 차단 여부를 판단해 사유를 반환 (차단이 아니면 None)"""
+    if status in BLOCK_STATUS:
+        return BLOCK_STATUS[status]
+    if title and any(word in title for word in BLOCK_TITLE_WORDS):
+        return f"차단 페이지 감지 ('{title[:30]}')"
+    return None
+
+
+async def check_page(page, response=None):
+    """현재 페이지가 차단 안내 페이지면 BlockedError"""
+    title = await page.title()
+    reason = block_reason(title, response.status if response is not None else None)
+    if reason:
+        raise BlockedError(reason)
+    return title
+
+
+class CircuitBreaker:
+    """사이트가 막거나 속도를 제한할 때 크롤링을 잠시 멈추는 차단기
+
+    차단/스로틀(BlockedError)이 threshold번 이어지면 cooldown초 동안 열리고, 그동안 before()는
+    CircuitOpenError로 바로 실패한다. 시간이 지나면 한 번만 시험 삼아 통과시켜(half-open)
+    성공하면 닫고 실패하면 다시 연다. 열린 상태는 파일에도 남겨 같은 서버의 다른 프로세스
+    (g2b_shard 워커, g2b_daemon)도 함께 멈춘다.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN, path=BREAKER_PATH):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.path = path
+        self.failures = 0
+        self.open_until = 0.0
+        self.reason = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def _load_shared(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("open_until", 0) > self.open_until:
+            self.open_until = data["open_until"]
+            self.reason = data.get("reason")
+
+    def _save_shared(self):
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".g2b_breaker_")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"open_until": self.open_until, "reason": self.reason}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"   - 차단기 상태 저장 실패: {str(e)[:50]}")
+
+    @property
+    def state(self):
+        with self._lock:
+            self._load_shared()
+            if time.time() < self.open_until:
+                return "open"
+            return "half_open" if self.open_until else "closed"
+
+    def before(self):
+        """크롤링 단계를 시작해도 되는지 확인 (열려 있으면 CircuitOpenError)"""
+        with self._lock:
+            self._load_shared()
+            now = time.time()
+            if now < self.open_until:
+                raise CircuitOpenError(
+                    f"사이트 차단/속도 제한으로 {self.open_until - now:.0f}초 동안 크롤링을 멈춤 ({self.reason})"
+                )
+            if self.open_until:
+                if self._trial:
+                    raise CircuitOpenError(f"차단 해제 여부 확인 중 ({self.reason})")
+                self._trial = True
+
+    def record_success(self):
+        with self._lock:
+            was_open = bool(self.open_until)
+            self.failures = 0
+            self.open_until = 0.0
+            self.reason = None
+            self._trial = False
+            if was_open:
+                print("   ✓ 차단기 닫힘 (사이트 응답 정상)")
+                self._save_shared()
+
+    def record_block(self, reason):
+        with self._lock:
+            self.failures += 1
+            self.reason = reason
+            if self._trial or self.failures >= self.threshold:
+                self.open_until = time.time() + self.cooldown
+                self._save_shared()
+                print(f"   ⚠️ 차단기 열림: {reason} → {self.cooldown}초 동안 크롤링 중단")
+            self._trial = False
+
+    def record_failure(self):
+        """차단이 아닌 실패: 시험 통과 중이었다면 다음 시험을 허용"""
+        with self._lock:
+            self._trial = False
+
+
+def retry_delay(attempt, base=RETRY_BASE, maximum=RETRY_MAX):
+    """attempt번째 재시도 전 대기(초): 지수 백오프 + 지터"""
+    delay = min(maximum, base * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+async def retry_phase(name, attempt, retries=PHASE_RETRIES, report=None, breaker=None, on_retry=None):
+    """단계 하나(attempt: 인자 없는 코루틴 함수)를 실패한 그 단계부터 지수 백오프로 다시 시도
+
+    PhaseFailed·Playwright 오류·시간 초과만 재시도하고, 시간 예산 초과와 차단기 열림, 취소는 바로 올린다.
+    차단(BlockedError)은 차단기에 기록해 이어지면 다른 검색도 바로 멈추게 한다.
+    on_retry(코루틴 함수)가 있으면 재시도 전에 불러 화면을 되돌린다 (예: 새로고침).
+    """
+    breaker = breaker if breaker is not None else default_breaker()
+    for number in range(retries + 1):
+        breaker.before()
+        try:
+            result = await attempt()
+        except (CircuitOpenError, LatencyBudgetExceeded):
+            breaker.record_failure()
+            raise
+        except (PhaseFailed, PlaywrightError, asyncio.TimeoutError) as e:
+            if isinstance(e, BlockedError):
+                breaker.record_block(str(e))
+            else:
+                breaker.record_failure()
+            if number >= retries:
+                raise
+            delay = retry_delay(number + 1)
+            if report is not None:
+                report.incr(f"retries_{name}")
+            print(f"   ⚠️ {name} 단계 실패 ({str(e)[:60]}), {delay:.1f}초 후 재시도 ({number + 1}/{retries})")
+            await asyncio.sleep(delay)
+            if on_retry is not None:
+                await on_retry()
+            continue
+        except BaseException:
+            # 취소(작업 취소)나 예상하지 못한 오류: 시험 통과 중이었다면 풀어야 다음 before()가 영원히 막히지 않는다
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
+
+
+_default_breaker = None
+_default_lock = threading.Lock()
+
+
+def default_breaker():
+    global _default_breaker
+    with _default_lock:
+        if _default_breaker is None:
+            _default_breaker = CircuitBreaker()
+        return _default_breaker
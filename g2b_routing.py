@@ -0,0 +1,101 @@
+import os
+import re
+
+# 프로필별 차단/허용 규칙. allow_patterns는 deny 규칙보다 우선한다.
+# stylesheet는 팝업/버튼 표시 여부 판단(offsetParent, is_visible)에 필요하므로 기본 프로필에서 허용한다.
+PROFILES = {
+    "default": {
+        "deny_types": ["image", "media", "font", "manifest", "texttrack", "eventsource", "websocket"],
+        "deny_patterns": [
+            r"google-analytics\.com", r"googletagmanager\.com", r"doubleclick\.net",
+            r"/gtag/js", r"analytics", r"/banner/", r"/popup/.*\.(jpg|png|gif)",
+            r"\.(png|jpe?g|gif|webp|svg|ico|bmp|mp4|webm|mp3|woff2?|ttf|otf|eot)(\?|$)",
+        ],
+        "allow_patterns": [r"/websquare/.*\.(js|css|xml)(\?|$)"],
+    },
+    "strict": {
+        "deny_types": ["image", "media", "font", "stylesheet", "manifest", "texttrack", "eventsource", "websocket"],
+        "deny_patterns": [
+            r"google-analytics\.com", r"googletagmanager\.com", r"doubleclick\.net",
+            r"/gtag/js", r"analytics", r"/banner/",
+        ],
+        "allow_patterns": [],
+    },
+    "off": None,
+}
+DEFAULT_PROFILE = os.environ.get("G2B_RESOURCE_PROFILE", "default")
+
+
+class ResourceFilter:
+    """page.route로 리소스 종류·URL 패턴별로 요청을 차단/허용하고 통계를 남긴다
+
+    - allow_types가 주어지면 그 종류만 허용(화이트리스트), 아니면 deny_types만 차단
+    - allow_patterns에 맞는 URL은 종류와 상관없이 허용
+    - deny_patterns에 맞는 URL은 차단
+
+    허용 바이트는 응답의 content-length 기준(청크 응답은 제외된 근사치)이고,
+    차단된 요청은 내려받지 않으므로 바이트 대신 종류별 건수만 센다.
+    """
+
+    def __init__(self, deny_types=(), allow_types=None, deny_patterns=(), allow_patterns=()):
+        self.deny_types = set(deny_types)
+        self.allow_types = set(allow_types) if allow_types else None
+        self.deny_patterns = [re.compile(p, re.I) for p in deny_patterns]
+        self.allow_patterns = [re.compile(p, re.I) for p in allow_patterns]
+        self.requests_allowed = 0
+        self.requests_blocked = 0
+        self.bytes_allowed = 0
+        self.blocked_by_type = {}
+
+    @classmethod
+    def from_profile(cls, profile=DEFAULT_PROFILE):
+        """프로필 이름(또는 규칙 dict)으로 필터 생성, 'off'/None이면 None"""
+        if isinstance(profile, ResourceFilter):
+            return profile
+        if isinstance(profile, str):
+            if profile not in PROFILES:
+                raise ValueError(f"알 수 없는 리소스 프로필: {profile}")
+            profile = PROFILES[profile]
+        if not profile:
+            return None
+        return cls(**profile)
+
+    def allows(self, url, resource_type):
+        if any(p.search(url) for p in self.allow_patterns):
+            return True
+        if self.allow_types is not None and resource_type not in self.allow_types:
+            return False
+        if resource_type in self.deny_types:
+            return False
+        return not any(p.search(url) for p in self.deny_patterns)
+
+    async def install(self, context):
+        await context.route("**/*", self._handle)
+        context.on("response", self._on_response)
+
+    async def _handle(self, route):
+        request = route.request
+        if self.allows(request.url, request.resource_type):
+            self.requests_allowed += 1
+            await route.fallback()
+        else:
+            self.requests_blocked += 1
+            kind = request.resource_type
+            self.blocked_by_type[kind] = self.blocked_by_type.get(kind, 0) + 1
+            await route.abort("blockedbyclient")
+
+    def _on_response(self, response):
+        try:
+            self.bytes_allowed += int(response.headers.get("content-length", 0))
+        except ValueError:
+            pass
+
+    def stats(self):
+        stats = {
+            "requests_allowed": self.requests_allowed,
+            "requests_blocked": self.requests_blocked,
+            "bytes_allowed": self.bytes_allowed,
+        }
+        for kind, count in sorted(self.blocked_by_type.items()):
+            stats[f"blocked_{kind}"] = count
+        return stats
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import time
+
+SESSION_PATH = os.environ.get(
+    "G2B_SESSION_PATH", os.path.join(tempfile.gettempdir(), "g2b_session.json")
+)
+SESSION_TTL = int(os.environ.get("G2B_SESSION_TTL", str(6 * 3600)))
+
+
+class SessionSnapshot:
+    """제안공고목록 화면까지 가는 길을 저장해 두는 스냅샷
+
+    Playwright storage_state(쿠키/로컬스토리지)와 함께 목록 화면 URL,
+    그 화면을 연 메뉴 선택자를 JSON 파일에 보관한다. 다음 검색은 이 정보로
+    홈페이지·팝업·메뉴 탐색(5~8단계)을 건너뛰고 바로 목록 화면을 연다.
+    """
+
+    def __init__(self, path=SESSION_PATH, ttl=SESSION_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._cached = None
+        self._cached_mtime = None
+
+    def load(self):
+        """유효한 스냅샷을 반환 (없거나 TTL이 지났으면 None)"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return None
+        if self._cached is None or self._cached_mtime != mtime:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._cached = json.load(f)
+                self._cached_mtime = mtime
+            except (OSError, ValueError):
+                return None
+        if time.time() - self._cached.get("saved_at", 0) > self.ttl:
+            return None
+        return self._cached
+
+    async def save(self, context, list_url, home_url=None, menu_selector=None):
+        state = await context.storage_state()
+        data = {
+            "saved_at": time.time(),
+            "list_url": list_url,
+            "home_url": home_url,
+            "menu_selector": menu_selector,
+            "storage_state": state,
+        }
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".g2b_session_")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._cached = None
+        print(f"   ✓ 세션 스냅샷 저장: {self.path}")
+
+    def invalidate(self):
+        self._cached = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+_default_snapshot = None
+
+
+def default_snapshot():
+    global _default_snapshot
+    if _default_snapshot is None:
+        _default_snapshot = SessionSnapshot()
+    return _default_snapshot
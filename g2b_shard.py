@@ -0,0 +1,264 @@
+"""많은 검색어를 여러 프로세스(각자 브라우저 풀을 가진 워커)에 나눠 수집하는 코디네이터
+
+    python g2b_shard.py --keywords-file keywords.txt --workers 8 --output 결과.xlsx
+
+브라우저를 --single-process로 띄우므로 프로세스 하나의 처리량은 Chromium 하나에 묶인다.
+워커 프로세스를 코어 수만큼 늘리면 전체 처리량이 코어 수에 맞춰 늘어난다.
+"""
+import argparse
+import asyncio
+import collections
+import multiprocessing
+import os
+import queue
+import time
+
+from g2b_crawler import MAX_PAGES, find_browser_executable, merge_keyword_results, run_crawler_async
+from g2b_daemon import load_keywords
+from g2b_export import export_pages
+from g2b_filters import SearchFilters
+from g2b_pool import BrowserPool
+from g2b_report import RunReport
+from g2b_waits import DEFAULT_PHASE_TIMEOUTS, DEFAULT_TOTAL_BUDGET
+
+SHARD_WORKERS = int(os.environ.get("G2B_SHARD_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+SHARD_PER_WORKER = int(os.environ.get("G2B_SHARD_PER_WORKER", "2"))  # 워커 하나가 동시에 맡는 검색어 수
+SHARD_RETRIES = int(os.environ.get("G2B_SHARD_RETRIES", "2"))        # 워커가 죽었을 때 검색어를 다시 맡기는 횟수
+SHARD_RESPAWNS = int(os.environ.get("G2B_SHARD_RESPAWNS", "8"))      # 죽은 워커를 새로 띄우는 총 횟수 상한
+SHARD_DEADLINE_MARGIN = float(os.environ.get("G2B_SHARD_DEADLINE_MARGIN", "60"))  # 검색어 마감 시간에 더하는 여유(초)
+
+
+def _worker_main(worker_id, tasks, results, browser_executable_path, per_worker, engine, filters, max_pages):
+    """워커 프로세스: 자기 브라우저 풀로 받은 검색어를 per_worker개씩 동시에 검색해 결과를 돌려보낸다"""
+    asyncio.run(_worker_loop(worker_id, tasks, results, browser_executable_path, per_worker, engine, filters,
+                             max_pages))
+
+
+async def _worker_loop(worker_id, tasks, results, browser_executable_path, per_worker, engine, filters, max_pages):
+    loop = asyncio.get_running_loop()
+    async with BrowserPool(size=1, contexts_per_browser=per_worker,
+                           browser_executable_path=browser_executable_path) as pool:
+        running = set()
+
+        async def search(keyword):
+            report = RunReport(keyword, engine)
+            headers = rows = None
+            try:
+                headers, rows = await run_crawler_async(keyword, pool=pool, max_pages=max_pages, engine=engine,
+                                                        report=report, filters=filters)
+            except Exception as e:
+                print(f"\n[ERROR] [워커 {worker_id}] '{keyword}' 실패: {str(e)}")
+            results.put(("done", worker_id, keyword, headers, rows, report.to_dict()))
+
+        while True:
+            keyword = await loop.run_in_executor(None, tasks.get)
+            if keyword is None:
+                break
+            task = asyncio.ensure_future(search(keyword))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+
+class _Worker:
+    def __init__(self, worker_id, process, tasks):
+        self.id = worker_id
+        self.process = process
+        self.tasks = tasks
+        self.inflight = set()
+        self.deadlines = {}  # 검색어 → 이 시각(monotonic)까지 결과가 없으면 멈춘 워커로 본다
+        self.done = 0
+
+    def overdue(self, now):
+        return [k for k in self.inflight if self.deadlines.get(k, now) < now]
+
+
+class ShardCoordinator:
+    """검색어를 워커 프로세스들에 나눠 맡기고 결과를 제안공고번호 기준으로 합친다
+
+    - 워커마다 전용 작업 큐가 있고, 코디네이터가 워커별로 최대 per_worker개까지만 맡긴다.
+      끝난 워커가 남은 검색어를 바로 가져가므로 느린 워커가 일을 쌓아 두지 않는다 (작업 가로채기).
+    - 워커 프로세스가 죽으면 그 워커가 맡고 있던 검색어를 다시 대기열에 넣고 새 워커를 띄운다
+      (검색어마다 retries번, 전체 respawns번까지). 여러 검색어를 맡은 채 죽었다면 누가 원인인지 모르므로
+      그 검색어들은 다시 맡길 때 워커 하나에 하나씩만 맡겨, 문제 검색어가 다른 검색어까지 실패시키지 않게 한다.
+    - 살아 있어도 검색어 하나를 keyword_timeout초 넘게 붙잡고 있는 워커는 멈춘 것으로 보고 종료한 뒤
+      죽은 워커와 같은 방법으로 재배정한다 (기준을 넘긴 검색어는 다시 맡길 때 워커 하나에 하나씩만).
+      기본값은 전체 시간 예산(첫 결과까지)에 페이지마다의 단계 상한과 여유를 더한 값이다.
+    - store(g2b_store.ResultStore)를 넘기면 결과를 코디네이터 한 곳에서 저장소에 기록한다.
+    """
+
+    def __init__(self, workers=SHARD_WORKERS, per_worker=SHARD_PER_WORKER, retries=SHARD_RETRIES,
+                 respawns=SHARD_RESPAWNS, browser_executable_path=None, engine="browser", filters=None,
+                 max_pages=MAX_PAGES, store=None, keyword_timeout=None):
+        self.workers = max(1, workers)
+        self.per_worker = max(1, per_worker)
+        self.retries = retries
+        self.respawns = respawns
+        self.browser_executable_path = browser_executable_path
+        self.engine = engine
+        self.filters = SearchFilters.coerce(filters)
+        self.max_pages = max_pages
+        self.store = store
+        if keyword_timeout is None:
+            keyword_timeout = ((DEFAULT_TOTAL_BUDGET + max_pages * DEFAULT_PHASE_TIMEOUTS["page"]) / 1000
+                               + SHARD_DEADLINE_MARGIN)
+        self.keyword_timeout = keyword_timeout
+        self._mp = multiprocessing.get_context("spawn")  # 브라우저·스레드를 가진 부모를 fork하지 않는다
+        self._results = None
+        self._next_id = 0
+        self.reports = []
+        self.failed = {}
+
+    def _spawn(self):
+        tasks = self._mp.Queue()
+        process = self._mp.Process(
+            target=_worker_main,
+            args=(self._next_id, tasks, self._results, self.browser_executable_path, self.per_worker, self.engine,
+                  self.filters, self.max_pages),
+            name=f"g2b-shard-{self._next_id}",
+            daemon=True,
+        )
+        process.start()
+        worker = _Worker(self._next_id, process, tasks)
+        self._next_id += 1
+        return worker
+
+    def run(self, keywords):
+        """검색어 전체를 수집해 (headers, rows)를 반환 (검색어 열 포함, 제안공고번호 중복 제거)"""
+        keywords = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+        if not keywords:
+            return None, None
+        started = time.time()
+        self._results = self._mp.Queue()
+        pending = collections.deque(keywords)
+        attempts = collections.Counter()
+        results = {}
+        isolate = set()
+        respawns = 0
+        workers = {}
+        for _ in range(min(self.workers, len(keywords))):
+            worker = self._spawn()
+            workers[worker.id] = worker
+        print(f"=== 샤드 수집 시작: {len(keywords)}개 검색어, 워커 {len(workers)}개 × {self.per_worker} ===")
+        try:
+            while pending or any(w.inflight for w in workers.values()):
+                for worker in workers.values():
+                    while pending and len(worker.inflight) < self.per_worker and not worker.inflight & isolate:
+                        if pending[0] in isolate and worker.inflight:
+                            break
+                        keyword = pending.popleft()
+                        attempts[keyword] += 1
+                        worker.inflight.add(keyword)
+                        worker.deadlines[keyword] = time.monotonic() + self.keyword_timeout
+                        worker.tasks.put(keyword)
+                try:
+                    message = self._results.get(timeout=1.0)
+                except queue.Empty:
+                    message = None
+                if message is not None:
+                    _, worker_id, keyword, headers, rows, report = message
+                    worker = workers.get(worker_id)
+                    if worker is not None:
+                        worker.inflight.discard(keyword)
+                        worker.deadlines.pop(keyword, None)
+                        worker.done += 1
+                    if keyword not in results:  # 있으면 죽은 워커에서 뒤늦게 온 중복 결과
+                        results[keyword] = (headers, rows)
+                        self.reports.append(report)
+                        if self.store is not None and rows:
+                            self.store.record(headers, rows, keyword)
+                        print(f"   ✓ [워커 {worker_id}] '{keyword}' {len(rows or [])}건 "
+                              f"({len(results)}/{len(keywords)})")
+                now = time.monotonic()
+                for worker in list(workers.values()):
+                    stuck = worker.overdue(now)
+                    if worker.process.is_alive():
+                        if not stuck:
+                            continue
+                        print(f"   ⚠️ 워커 {worker.id}가 {self.keyword_timeout:.0f}초 넘게 응답 없음 "
+                              f"({', '.join(stuck)}), 종료")
+                        self._terminate(worker)
+                    lost = [k for k in worker.inflight if k not in results]
+                    del workers[worker.id]
+                    print(f"   ⚠️ 워커 {worker.id} 종료 (exit {worker.process.exitcode}), 맡은 검색어 {len(lost)}개 재배정")
+                    if stuck:
+                        isolate.update(stuck)  # 마감을 넘긴 검색어가 원인이므로 그것만 따로 맡긴다
+                    elif len(lost) > 1:
+                        isolate.update(lost)
+                    for keyword in lost:
+                        if attempts[keyword] > self.retries:
+                            reason = "시간 초과" if keyword in stuck else "워커 비정상 종료"
+                            self.failed[keyword] = f"{reason} {attempts[keyword]}회"
+                            print(f"   ⚠️ '{keyword}' 재시도 횟수 초과")
+                        else:
+                            pending.appendleft(keyword)
+                    if (pending or not workers) and respawns < self.respawns:
+                        respawns += 1
+                        replacement = self._spawn()
+                        workers[replacement.id] = replacement
+                if not workers:
+                    for keyword in pending:
+                        self.failed[keyword] = "실행 중인 워커 없음"
+                    pending.clear()
+        finally:
+            self._shutdown(workers.values())
+        elapsed = time.time() - started
+        print(f"=== 샤드 수집 완료: {len(results)}개 검색어, 실패 {len(self.failed)}개, {elapsed:.1f}초 ===")
+        ordered = [(keyword, results[keyword]) for keyword in keywords if keyword in results]
+        return merge_keyword_results(ordered)
+
+    def _shutdown(self, workers):
+        workers = list(workers)
+        for worker in workers:
+            try:
+                worker.tasks.put(None)
+            except (OSError, ValueError):
+                pass
+        for worker in workers:
+            worker.process.join(timeout=30)
+            if worker.process.is_alive():
+                self._terminate(worker)
+
+    @staticmethod
+    def _terminate(worker):
+        worker.process.terminate()
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join(timeout=5)
+
+
+def run_sharded(keywords, workers=SHARD_WORKERS, per_worker=SHARD_PER_WORKER, browser_executable_path=None,
+                engine="browser", filters=None, store=None):
+    """검색어 목록을 워커 프로세스들에 나눠 수집 → ((headers, rows), 검색어별 리포트 dict 목록)"""
+    coordinator = ShardCoordinator(workers, per_worker, browser_executable_path=browser_executable_path,
+                                   engine=engine, filters=filters, store=store)
+    return coordinator.run(keywords), coordinator.reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="G2B 제안공고 다중 프로세스 수집")
+    parser.add_argument("keywords", nargs="*", help="검색어 (없으면 --keywords-file 또는 G2B_DAEMON_KEYWORDS)")
+    parser.add_argument("--keywords-file")
+    parser.add_argument("--workers", type=int, default=SHARD_WORKERS, help="워커 프로세스 수 (기본: 코어 수의 절반)")
+    parser.add_argument("--per-worker", type=int, default=SHARD_PER_WORKER, help="워커별 동시 검색 수")
+    parser.add_argument("--engine", choices=["browser", "backend"], default="browser")
+    parser.add_argument("--output", help="결과 파일 (.xlsx, .csv, .parquet)")
+    args = parser.parse_args(argv)
+
+    keywords = load_keywords(args)
+    if not keywords:
+        parser.error("검색어가 없습니다")
+    (headers, rows), reports = run_sharded(keywords, args.workers, args.per_worker, find_browser_executable(),
+                                           args.engine)
+    if not rows:
+        return 1
+    if args.output:
+        written = export_pages([rows], headers, args.output)
+        print(f"   ✓ {args.output}에 {written}건 저장")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
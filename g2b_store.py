@@ -0,0 +1,256 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+STORE_PATH = os.environ.get("G2B_STORE_PATH", "g2b_results.db")
+KEY_COLUMN = "제안공고번호"
+TRACKED_COLUMNS = ("공고상태", "공고마감일시")  # 바뀌면 '변경'으로 보고 이력에 남기는 열
+RESULT_MAX_AGE = int(os.environ.get("G2B_RESULT_MAX_AGE", str(24 * 3600)))  # 이보다 오래 못 본 공고는 목록에서 뺀다
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notices (
+    notice_no TEXT PRIMARY KEY,
+    headers TEXT NOT NULL,
+    row TEXT NOT NULL,
+    status TEXT,
+    deadline TEXT,
+    queries TEXT NOT NULL DEFAULT '',
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notices_first_seen ON notices(first_seen);
+CREATE INDEX IF NOT EXISTS idx_notices_last_seen ON notices(last_seen);
+CREATE TABLE IF NOT EXISTS notice_history (
+    notice_no TEXT NOT NULL,
+    seen_at REAL NOT NULL,
+    status TEXT,
+    deadline TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_notice ON notice_history(notice_no, seen_at);
+CREATE TABLE IF NOT EXISTS runs (
+    query TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    status TEXT,
+    mode TEXT,
+    rows INTEGER,
+    new INTEGER,
+    changed INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_query ON runs(query, started_at);
+CREATE TABLE IF NOT EXISTS notice_details (
+    notice_no TEXT PRIMARY KEY,
+    detail TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+class ResultStore:
+    """제안공고번호를 키로 검색 결과를 쌓아 두는 SQLite 저장소
+
+    공고마다 처음/마지막으로 본 시각과 공고상태·공고마감일시 변경 이력을 남긴다.
+    record()는 각 행이 신규(new)/변경(changed)/그대로(same)인지 알려 주므로
+    증분 검색에서 "지난 실행 이후 새로 나온 공고"만 골라낼 수 있다.
+    여러 스레드(풀 이벤트 루프, Streamlit)에서 같이 쓰도록 연결 하나를 잠금으로 보호한다.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record(self, headers, rows, query=None, seen_at=None):
+        """행들을 저장하고 [(변경 종류, 행), ...]을 반환 ('new' | 'changed' | 'same')
+
+        키(제안공고번호)가 없는 행은 저장하지 않고 'new'로 돌려준다.
+        """
+        headers = list(headers)
+        key_index = headers.index(KEY_COLUMN)
+        status_index, deadline_index = (
+            headers.index(name) if name in headers else None for name in TRACKED_COLUMNS
+        )
+        seen_at = seen_at if seen_at is not None else time.time()
+        headers_json = json.dumps(headers, ensure_ascii=False)
+        results = []
+        with self._lock, self._conn:
+            for row in rows:
+                number = row[key_index] if key_index < len(row) else None
+                if not number:
+                    results.append(("new", row))
+                    continue
+                status = _cell(row, status_index)
+                deadline = _cell(row, deadline_index)
+                row_json = json.dumps(list(row), ensure_ascii=False)
+                existing = self._conn.execute(
+                    "SELECT status, deadline, queries FROM notices WHERE notice_no = ?", (number,)
+                ).fetchone()
+                if existing is None:
+                    change = "new"
+                    self._conn.execute(
+                        "INSERT INTO notices (notice_no, headers, row, status, deadline, queries, first_seen, last_seen)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (number, headers_json, row_json, status, deadline, query or "", seen_at, seen_at),
+                    )
+                else:
+                    changed = (existing["status"], existing["deadline"]) != (status, deadline)
+                    change = "changed" if changed else "same"
+                    self._conn.execute(
+                        "UPDATE notices SET headers = ?, row = ?, status = ?, deadline = ?, queries = ?, last_seen = ?"
+                        " WHERE notice_no = ?",
+                        (headers_json, row_json, status, deadline,
+                         _add_query(existing["queries"], query), seen_at, number),
+                    )
+                if change != "same":
+                    self._conn.execute(
+                        "INSERT INTO notice_history (notice_no, seen_at, status, deadline) VALUES (?, ?, ?, ?)",
+                        (number, seen_at, status, deadline),
+                    )
+                results.append((change, row))
+        return results
+
+    def get(self, number):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM notices WHERE notice_no = ?", (number,)).fetchone()
+        return _to_dict(row) if row is not None else None
+
+    def history(self, number):
+        """공고 하나의 상태/마감일시 변경 이력 (오래된 순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seen_at, status, deadline FROM notice_history WHERE notice_no = ? ORDER BY seen_at",
+                (number,),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def notices(self, query=None, since=None, seen_since=None):
+        """저장된 공고 목록 (since 이후 처음 본 것, seen_since 이후 다시 본 것, query가 포함된 것만 고를 수 있음)"""
+        sql = "SELECT * FROM notices WHERE 1 = 1"
+        params = []
+        if since is not None:
+            sql += " AND first_seen >= ?"
+            params.append(since)
+        if seen_since is not None:
+            sql += " AND last_seen >= ?"
+            params.append(seen_since)
+        if query:
+            sql += " AND (',' || queries || ',') LIKE ?"
+            params.append(f"%,{query},%")
+        sql += " ORDER BY first_seen DESC, notice_no DESC"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_to_dict(r) for r in rows]
+
+    def iter_rows(self, query=None, batch_size=500):
+        """저장된 공고를 (headers, 행 묶음) 단위로 흘려보낸다 (전체 이력 내보내기용)
+
+        별도 읽기 연결을 써서 반복 중에도 수집기의 쓰기를 막지 않는다 (WAL).
+        """
+        sql = "SELECT headers, row FROM notices"
+        params = []
+        if query:
+            sql += " WHERE (',' || queries || ',') LIKE ?"
+            params.append(f"%,{query},%")
+        sql += " ORDER BY first_seen DESC, notice_no DESC"
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    return
+                yield json.loads(batch[0][0]), [json.loads(row) for _, row in batch]
+        finally:
+            conn.close()
+
+    def details(self, numbers, max_age=None):
+        """제안공고번호 → 저장된 상세 정보 (max_age초보다 오래된 것은 빼고)"""
+        numbers = [n for n in numbers if n]
+        cutoff = time.time() - max_age if max_age is not None else 0
+        found = {}
+        with self._lock:
+            for i in range(0, len(numbers), 500):
+                chunk = numbers[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for number, detail in self._conn.execute(
+                    f"SELECT notice_no, detail FROM notice_details WHERE notice_no IN ({marks}) AND fetched_at >= ?",
+                    chunk + [cutoff],
+                ):
+                    found[number] = json.loads(detail)
+        return found
+
+    def save_detail(self, number, detail, fetched_at=None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO notice_details (notice_no, detail, fetched_at) VALUES (?, ?, ?)",
+                (number, json.dumps(detail, ensure_ascii=False), fetched_at or time.time()),
+            )
+
+    def record_run(self, query, started_at, finished_at, status, mode=None, rows=0, new=0, changed=0, error=None):
+        """수집 실행 한 번의 결과를 남긴다 (백그라운드 수집 현황 표시용)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (query, started_at, finished_at, status, mode, rows, new, changed, error)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (query, started_at, finished_at, status, mode, rows, new, changed, error),
+            )
+
+    def last_run(self, query, status=None):
+        sql = "SELECT * FROM runs WHERE query = ?"
+        params = [query]
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY started_at DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return dict(row) if row is not None else None
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM notices").fetchone()[0]
+
+
+def _cell(row, index):
+    if index is None or index >= len(row):
+        return None
+    return row[index]
+
+
+def _add_query(queries, query):
+    names = [q for q in (queries or "").split(",") if q]
+    if query and query not in names:
+        names.append(query)
+    return ",".join(names)
+
+
+def _to_dict(row):
+    data = dict(row)
+    data["headers"] = json.loads(data["headers"])
+    data["row"] = json.loads(data["row"])
+    return data
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ResultStore()
+        return _default_store
@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+STRATEGY_PATH = os.environ.get(
+    "G2B_STRATEGY_PATH", os.path.join(tempfile.gettempdir(), "g2b_strategy.json")
+)
+STRATEGY_DECAY = float(os.environ.get("G2B_STRATEGY_DECAY", "0.8"))  # 성공할 때마다 같은 단계의 다른 점수에 곱함
+FAILURE_PENALTY = 0.5                                                # 실패한 전략 점수에 곱함
+
+
+class StrategyCache:
+    """단계별로 어떤 폴백 전략(선택자/방법)이 성공했는지 기억하는 캐시
+
+    전략마다 점수·성공·실패 횟수를 JSON 파일에 남긴다. 성공하면 같은 단계의 모든 점수를
+    decay만큼 줄인 뒤 성공한 전략에 1을 더하고, 실패하면 그 전략 점수를 절반으로 줄인다.
+    order()는 점수가 높은 전략부터(같으면 원래 순서대로) 돌려주므로, 사이트가 바뀌어
+    예전 승자가 계속 실패하면 몇 번 만에 다음 후보로 순서가 넘어간다.
+    """
+
+    def __init__(self, path=STRATEGY_PATH, decay=STRATEGY_DECAY):
+        self.path = path
+        self.decay = decay
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".g2b_strategy_")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"   - 전략 캐시 저장 실패: {str(e)[:50]}")
+
+    def _entry(self, phase, name):
+        return self._data.setdefault(phase, {}).setdefault(name, {"score": 0.0, "wins": 0, "losses": 0})
+
+    def order(self, phase, names):
+        """names를 점수가 높은 순으로 정렬 (같은 점수면 원래 순서 유지)"""
+        with self._lock:
+            scores = self._data.get(phase, {})
+            ranked = sorted(enumerate(names), key=lambda item: (-scores.get(item[1], {}).get("score", 0.0), item[0]))
+        return [name for _, name in ranked]
+
+    def success(self, phase, name):
+        with self._lock:
+            for entry in self._data.get(phase, {}).values():
+                entry["score"] *= self.decay
+            entry = self._entry(phase, name)
+            entry["score"] += 1.0
+            entry["wins"] += 1
+            entry["last_win"] = time.time()
+            self._save()
+
+    def failure(self, phase, name):
+        with self._lock:
+            entry = self._entry(phase, name)
+            entry["score"] *= FAILURE_PENALTY
+            entry["losses"] += 1
+            self._save()
+
+    def stats(self, phase=None):
+        with self._lock:
+            if phase is not None:
+                return json.loads(json.dumps(self._data.get(phase, {})))
+            return json.loads(json.dumps(self._data))
+
+    def reset(self, phase=None):
+        with self._lock:
+            if phase is None:
+                self._data = {}
+            else:
+                self._data.pop(phase, None)
+            self._save()
+
+
+async def run_strategies(phase, strategies, cache=None, report=None):
+    """[(이름, 인자 없는 코루틴 함수), ...]를 학습된 순서로 시도해 처음 성공한 (이름, 결과)를 반환
+
+    함수가 참 값을 돌려주면 성공, 거짓이거나 예외가 나면 실패로 기록하고 다음 전략을 시도한다.
+    모두 실패하면 (None, None).
+    """
+    cache = cache if cache is not None else default_strategies()
+    attempts = dict(strategies)
+    for name in cache.order(phase, [name for name, _ in strategies]):
+        try:
+            result = await attempts[name]()
+        except Exception as e:
+            print(f"   - {phase} 전략 '{name}' 실패: {str(e)[:50]}")
+            result = None
+        if result:
+            cache.success(phase, name)
+            if report is not None:
+                report.method(phase, name)
+            return name, result
+        cache.failure(phase, name)
+    return None, None
+
+
+_default_strategies = None
+_default_lock = threading.Lock()
+
+
+def default_strategies():
+    global _default_strategies
+    with _default_lock:
+        if _default_strategies is None:
+            _default_strategies = StrategyCache()
+        return _default_strategies
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import time
+from urllib.parse import unquote_plus
+
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+# 단계별 최대 대기 시간(ms). 조건이 먼저 충족되면 그만큼 빨리 끝난다.
+DEFAULT_PHASE_TIMEOUTS = {
+    "navigation": 30000,  # page.goto
+    "settle": 10000,      # 홈페이지 메뉴가 붙을 때까지
+    "popups": 1500,       # 공지 팝업 등장/사라짐
+    "menu": 8000,         # 제안공고목록 화면 전환
+    "form": 5000,         # 검색 폼 입력
+    "search": 15000,      # 검색 응답 + 그리드 갱신
+    "page": 10000,        # 다음 페이지 그리드 갱신
+}
+DEFAULT_TOTAL_BUDGET = int(os.environ.get("G2B_TOTAL_BUDGET_MS", "120000"))
+
+
+class LatencyBudgetExceeded(Exception):
+    """한 번의 검색에 허용된 전체 시간 예산을 다 썼음"""
+
+
+class LatencyBudget:
+    """검색 한 번의 전체 시간 예산과 단계별 대기 상한
+
+    timeout(phase)는 단계 상한과 남은 전체 예산 중 작은 값을 ms로 돌려주므로,
+    사이트가 빠르면 조건 충족 즉시 넘어가고 느리면 예산 안에서만 기다린다.
+    전체 예산은 첫 결과 그리드가 뜰 때까지만 쓰고, 그 뒤 페이지 넘김은 phase_timeout(phase)로
+    단계 상한만 적용한다 (결과가 많거나 소비자가 느려도 중간에 잘리지 않게).
+    """
+
+    def __init__(self, total_ms=DEFAULT_TOTAL_BUDGET, **phase_timeouts):
+        self.total_ms = total_ms
+        self.phase_timeouts = {**DEFAULT_PHASE_TIMEOUTS, **phase_timeouts}
+        self.started = time.monotonic()
+
+    @classmethod
+    def from_config(cls, timeouts=None):
+        """{'total': ms, '<단계>': ms, ...} 설정으로 새 예산을 만든다 (검색마다 새로 시작)"""
+        timeouts = dict(timeouts or {})
+        total = timeouts.pop("total", DEFAULT_TOTAL_BUDGET)
+        return cls(total, **timeouts)
+
+    def elapsed_ms(self):
+        return (time.monotonic() - self.started) * 1000
+
+    def remaining_ms(self):
+        return self.total_ms - self.elapsed_ms()
+
+    def timeout(self, phase):
+        remaining = self.remaining_ms()
+        if remaining <= 0:
+            raise LatencyBudgetExceeded(f"전체 시간 예산 {self.total_ms}ms 초과 ({phase} 단계)")
+        return max(1, int(min(self.phase_timeouts.get(phase, 10000), remaining)))
+
+    def phase_timeout(self, phase):
+        """전체 예산과 무관한 단계 상한(ms), 페이지 수만큼 되풀이되는 단계용"""
+        return max(1, int(self.phase_timeouts.get(phase, 10000)))
+
+
+async def wait_first(*aws, timeout_ms=None):
+    """여러 대기 중 먼저 끝난 것의 인덱스를 반환 (모두 시간 초과면 None)"""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout_ms is None else loop.time() + timeout_ms / 1000  # 실패한 대기가 있어도 전체 상한은 한 번
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=None if deadline is None else max(0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                return None
+            for task in tasks:
+                if task in done and task.exception() is None:
+                    return tasks.index(task)
+        return None
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        for task in tasks:
+            if task.done() and not task.cancelled():
+                task.exception()
+
+
+def is_data_response(response):
+    """그리드를 채우는 XHR/fetch 응답 후보"""
+    request = response.request
+    return request.resource_type in ("xhr", "fetch") and request.method == "POST"
+
+
+def request_mentions(request, text):
+    """요청 URL/본문에 text가 (URL 인코딩·JSON 이스케이프 포함) 들어 있는지"""
+    if not text:
+        return True
+    haystack = (request.post_data or "") + " " + request.url
+    if text in haystack or text in unquote_plus(haystack):
+        return True
+    return json.dumps(text)[1:-1] in haystack
+
+
+async def wait_for_function_quiet(page, expression, arg=None, timeout=1000):
+    """page.wait_for_function을 시간 초과 시 예외 대신 False로 반환"""
+    try:
+        await page.wait_for_function(expression, arg=arg, timeout=timeout)
+        return True
+    except PlaywrightTimeout:
+        return False
@@ -0,0 +1,114 @@
+import glob
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+BROWSER_PATH = os.environ.get("PLAYWRIGHT_BROWSERS_PATH", "/tmp/playwright-browsers")
+PREWARM = os.environ.get("G2B_PREWARM", "1").lower() not in ("0", "false", "no", "off")  # 입력하는 동안 브라우저를 미리 띄울지
+
+
+def installed_browser(browser_path=BROWSER_PATH):
+    """browser_path에 설치된 Playwright Chromium 실행 파일 (없으면 None)"""
+    found = sorted(glob.glob(os.path.join(browser_path, "chromium-*", "chrome-linux", "chrome")))
+    return found[-1] if found else None
+
+
+def install_browser(browser_path=BROWSER_PATH):
+    """playwright install chromium 후 실행 파일 경로 (실패하면 RuntimeError)"""
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "playwright", "install", "chromium"],
+            check=True,
+            capture_output=True,
+            text=True
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"브라우저 설치에 실패했습니다. {(e.stderr or '')[-200:]}")
+    path = installed_browser(browser_path)
+    if not path:
+        raise RuntimeError("브라우저 설치는 완료되었으나 실행 파일이 없습니다.")
+    return path
+
+
+class BrowserWarmup:
+    """브라우저 준비를 백그라운드 스레드에서 해 두는 시작 가속기
+
+    1) 설치된 Chromium을 찾고(없으면 설치) 2) prewarm이면 공유 브라우저 풀(g2b_pool)을 미리 띄운다.
+    앱은 화면을 먼저 그리고, 사용자가 검색어를 입력하는 동안 이 작업이 끝나 첫 검색에서 기동 비용이 빠진다.
+    timings에는 단계별 소요 시간(ms: resolve, install, import, launch)이 남는다.
+    """
+
+    def __init__(self, browser_path=BROWSER_PATH, prewarm=PREWARM):
+        self.browser_path = browser_path
+        self.prewarm = prewarm
+        self.executable_path = None
+        self.error = None
+        self.timings = {}
+        self.status = "idle"
+        self._resolved = threading.Event()
+        self._done = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                os.environ["PLAYWRIGHT_BROWSERS_PATH"] = self.browser_path
+                self.status = "resolving"
+                self._thread = threading.Thread(target=self._run, name="g2b-warmup", daemon=True)
+                self._thread.start()
+        return self
+
+    def wait_executable(self, timeout=None):
+        """실행 파일 경로가 정해질 때까지 기다려 반환 (실패했으면 None, error에 사유)"""
+        self._resolved.wait(timeout)
+        return self.executable_path
+
+    def wait(self, timeout=None):
+        """미리 띄우기까지 끝날 때까지 기다린다"""
+        return self._done.wait(timeout)
+
+    def _timed(self, name, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    def _run(self):
+        try:
+            path = self._timed("resolve", installed_browser, self.browser_path)
+            if not path:
+                self.status = "installing"
+                path = self._timed("install", install_browser, self.browser_path)
+            self.executable_path = path
+            self._resolved.set()
+            if self.prewarm:
+                self.status = "warming"
+                pool_module = self._timed("import", importlib.import_module, "g2b_pool")
+                self._timed("launch", pool_module.get_shared_pool, path)
+            self.status = "ready"
+            print("🚀 브라우저 준비 완료: " + ", ".join(f"{k} {v:.0f}ms" for k, v in self.timings.items()))
+        except Exception as e:
+            self.error = str(e)
+            self.status = "cold" if self.executable_path else "error"
+            if self.executable_path:
+                print(f"   ⚠️ 브라우저 미리 띄우기 실패 (검색할 때 다시 시도): {str(e)[:80]}")
+        finally:
+            self._resolved.set()
+            self._done.set()
+
+
+_default_warmup = None
+_default_lock = threading.Lock()
+
+
+def default_warmup():
+    global _default_warmup
+    with _default_lock:
+        if _default_warmup is None:
+            _default_warmup = BrowserWarmup()
+        return _default_warmup
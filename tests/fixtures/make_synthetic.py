@@ -0,0 +1,163 @@
+"""tests/fixtures의 합성 HAR을 다시 만든다 (python tests/fixtures/make_synthetic.py)
+
+실제 사이트 녹화 대신, 크롤러가 거치는 흐름을 같은 모양의 응답으로 흉내 낸다.
+  1) index.do: 나라장터 제목, 공지 팝업(w2window_header + 닫기 버튼), 제안공고목록 메뉴
+  2) 메뉴 클릭 → 제안공고목록 화면 조각(GET, 검색 폼·그리드·페이지 목록)
+  3) 검색·페이지 넘김 → 그리드 데이터 XHR(POST, JSON, 요청 본문에 검색어와 조회 기간)
+조회 기간은 브라우저 시계(재생 때는 녹화 시각으로 고정)로 계산하므로 시계 고정도 함께 검증된다.
+"""
+import datetime
+import json
+import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ORIGIN = "https://shop.g2b.go.kr"
+RECORDED_AT = 1736470800.0  # 2025-01-10 01:00 UTC
+LIST_URL = ORIGIN + "/ui/pr/prps/PrpsList.html"
+GRID_URL = ORIGIN + "/pr/prps/selectPrpsList.do"
+PAGE_SIZE = 3
+
+NOTICES = [
+    ["R25BK00000001", "조달청", "업무용 컴퓨터 구매", "2025/01/10", "2025/01/20 10:00", "공고중"],
+    ["R25BK00000002", "서울특별시교육청", "교육용 컴퓨터 교체", "2025/01/09", "2025/01/19 10:00", "공고중"],
+    ["R25BK00000003", "부산광역시", "노트북 임차 용역", "2025/01/08", "2025/01/18 10:00", "공고중"],
+    ["R25BK00000004", "한국전력공사", "컴퓨터 유지보수", "2025/01/07", "2025/01/17 10:00", "마감"],
+    ["R25BK00000005", "국방부", "컴퓨터 보안 장비", "2025/01/06", "2025/01/16 10:00", "공고중"],
+]
+
+INDEX_HTML = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>나라장터 종합쇼핑몰 (합성 픽스처)</title>
+</head>
+<body>
+<div id="menu">
+  <a id="mf_wfm_container_wq_uuid_1_btnPrpblist" title="제안공고목록" href="#"
+     onclick="openList(); return false;">제안공고목록</a>
+</div>
+<div class="w2popup_window" id="mf_wfm_container_wq_uuid_10">
+  <div id="mf_wfm_container_wq_uuid_10_header" class="w2window_header">공지사항
+    <button type="button" class="w2window_close"
+            onclick="this.closest('.w2popup_window').style.display = 'none'">닫기</button>
+  </div>
+  <div>시스템 점검 안내</div>
+</div>
+<div id="screen"></div>
+<script>
+const pad = (n) => String(n).padStart(2, "0");
+const ymd = (d) => d.getUTCFullYear() + pad(d.getUTCMonth() + 1) + pad(d.getUTCDate());
+
+async function openList() {
+  const response = await fetch("%(list_url)s");
+  document.getElementById("screen").innerHTML = await response.text();
+}
+
+async function search(pageNo) {
+  const end = new Date();
+  const start = new Date(end.getTime());
+  start.setUTCMonth(start.getUTCMonth() - 3);
+  const body = JSON.stringify({dmParam: {
+    prpsNm: document.getElementById("prpsNm").value.trim(),
+    bgnDt: ymd(start), endDt: ymd(end), pageNo: pageNo,
+  }});
+  const response = await fetch("%(grid_url)s", {
+    method: "POST", headers: {"Content-Type": "application/json"}, body: body,
+  });
+  render(await response.json());
+}
+
+function render(data) {
+  document.getElementById("grid").innerHTML = data.rows.map(r =>
+    "<tr><td>" + r.no + "</td><td><nobr>" + r.number + "</nobr></td><td><nobr>" + r.agency + "</nobr></td>" +
+    "<td><a href='#'>" + r.title + "</a></td><td><nobr>" + r.posted + "</nobr></td>" +
+    "<td><nobr>" + r.deadline + "</nobr></td><td><nobr>" + r.status + "</nobr></td><td></td><td></td></tr>"
+  ).join("");
+  let links = "";
+  for (let p = 1; p <= data.totalPages; p++) {
+    links += p === data.pageNo ? "<strong>" + p + "</strong> "
+                               : "<a href='#' onclick='search(" + p + "); return false;'>" + p + "</a> ";
+  }
+  document.getElementById("mf_wfm_container_pglList").innerHTML = links;
+}
+</script>
+</body>
+</html>
+""" % {"list_url": LIST_URL, "grid_url": GRID_URL}
+
+LIST_HTML = """<table>
+  <tr><td data-title="제안공고명"><input type="text" id="prpsNm"></td></tr>
+  <tr><td data-title="게시일자">
+    <input type="radio" name="period" title="1개월"> <input type="radio" name="period" title="3개월">
+  </td></tr>
+</table>
+<select id="mf_wfm_container_sbxRecordCountPerPage"><option value="10">10</option><option value="100">100</option></select>
+<input type="button" value="적용">
+<input type="button" value="검색" onclick="search(1)">
+<table id="mf_wfm_container_grdPrps_body_table"><tbody id="grid"></tbody></table>
+<div id="mf_wfm_container_pglList"></div>
+"""
+
+
+def _entry(method, url, mime, text, post=None):
+    body = text.encode("utf-8")
+    request = {
+        "method": method, "url": url, "httpVersion": "HTTP/1.1", "cookies": [], "headers": [],
+        "queryString": [], "headersSize": -1, "bodySize": len(post.encode("utf-8")) if post else 0,
+    }
+    if post is not None:
+        request["postData"] = {"mimeType": "application/json", "text": post}
+    return {
+        "startedDateTime": datetime.datetime.fromtimestamp(RECORDED_AT, datetime.timezone.utc).isoformat(),
+        "time": 5,
+        "request": request,
+        "response": {
+            "status": 200, "statusText": "OK", "httpVersion": "HTTP/1.1", "cookies": [],
+            "headers": [{"name": "Content-Type", "value": mime}],
+            "content": {"size": len(body), "mimeType": mime, "text": text},
+            "redirectURL": "", "headersSize": -1, "bodySize": len(body),
+        },
+        "cache": {},
+        "timings": {"send": 0, "wait": 5, "receive": 0},
+    }
+
+
+def _grid_body(query, page_no):
+    end = datetime.datetime.fromtimestamp(RECORDED_AT, datetime.timezone.utc).date()
+    start = end.replace(year=end.year - 1, month=end.month + 9) if end.month <= 3 else end.replace(month=end.month - 3)
+    return json.dumps({"dmParam": {
+        "prpsNm": query, "bgnDt": start.strftime("%Y%m%d"), "endDt": end.strftime("%Y%m%d"), "pageNo": page_no,
+    }}, ensure_ascii=False, separators=(",", ":"))
+
+
+def build(query):
+    matched = [n for n in NOTICES if query in n[2]]
+    pages = max(1, -(-len(matched) // PAGE_SIZE))
+    entries = [
+        _entry("GET", ORIGIN + "/index.do", "text/html; charset=utf-8", INDEX_HTML),
+        _entry("GET", LIST_URL, "text/html; charset=utf-8", LIST_HTML),
+    ]
+    for page_no in range(1, pages + 1):
+        rows = [
+            {"no": str(i + 1), "number": n[0], "agency": n[1], "title": n[2], "posted": n[3], "deadline": n[4],
+             "status": n[5]}
+            for i, n in enumerate(matched) if (page_no - 1) * PAGE_SIZE <= i < page_no * PAGE_SIZE
+        ]
+        data = json.dumps({"rows": rows, "pageNo": page_no, "totalPages": pages}, ensure_ascii=False)
+        entries.append(_entry("POST", GRID_URL, "application/json; charset=utf-8", data, _grid_body(query, page_no)))
+    return {"log": {"version": "1.2", "creator": {"name": "g2b_bench", "version": "synthetic"}, "pages": [],
+                    "entries": entries}}, len(matched), pages
+
+
+def main():
+    for name, query in (("synthetic_computer", "컴퓨터"), ("synthetic_notebook", "노트북")):
+        har, rows, pages = build(query)
+        with open(os.path.join(HERE, name + ".har"), "w", encoding="utf-8") as f:
+            json.dump(har, f, ensure_ascii=False, indent=1)
+        with open(os.path.join(HERE, name + ".meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"query": query, "recorded_at": RECORDED_AT}, f, ensure_ascii=False)
+        print(f"{name}.har: '{query}' {rows}건, {pages}페이지")
+
+
+if __name__ == "__main__":
+    main()
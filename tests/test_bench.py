@@ -0,0 +1,81 @@
+import asyncio
+import os
+
+import pytest
+
+import g2b_bench
+import g2b_resilience
+import g2b_strategy
+from g2b_crawler import find_browser_executable, run_crawler_async
+from g2b_pool import BrowserPool
+from g2b_report import RunReport
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def chromium_path():
+    """재생에 쓸 Chromium (없으면 None → 재생 테스트는 건너뜀)"""
+    path = find_browser_executable()
+    if path:
+        return path
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            path = p.chromium.executable_path
+    except Exception:
+        return None
+    return path if os.path.exists(path) else None
+
+
+def test_synthetic_fixtures_load():
+    fixtures = g2b_bench.load_fixtures(FIXTURES)
+    assert sorted(f.query for f in fixtures) == ["노트북", "컴퓨터"]
+    assert all(f.recorded_at for f in fixtures)
+
+
+def test_isolated_state_leaves_real_files_alone(tmp_path):
+    breaker, strategies = g2b_resilience.default_breaker(), g2b_strategy.default_strategies()
+    with g2b_bench.isolated_state(str(tmp_path)):
+        assert g2b_resilience.default_breaker().path == str(tmp_path / "g2b_breaker.json")
+        assert g2b_strategy.default_strategies() is not strategies
+    assert g2b_resilience.default_breaker() is breaker
+    assert g2b_strategy.default_strategies() is strategies
+
+
+def require_chromium():
+    path = chromium_path()
+    if path is None:
+        pytest.skip("Chromium이 없어 HAR 재생을 실행하지 못함: 이 환경에서는 재생 경로가 검증되지 않았다")
+    return path
+
+
+def test_replay_walks_popup_list_and_grid_xhr():
+    path = require_chromium()
+    fixture = next(f for f in g2b_bench.load_fixtures(FIXTURES) if f.query == "컴퓨터")
+    report = RunReport(fixture.query, "browser")
+
+    async def replay():
+        async with BrowserPool(size=1, contexts_per_browser=1, browser_executable_path=path) as pool:
+            return await run_crawler_async(fixture.query, pool=pool, use_snapshot=False, report=report,
+                                           fixture=fixture)
+
+    with g2b_bench.isolated_state():
+        headers, rows = asyncio.run(replay())
+    assert report.status == "ok", report.error
+    assert report.counters.get("popups_closed") == 1
+    assert report.methods.get("search_wait") in ("grid", "response")
+    assert report.pages == 2
+    assert sorted(row[1] for row in rows) == ["R25BK00000001", "R25BK00000002", "R25BK00000004", "R25BK00000005"]
+    assert fixture.misses == 0
+
+
+def test_benchmark_replays_all_fixtures():
+    path = require_chromium()
+    result = asyncio.run(g2b_bench.run_benchmark(g2b_bench.load_fixtures(FIXTURES), runs=1, concurrency=2,
+                                                 browser_executable_path=path))
+    for query in ("컴퓨터", "노트북"):
+        latency = result["latency"][query]
+        assert latency["runs"] == 1 and latency["errors"] == 0
+        assert "extraction" in latency["phases_ms"]
+    assert result["throughput"]["rows_per_sec"] > 0
+    assert result["har_misses"] == {"컴퓨터": 0, "노트북": 0}
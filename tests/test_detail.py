@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+import g2b_detail
+from g2b_detail import DetailFetcher
+
+
+class FakeLocator:
+    def __init__(self, page):
+        self.page = page
+        self.first = self
+
+    def locator(self, selector):
+        return self
+
+    async def click(self, timeout=None):
+        raise RuntimeError("클릭 실패")
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.waits = []
+
+    def locator(self, selector, has=None):
+        return FakeLocator(self)
+
+    def get_by_text(self, text, exact=False):
+        return None
+
+    async def wait_for_function(self, expression, arg=None, timeout=None):
+        self.waits.append(asyncio.current_task())
+        await asyncio.Event().wait()
+
+    async def close(self):
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.waits = []
+
+    async def wait_for_event(self, event, timeout=None):
+        self.waits.append(asyncio.current_task())
+        await asyncio.Event().wait()
+
+
+def test_search_click_failure_cancels_detail_waiters(monkeypatch):
+    context = FakeContext()
+    page = FakePage(context)
+
+    async def open_search_results(context, query, budget, report):
+        context.pages.append(page)
+        return page
+
+    monkeypatch.setattr(g2b_detail, "open_search_results", open_search_results)
+    fetcher = DetailFetcher(pool=None, store=object())
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await fetcher._fetch_by_search(context, "R25BK00000001", "업무용 컴퓨터 구매")
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    leftover = asyncio.run(run())
+    assert leftover == []
+    assert context.waits and all(t.cancelled() for t in context.waits + page.waits)
+    assert context.pages == []
@@ -0,0 +1,37 @@
+from g2b_crawler import HEADERS
+from g2b_index import NoticeIndex
+
+ROWS = [
+    ["1", "R1", "조달청", "업무용 컴퓨터 구매", "2025/01/02", "", "공고중", "", ""],
+    ["2", "R2", "교육청", "노트북 임차 용역", "2025/01/03", "", "공고중", "", ""],
+    ["3", "R3", "시청", "노트 제작", "2025/01/03", "", "공고중", "", ""],
+]
+
+
+def numbers(result):
+    _, rows = result
+    return sorted(row[HEADERS.index("제안공고번호")] for row in rows or [])
+
+
+def make_index(tmp_path):
+    index = NoticeIndex(str(tmp_path / "index.db"))
+    index.add(HEADERS, ROWS)
+    return index
+
+
+def test_exact_search_ignores_typos(tmp_path):
+    index = make_index(tmp_path)
+    assert numbers(index.search("노트북")) == ["R2"]
+    assert numbers(index.search("컴퓨타")) == []
+
+
+def test_fuzzy_search_finds_one_syllable_typo(tmp_path):
+    index = make_index(tmp_path)
+    assert numbers(index.search("컴퓨타", fuzzy=True)) == ["R1"]
+    assert numbers(index.search("노트븍", fuzzy=True)) == ["R2"]
+    assert numbers(index.search("놑북", fuzzy=True)) == ["R2"]
+
+
+def test_fuzzy_search_does_not_match_shorter_word(tmp_path):
+    index = make_index(tmp_path)
+    assert numbers(index.search("노트북", fuzzy=True)) == ["R2"]
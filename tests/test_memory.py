@@ -0,0 +1,32 @@
+import subprocess
+import sys
+import time
+
+from g2b_memory import MemoryMonitor, _RssSampler, rss_bytes
+from g2b_report import RunReport
+
+
+def test_rss_includes_child_processes():
+    alone = rss_bytes()
+    child = subprocess.Popen([sys.executable, "-c", "x = bytearray(64 * 1024 * 1024); import time; time.sleep(5)"])
+    try:
+        time.sleep(1.0)
+        assert rss_bytes() > alone + 32 * 1024 * 1024
+        assert rss_bytes(children=False) < rss_bytes()
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_monitors_share_one_sampler_thread():
+    sampler = _RssSampler(interval=0.01)
+    reports = [RunReport("a"), RunReport("b")]
+    monitors = [MemoryMonitor(report, sampler).start() for report in reports]
+    thread = sampler._thread
+    time.sleep(0.05)
+    assert sampler._thread is thread
+    for monitor in monitors:
+        monitor.stop()
+    assert all(report.info["peak_rss_mb"] > 0 for report in reports)
+    thread.join(1)
+    assert not thread.is_alive() and sampler._thread is None
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from g2b_resilience import BlockedError, CircuitBreaker, CircuitOpenError, retry_phase
+
+
+def tripped_breaker(tmp_path):
+    breaker = CircuitBreaker(threshold=1, cooldown=0.01, path=str(tmp_path / "breaker.json"))
+    breaker.record_block("테스트 차단")
+    return breaker
+
+
+async def half_open(breaker):
+    await asyncio.sleep(0.02)
+    assert breaker.state == "half_open"
+
+
+def test_cancelled_trial_allows_next_trial(tmp_path):
+    breaker = tripped_breaker(tmp_path)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def ok():
+        return "ok"
+
+    async def scenario():
+        await half_open(breaker)
+        task = asyncio.ensure_future(retry_phase("search", hang, retries=0, breaker=breaker))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await retry_phase("search", ok, retries=0, breaker=breaker)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_unexpected_error_in_trial_allows_next_trial(tmp_path):
+    breaker = tripped_breaker(tmp_path)
+
+    async def broken():
+        raise KeyError("x")
+
+    async def scenario():
+        await half_open(breaker)
+        with pytest.raises(KeyError):
+            await retry_phase("search", broken, retries=0, breaker=breaker)
+        breaker.before()
+
+    asyncio.run(scenario())
+
+
+def test_blocked_trial_reopens(tmp_path):
+    breaker = tripped_breaker(tmp_path)
+
+    async def blocked():
+        raise BlockedError("여전히 차단")
+
+    async def scenario():
+        await half_open(breaker)
+        with pytest.raises(BlockedError):
+            await retry_phase("search", blocked, retries=0, breaker=breaker)
+        with pytest.raises(CircuitOpenError):
+            breaker.before()
+
+    asyncio.run(scenario())
@@ -0,0 +1,82 @@
+import queue
+
+import g2b_shard
+from g2b_shard import ShardCoordinator
+
+
+class FakeProcess:
+    def __init__(self):
+        self.alive = True
+        self.exitcode = None
+        self.terminated = False
+
+    def is_alive(self):
+        return self.alive
+
+    def terminate(self):
+        self.terminated = True
+        self.alive = False
+        self.exitcode = -15
+
+    def kill(self):
+        self.terminate()
+
+    def join(self, timeout=None):
+        pass
+
+
+class FakeTasks:
+    """받은 검색어에 바로 결과를 돌려주는 워커 (hang에 든 검색어는 처음 한 번 응답하지 않는다)"""
+
+    def __init__(self, worker_id, results, hang):
+        self.worker_id = worker_id
+        self.results = results
+        self.hang = hang
+
+    def put(self, keyword):
+        if keyword is None:
+            return
+        if keyword in self.hang:
+            self.hang.discard(keyword)
+            return
+        self.results.put(("done", self.worker_id, keyword, ["제안공고번호"], [[keyword]], {}))
+
+
+class FakeMp:
+    Queue = queue.Queue
+
+
+def make_coordinator(monkeypatch, hang, **kwargs):
+    coordinator = ShardCoordinator(workers=1, per_worker=2, keyword_timeout=0.05, **kwargs)
+    coordinator._mp = FakeMp()
+    spawned = []
+
+    def spawn():
+        worker = g2b_shard._Worker(coordinator._next_id, FakeProcess(),
+                                   FakeTasks(coordinator._next_id, coordinator._results, hang))
+        coordinator._next_id += 1
+        spawned.append(worker)
+        return worker
+
+    monkeypatch.setattr(coordinator, "_spawn", spawn)
+    monkeypatch.setattr(g2b_shard, "merge_keyword_results", lambda results: [k for k, _ in results])
+    return coordinator, spawned
+
+
+def test_hung_worker_is_terminated_and_keyword_reassigned(monkeypatch):
+    coordinator, spawned = make_coordinator(monkeypatch, {"컴퓨터"})
+    assert coordinator.run(["컴퓨터", "노트북"]) == ["컴퓨터", "노트북"]
+    assert spawned[0].process.terminated
+    assert len(spawned) == 2
+    assert coordinator.failed == {}
+
+
+def test_keyword_that_keeps_hanging_fails_after_retries(monkeypatch):
+    class AlwaysHang(set):
+        def discard(self, keyword):
+            pass
+
+    coordinator, spawned = make_coordinator(monkeypatch, AlwaysHang({"컴퓨터"}), retries=1)
+    assert coordinator.run(["컴퓨터", "노트북"]) == ["노트북"]
+    assert coordinator.failed == {"컴퓨터": "시간 초과 2회"}
+    assert spawned[0].process.terminated and spawned[1].process.terminated
@@ -0,0 +1,10 @@
+import pytest
+
+from g2b_waits import LatencyBudget, LatencyBudgetExceeded
+
+
+def test_phase_timeout_ignores_spent_total_budget():
+    budget = LatencyBudget(total_ms=0, page=7000)
+    with pytest.raises(LatencyBudgetExceeded):
+        budget.timeout("page")
+    assert budget.phase_timeout("page") == 7000